@@ -0,0 +1,122 @@
+"""
+Measure the construction throughput of Elements read from a parts file.
+
+The same rows are turned into Items through the validating constructor
+(the path every ElementSet used before the trusted construction was
+added) and through the trusted construction used by the ElementSets.
+
+Run from the project directory:
+    python benchmarks/element_construction.py [number_of_rows]
+
+File:       element_construction.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.0.0
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from lbk_library import DataFile as PartsFile
+
+from elements import Item, ItemSet, trusted_rows
+from pages import table_definition
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Initial release",
+}
+
+
+def build_parts_file(filename: str, number_rows: int) -> None:
+    """
+    Create a parts file holding 'number_rows' items.
+
+    Parameters:
+        filename (str): the full path of the parts file to create.
+        number_rows (int): the number of items to insert.
+    """
+    connection = sqlite3.connect(filename)
+    for sql in table_definition:
+        connection.execute(sql)
+    connection.executemany(
+        "INSERT INTO items (part_number, assembly, quantity, condition, "
+        "installed, box, remarks) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            ("PN-" + str(i % 5000), "A" + str(i), i % 20, 1 + i % 6, i % 2, 0, "")
+            for i in range(number_rows)
+        ),
+    )
+    connection.commit()
+    connection.close()
+
+
+def time_construction(parts_file: PartsFile, rows: list[dict], trusted: bool):
+    """
+    Build an Item from each row.
+
+    Parameters:
+        parts_file (PartsFile): the parts file holding the items.
+        rows (list[dict]): the rows read from the parts file.
+        trusted (bool): True to use the trusted construction.
+
+    Returns:
+        (float) the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    if trusted:
+        with trusted_rows():
+            items = [Item(parts_file, dict(row)) for row in rows]
+    else:
+        items = [Item(parts_file, dict(row)) for row in rows]
+    elapsed = time.perf_counter() - start
+    del items
+    return elapsed
+
+
+def main(number_rows: int) -> None:
+    """
+    Run the benchmark and print the results.
+
+    Parameters:
+        number_rows (int): the number of rows to construct.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "benchmark.parts")
+        build_parts_file(filename, number_rows)
+        parts_file = PartsFile()
+        parts_file.sql_connect(filename)
+        rows = parts_file.sql_fetchrowset(parts_file.sql_query("SELECT * FROM items"))
+
+        validated = time_construction(parts_file, rows, False)
+        trusted = time_construction(parts_file, rows, True)
+        start = time.perf_counter()
+        item_set = ItemSet(parts_file)
+        item_set_time = time.perf_counter() - start
+        parts_file.sql_close()
+
+    print("Items constructed:      ", len(rows))
+    print(
+        "Validated construction:  %.3f s (%.0f rows/s)"
+        % (validated, len(rows) / validated)
+    )
+    print(
+        "Trusted construction:    %.3f s (%.0f rows/s)" % (trusted, len(rows) / trusted)
+    )
+    print("Speed up:                %.1fx" % (validated / trusted))
+    print(
+        "ItemSet, query included: %.3f s (%d items)"
+        % (item_set_time, item_set.get_number_elements())
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
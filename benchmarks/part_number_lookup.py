@@ -0,0 +1,132 @@
+"""
+Measure the part number lookups of the dialogs in a large parts file.
+
+A parts file of 'number_parts' parts is built and the time to read the
+full part number option list, as the part number combo boxes once did,
+is compared with the indexed prefix lookups made for each keystroke by
+the part number completer.
+
+Run from the project directory:
+    python benchmarks/part_number_lookup.py [number_parts]
+
+File:       part_number_lookup.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.0.0
+"""
+
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from lbk_library import DataFile as PartsFile
+
+from dialogs.part_number_completer import PartNumberModel, find_part_numbers
+from elements import PartSet
+from pages import table_definition
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Initial release",
+}
+
+
+def build_parts_file(filename: str, number_parts: int) -> list[str]:
+    """
+    Create a parts file holding 'number_parts' parts.
+
+    Parameters:
+        filename (str): the full path of the parts file to create.
+        number_parts (int): the number of parts to insert.
+
+    Returns:
+        (list[str]) the part numbers inserted.
+    """
+    generator = random.Random(1)
+    part_numbers = sorted(
+        {
+            "%s%d-%04d"
+            % (generator.choice("ABCDEFGHJK"), generator.randrange(10, 99), i)
+            for i in range(number_parts)
+        }
+    )
+    connection = sqlite3.connect(filename)
+    for sql in table_definition:
+        connection.execute(sql)
+    connection.executemany(
+        "INSERT INTO parts (part_number, source, description, remarks) "
+        "VALUES (?, ?, ?, ?)",
+        ((part_number, 1, "Part " + part_number, "") for part_number in part_numbers),
+    )
+    connection.commit()
+    connection.close()
+    return part_numbers
+
+
+def time_typing(parts_file: PartsFile, part_numbers: list[str]) -> list[float]:
+    """
+    Type part numbers a character at a time into the completer model.
+
+    Parameters:
+        parts_file (PartsFile): the parts file holding the parts.
+        part_numbers (list[str]): the part numbers typed.
+
+    Returns:
+        (list[float]) the seconds taken by each keystroke.
+    """
+    times = []
+    for part_number in part_numbers:
+        model = PartNumberModel(parts_file)
+        for length in range(1, len(part_number) + 1):
+            start = time.perf_counter()
+            model.set_prefix(part_number[:length])
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def main(number_parts: int) -> None:
+    """
+    Run the benchmark and print the results.
+
+    Parameters:
+        number_parts (int): the number of parts in the parts file.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "benchmark.parts")
+        part_numbers = build_parts_file(filename, number_parts)
+        parts_file = PartsFile()
+        parts_file.sql_connect(filename)
+
+        start = time.perf_counter()
+        option_list = PartSet(
+            parts_file, None, None, "part_number", columns=["part_number"]
+        ).build_option_list("part_number")
+        option_list_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        find_part_numbers(parts_file, "", PartNumberModel.LIMIT)
+        first_page_time = time.perf_counter() - start
+
+        typed = random.Random(2).sample(part_numbers, 50)
+        times = time_typing(parts_file, typed)
+        parts_file.sql_close()
+
+    print("Parts:                      ", len(option_list))
+    print("Full option list:            %.1f ms" % (option_list_time * 1000))
+    print("First completions:           %.2f ms" % (first_page_time * 1000))
+    print("Keystrokes timed:           ", len(times))
+    print("Keystroke, median:           %.2f ms" % (statistics.median(times) * 1000))
+    print("Keystroke, worst:            %.2f ms" % (max(times) * 1000))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
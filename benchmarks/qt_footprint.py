@@ -0,0 +1,164 @@
+"""
+Measure the import time and idle memory of the Qt binding stacks.
+
+Each case runs in a new interpreter, which imports the modules of the
+case, shows an idle window and reports the seconds spent importing and
+the resident memory (RSS) once idle:
+    PyQt6 + PySide6 - both binding stacks, as loaded before the program
+        moved to the single binding of 'qt_compat'
+    PySide6 - the single binding stack alone
+    application - the main window through 'qt_compat', empty
+        configuration, no parts file open
+
+Run from the project directory:
+    python benchmarks/qt_footprint.py [number_of_runs]
+
+Set QT_QPA_PLATFORM=offscreen to run without a display. The first case
+is skipped when PyQt6 is not installed.
+
+File:       qt_footprint.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.0.0
+"""
+
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Initial release",
+}
+
+CHILD_OPTION = "--measure"
+"""The option running a single case in the child interpreter."""
+
+CASES = {
+    "PyQt6 + PySide6": ["PyQt6.QtWidgets", "PySide6.QtWidgets"],
+    "PySide6": ["PySide6.QtWidgets"],
+    "application": ["pages"],
+}
+"""The modules imported by each case."""
+
+
+def resident_memory() -> int:
+    """
+    Get the resident memory of this process.
+
+    Returns:
+        (int) the resident set size in kilobytes.
+    """
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(case: str) -> None:
+    """
+    Import the modules of a case and print its footprint once idle.
+
+    The result is printed as a line of JSON holding the import seconds
+    and the resident kilobytes.
+
+    Parameters:
+        case (str): the case, a key of CASES.
+    """
+    import time
+
+    src_path = os.path.join(os.path.realpath("."), "src")
+    if src_path not in sys.path:
+        sys.path.append(src_path)
+
+    start = time.perf_counter()
+    for module in CASES[case]:
+        importlib.import_module(module)
+    elapsed = time.perf_counter() - start
+
+    from qt_compat.QtCore import QTimer
+    from qt_compat.QtWidgets import QApplication, QMainWindow
+
+    app = QApplication(sys.argv[:1])
+    if case == "application":
+        from pages import MainWindow
+
+        window = MainWindow()
+    else:
+        window = QMainWindow()
+        window.show()
+    # let the window paint and the event loop settle before measuring
+    QTimer.singleShot(500, app.quit)
+    app.exec()
+    print(json.dumps({"elapsed": elapsed, "rss": resident_memory()}))
+    window.close()
+
+
+def run_case(case: str, config_dir: str) -> dict:
+    """
+    Measure a case in a new interpreter.
+
+    Parameters:
+        case (str): the case, a key of CASES.
+        config_dir (str): the empty configuration directory to use.
+
+    Returns:
+        (dict) the import seconds, "elapsed", and the resident
+            kilobytes, "rss".
+    """
+    environment = dict(os.environ)
+    environment["XDG_CONFIG_HOME"] = config_dir
+    environment["HOME"] = config_dir
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), CHILD_OPTION, case],
+        capture_output=True,
+        text=True,
+        env=environment,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(number_runs: int) -> None:
+    """
+    Run the benchmark and print the medians of each case.
+
+    Parameters:
+        number_runs (int): the number of runs of each case.
+    """
+    print("%-18s %12s %12s" % ("Case", "Import (s)", "RSS (MB)"))
+    for case, modules in CASES.items():
+        if any(
+            importlib.util.find_spec(module.split(".")[0]) is None
+            for module in modules
+            if module != "pages"
+        ):
+            print("%-18s %25s" % (case, "not installed"))
+            continue
+        results = []
+        for _run in range(number_runs):
+            with tempfile.TemporaryDirectory() as config_dir:
+                results.append(run_case(case, config_dir))
+        print(
+            "%-18s %12.3f %12.1f"
+            % (
+                case,
+                statistics.median(result["elapsed"] for result in results),
+                statistics.median(result["rss"] for result in results) / 1024,
+            )
+        )
+
+
+if __name__ == "__main__":
+    if CHILD_OPTION in sys.argv:
+        measure(sys.argv[sys.argv.index(CHILD_OPTION) + 1])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,159 @@
+"""
+Measure the time from launch to the first paint of the main window.
+
+Each run starts a new interpreter, so the imports are timed as a user
+sees them, with an empty configuration so no parts file is opened.
+The runs report the time to first paint and the dialog modules that
+were imported before it; the script fails when the median time is over
+the budget or a dialog was imported, so it can be run as a check.
+
+Run from the project directory:
+    python benchmarks/startup_time.py [number_of_runs] [budget_seconds]
+
+Set QT_QPA_PLATFORM=offscreen to run without a display.
+
+File:       startup_time.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.1.0
+"""
+
+import time
+
+START = time.perf_counter()
+"""The launch time of this interpreter, taken before any import."""
+
+import json  # noqa: E402
+import os  # noqa: E402
+import statistics  # noqa: E402
+import subprocess  # noqa: E402
+import sys  # noqa: E402
+import tempfile  # noqa: E402
+
+file_version = "1.1.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Import Qt through 'qt_compat'",
+}
+
+CHILD_OPTION = "--first-paint"
+"""The option running a single launch in the child interpreter."""
+
+DEFAULT_BUDGET = 1.5
+"""The time to first paint allowed, in seconds."""
+
+
+def first_paint() -> None:
+    """
+    Launch the main window and print the time to its first paint.
+
+    The result is printed as a line of JSON holding the seconds to the
+    first paint and the dialog modules imported by then.
+    """
+    src_path = os.path.join(os.path.realpath("."), "src")
+    if src_path not in sys.path:
+        sys.path.append(src_path)
+
+    from pages import MainWindow
+    from qt_compat.QtCore import QEvent, QObject
+    from qt_compat.QtWidgets import QApplication
+
+    class PaintWatcher(QObject):
+        """Quit the application on the first paint of the window."""
+
+        def __init__(self) -> None:
+            super().__init__()
+            self.elapsed: float = None
+
+        def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+            if event.type() == QEvent.Type.Paint and self.elapsed is None:
+                self.elapsed = time.perf_counter() - START
+                QApplication.instance().quit()
+            return False
+
+    app = QApplication(sys.argv[:1])
+    watcher = PaintWatcher()
+    app.installEventFilter(watcher)
+    main_window = MainWindow()
+    app.exec()
+    main_window.close()
+    print(
+        json.dumps(
+            {
+                "elapsed": watcher.elapsed,
+                "dialogs": sorted(
+                    name
+                    for name in sys.modules
+                    if name.startswith("dialogs.") and sys.modules[name] is not None
+                ),
+            }
+        )
+    )
+
+
+def launch(config_dir: str) -> dict:
+    """
+    Time a launch of the program in a new interpreter.
+
+    Parameters:
+        config_dir (str): the empty configuration directory to use.
+
+    Returns:
+        (dict) the seconds to the first paint, "elapsed", and the dialog
+            modules imported, "dialogs".
+    """
+    environment = dict(os.environ)
+    environment["XDG_CONFIG_HOME"] = config_dir
+    environment["HOME"] = config_dir
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), CHILD_OPTION],
+        capture_output=True,
+        text=True,
+        env=environment,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(number_runs: int, budget: float) -> int:
+    """
+    Run the benchmark and print the results.
+
+    Parameters:
+        number_runs (int): the number of launches to time.
+        budget (float): the median time to first paint allowed.
+
+    Returns:
+        (int) the exit status, 1 if the budget is exceeded or a dialog
+            was imported before the first paint.
+    """
+    results = []
+    for _run in range(number_runs):
+        with tempfile.TemporaryDirectory() as config_dir:
+            results.append(launch(config_dir))
+    times = [result["elapsed"] for result in results]
+    dialogs = sorted({name for result in results for name in result["dialogs"]})
+    median = statistics.median(times)
+
+    print("Launches:              ", number_runs)
+    print("First paint, median:    %.3f s" % median)
+    print("First paint, range:     %.3f - %.3f s" % (min(times), max(times)))
+    print("Budget:                 %.3f s" % budget)
+    print("Dialogs imported:      ", ", ".join(dialogs) if dialogs else "none")
+    if median > budget or dialogs:
+        print("FAILED")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    if CHILD_OPTION in sys.argv:
+        first_paint()
+    else:
+        sys.exit(
+            main(
+                int(sys.argv[1]) if len(sys.argv) > 1 else 5,
+                float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BUDGET,
+            )
+        )
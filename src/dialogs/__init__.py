@@ -15,18 +15,45 @@ File       __init__.py
 Author     Lorn B Kerr
 Copyright  (c) 2020-2024 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.0
+Version:    1.1.0
+
+A dialog module, and the form it is built from, is imported the first
+time its class is requested, not when the package is imported, so the
+main window paints without loading them.
 """
 
-from .assembly_list_dialog import AssemblyListDialog
-from .base_dialog import BaseDialog
-from .edit_conditions_dialog import EditConditionsDialog
-from .edit_sources_dialog import EditSourcesDialog
-from .item_dialog import ItemDialog
-from .order_dialog import OrderDialog
-from .part_dialog import PartDialog
+from importlib import import_module
 
-file_version = "1.0.0"
+file_version = "1.1.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Import each dialog module when first requested",
+}
+
+DIALOGS = {
+    "AssemblyListDialog": ".assembly_list_dialog",
+    "BaseDialog": ".base_dialog",
+    "EditConditionsDialog": ".edit_conditions_dialog",
+    "EditSourcesDialog": ".edit_sources_dialog",
+    "ItemDialog": ".item_dialog",
+    "OrderDialog": ".order_dialog",
+    "PartDialog": ".part_dialog",
 }
+"""The module of each dialog class."""
+
+
+def __getattr__(name: str) -> type:
+    """
+    Get a dialog class, importing its module on first use.
+
+    Parameters:
+        name (str): the dialog class.
+
+    Returns:
+        (type) the dialog class.
+    """
+    if name not in DIALOGS:
+        raise AttributeError("module 'dialogs' has no attribute " + repr(name))
+    dialog_class = getattr(import_module(DIALOGS[name], __name__), name)
+    globals()[name] = dialog_class
+    return dialog_class
@@ -5,25 +5,29 @@ File:       save_assembly_list_dialog.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.1.0
+Version:    1.3.0
 """
 
 import base64
 import csv
 import os
+from typing import Iterator
 
 from lbk_library import DataFile as PartsFile
 from lbk_library.gui import Dialog
-from PySide6.QtGui import QIcon, QPixmap
-from PySide6.QtWidgets import QFileDialog, QLineEdit, QMainWindow, QMessageBox
 
 from elements import Item, Part
+from elements.set_query import stream_elements
 from forms import Ui_SaveAssemblyListForm
+from qt_compat.QtGui import QIcon, QPixmap
+from qt_compat.QtWidgets import QFileDialog, QLineEdit, QMainWindow, QMessageBox
 
-file_version = "1.1.0"
+file_version = "1.3.0"
 changes = {
     "1.0.0": "Initial release",
     "1.1.0": "Changed library 'PyQt5' to 'PySide6' and code cleanup",
+    "1.2.0": "Stream the Items while writing the file",
+    "1.3.0": "Import Qt through 'qt_compat'",
 }
 
 
@@ -75,6 +79,8 @@ class AssemblyListDialog(Dialog, Ui_SaveAssemblyListForm):
         self.parent = parent
         self.parts_file = parts_file
         self.config = parent.config
+        self.items_written = 0
+        """The number of Items written by the last 'write_csv_file'."""
         self.set_tool_tips()
 
         folder_open_pixmap = QPixmap()
@@ -139,7 +145,7 @@ class AssemblyListDialog(Dialog, Ui_SaveAssemblyListForm):
     def action_write_file(self):
         """Generate a CSV file."""
         start, stop = self.get_start_stop_points()
-        itemset = self.get_itemset(start, stop)
+        items = self.stream_items(start, stop)
 
         # Get the location to save the file
         location = self.save_location_edit.text()
@@ -147,10 +153,10 @@ class AssemblyListDialog(Dialog, Ui_SaveAssemblyListForm):
         filename = location + os.sep + "" + start + "_" + stop + ".csv"
         msg_string = ""
 
-        result = self.write_csv_file(filename, itemset)
+        result = self.write_csv_file(filename, items)
         if result:
             msg_string += (
-                str(len(itemset)) + " Items have been written to \n" + filename
+                str(self.items_written) + " Items have been written to \n" + filename
             )
         else:
             msg_string += "Write to " + filename + ".csv failed\n\n."
@@ -201,22 +207,27 @@ class AssemblyListDialog(Dialog, Ui_SaveAssemblyListForm):
         Returns:
             (list) The requested set of items.
         """
-        items = []  # hold the raw item info from data file
-        itemset = []  # hold the Items converted from the raw db info
-        sql = (
-            "SELECT * FROM items WHERE assembly >= '"
-            + start
-            + "' AND assembly < '"
-            + end
-            + "' ORDER BY assembly"
-        )
-        result = self.parts_file.sql_query(sql)
-        items = self.parts_file.sql_fetchrowset(result)
+        return list(self.stream_items(start, end))
+
+    def stream_items(self, start: str, end: str) -> Iterator[Item]:
+        """
+        Read the items a batch at a time, for writing the file.
+
+        Only one batch of rows is held at a time, so a listing of the
+        whole parts file runs in constant memory.
 
-        for item in items:
-            itemset.append(Item(self.parts_file, item))
+        Parameters:
+            start (str) The start assembly code.
+            end (str) The stop (not included) assembly code.
 
-        return itemset
+        Returns:
+            (Iterator[Item]) The requested items, read as iterated.
+        """
+        sql = (
+            "SELECT * FROM items WHERE assembly >= ? AND assembly < ? "
+            "ORDER BY assembly"
+        )
+        return stream_elements(self.parts_file, Item, sql, [start, end])
 
     def write_csv_file(self, filename, itemset):
         """
@@ -224,19 +235,23 @@ class AssemblyListDialog(Dialog, Ui_SaveAssemblyListForm):
 
         Parameters:
             filename (str) the full path to the csv file (path/name.csv).
-        itemset (list) the set of items to save.
+            itemset (Iterable) the items to save, a list or a stream.
 
         Returns:
             (bool) True always
         """
         return_value = False
+        self.items_written = 0
         with open(filename, "w") as csv_file:
             writer = csv.writer(csv_file)
             writer.writerow(self.HEADER_NAMES)
             # write the Item lines to the file
             for item in itemset:
-                part = Part(self.parts_file, item.get_part_number(), "part_number")
+                part = Part.get_element(
+                    self.parts_file, item.get_part_number(), "part_number"
+                )
                 self.write_item_line(item, part, writer)
+                self.items_written += 1
             return_value = True
 
         return return_value
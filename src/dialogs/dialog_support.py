@@ -5,25 +5,26 @@ File:       dialog_support.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2020,2023, 2024 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.1.1
+Version:    1.2.0
 """
 
 from lbk_library import DataFile as PartsFile
-from PySide6.QtCore import Qt
-from PySide6.QtWidgets import (  # QPushButton,
+
+from elements import Order, OrderLineSet
+from qt_compat.QtCore import Qt
+from qt_compat.QtWidgets import (  # QPushButton,
     QHeaderView,
     QTableWidget,
     QTableWidgetItem,
 )
 
-from elements import Order, OrderLineSet
-
-file_version = "1.1.1"
+file_version = "1.2.0"
 changes = {
     "1.0.0": "Initial release",
     "1.0.1": "Revised Dialog import from lbk_library to lbk_library.gui",
     "1.1.0": "Changed library 'PyQt5' to 'PySide6'",
     "1.1.1": "Refactored from a class to a set of independent functions and constants.",
+    "1.2.0": "Import Qt through 'qt_compat'",
 }
 
 PART_ORDER_COL_NAMES = [
@@ -97,7 +98,7 @@ def fill_order_table_fields(
     table.setRowCount(order_lines.get_number_elements())
     row = 0
     for order_line in order_lines:
-        order = Order(parts_file, order_line.get_order_number())
+        order = Order.get_element(parts_file, order_line.get_order_number())
         entry = QTableWidgetItem(order_line.get_order_number())
         entry.setTextAlignment(
             Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter
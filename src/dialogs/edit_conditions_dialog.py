@@ -5,22 +5,23 @@ File:       edit_conditions_dialog.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2024 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.1.0
+Version:    1.2.0
 """
 
 from lbk_library import DataFile as PartsFile
 from lbk_library.gui import Dialog, TableModel
-from PySide6.QtCore import QModelIndex, Qt
-from PySide6.QtGui import QBrush, QColor
-from PySide6.QtWidgets import QHeaderView, QMainWindow
 
 from elements import Condition, ConditionSet
 from forms import Ui_TableDialog
+from qt_compat.QtCore import QModelIndex, Qt
+from qt_compat.QtGui import QBrush, QColor
+from qt_compat.QtWidgets import QHeaderView, QMainWindow
 
-file_version = "1.0.0"
+file_version = "1.2.0"
 changes = {
     "1.0.0": "Initial release",
     "1.1.0": "Changed library 'PyQt5' to 'PySide6' and code cleanup",
+    "1.2.0": "Import Qt through 'qt_compat'",
 }
 
 
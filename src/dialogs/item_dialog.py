@@ -5,7 +5,7 @@ File:       item_dialog.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2020 - 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.1.0
+Version:    1.8.0
 """
 
 from copy import deepcopy
@@ -13,10 +13,12 @@ from typing import ClassVar
 
 from lbk_library import DataFile as PartsFile
 from lbk_library.gui import Dialog
-from PySide6.QtWidgets import QMainWindow, QMessageBox
 
-from elements import Condition, ConditionSet, Item, ItemSet, Part, PartSet, Source
+from elements import Item, Part, PartSet, get_lookup_cache, get_option_lists
 from forms import Ui_ItemDialog
+from qt_compat.QtCore import Qt
+from qt_compat.QtGui import QKeySequence
+from qt_compat.QtWidgets import QComboBox, QMainWindow, QMessageBox
 
 from .dialog_support import (
     PART_ORDER_COL_NAMES,
@@ -24,11 +26,24 @@ from .dialog_support import (
     fill_order_table_fields,
     set_table_header,
 )
+from .part_number_completer import PartNumberCompleter
+from .record_navigator import (
+    RecordIdModel,
+    RecordPrefetcher,
+    get_adjacent_record_id,
+)
 
-file_version = "1.0.0"
+file_version = "1.8.0"
 changes = {
     "1.0.0": "Initial release",
     "1.1.0": "Changed library 'PyQt5' to 'PySide6' and code cleanup",
+    "1.2.0": "Import Qt through 'qt_compat'",
+    "1.3.0": "Read the combo box lists from the option list cache",
+    "1.4.0": "Lazily listed record_ids, next and previous with prefetch",
+    "1.5.0": "Type-ahead part number entry replaces the full part number list",
+    "1.6.0": "Added 'rebind' to reuse the dialog for another Item",
+    "1.7.0": "Reset the delete button and order table of a rebound dialog",
+    "1.8.0": "Edit a copy of the Element held by the identity map",
 }
 
 
@@ -43,10 +58,12 @@ class ItemDialog(Dialog, Ui_ItemDialog):
         "assembly": "Required: Enter the Assembly, 1 to 15 Characters",
         "box": "Optional: Enter Storage box if stored, 0 to 99",
         "cancel": "Close the form, optionally saving any changed information",
+        "next": "Show the next item (Page Down)",
+        "previous": "Show the previous item (Page Up)",
         "condition": "Required: Select the Item Condition",
         "delete": "Permanently DELETE the current item and all the lines",
         "installed": "Check if Item is installed",
-        "part_number": "Select Part Number, Required",
+        "part_number": "Type or select a Part Number, Required",
         "quantity": "Required: Enter quantity, 0 to  999, 0 is default",
         "record_id": "Required: Select the Item index",
         "record_id_tbd": "Item ID will be assigned when Item is saved",
@@ -79,7 +96,27 @@ class ItemDialog(Dialog, Ui_ItemDialog):
         """
         super().__init__(parent, parts_file, operation)
         self.setupUi(self)
-        self.set_element(Item(parts_file, record_id))
+        self.set_element(Item.get_element(parts_file, record_id, edit=True))
+
+        # the record_ids are listed a page at a time and any record_id
+        # may be typed in; the neighbouring items are read ahead
+        self.record_ids = RecordIdModel(parts_file, "items", self)
+        """The record_ids listed by the record_id combo box."""
+        self.prefetcher = RecordPrefetcher(parts_file, self)
+        """Reads the items next to the one shown."""
+        self.record_id_combo.setEditable(True)
+        self.record_id_combo.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        self.record_id_combo.setModel(self.record_ids)
+        self.record_id_combo.lineEdit().setPlaceholderText(
+            self.record_id_combo.placeholderText()
+        )
+        # part numbers are completed as typed rather than all listed
+        self.part_number_completer = PartNumberCompleter(
+            parts_file, self.part_number_combo
+        )
+        """Offers the part numbers matching the text typed."""
+        self.previous_button.setShortcut(QKeySequence(Qt.Key.Key_PageUp))
+        self.next_button.setShortcut(QKeySequence(Qt.Key.Key_PageDown))
 
         self.set_tooltips()
         self.set_error_frames()
@@ -108,9 +145,18 @@ class ItemDialog(Dialog, Ui_ItemDialog):
         self.quantity_edit.editingFinished.connect(self.action_quantity_edit)
         self.installed_chkbox.stateChanged.connect(self.action_installed_checkbox)
         self.part_number_combo.activated.connect(self.action_part_number_combo)
+        self.part_number_completer.activated.connect(self.action_part_number_combo)
+        self.part_number_combo.lineEdit().returnPressed.connect(
+            self.action_part_number_combo
+        )
         self.remarks_edit.editingFinished.connect(self.action_remarks_edit)
         self.storage_box_edit.editingFinished.connect(self.action_storage_box_edit)
         self.record_id_combo.activated.connect(self.action_record_id_changed)
+        self.record_id_combo.lineEdit().returnPressed.connect(
+            self.action_record_id_changed
+        )
+        self.previous_button.clicked.connect(self.action_previous_record)
+        self.next_button.clicked.connect(self.action_next_record)
 
     def action_delete(self) -> None:
         """
@@ -184,7 +230,8 @@ class ItemDialog(Dialog, Ui_ItemDialog):
         """
         Item Number selection has changed.
 
-        If the new record_id has not changed, do nothing.
+        If the new record_id has not changed, or is not a number, do
+        nothing but show the current record_id again.
 
         If no changes on the dialog entries, repopulate the from with
         the new Item info.
@@ -194,14 +241,23 @@ class ItemDialog(Dialog, Ui_ItemDialog):
         change.
         """
         item = self.get_element()
-        new_index = self.record_id_combo.currentText()
+        new_index = self.record_id_combo.currentText().strip()
         if new_index == "":
             new_index = -1
+        try:
+            new_index = int(new_index)
+        except ValueError:
+            new_index = item.get_record_id()
+        if new_index == item.get_record_id():
+            self.show_record_id(item.get_record_id())
+            return
 
         # Are there unsaved edits
         if not item.have_values_changed():
             # no changes or changes already saved
-            self.set_element(Item(self.get_datafile(), int(new_index)))
+            self.set_element(
+                Item.get_element(self.get_datafile(), int(new_index), edit=True)
+            )
             self.fill_dialog_fields()
         else:  # unsaved changes
             prev_index = item.get_record_id()
@@ -211,20 +267,66 @@ class ItemDialog(Dialog, Ui_ItemDialog):
                 # save item with previous item number, then change to new item number
                 save_result = item.update()
                 if save_result:
-                    self.set_element(Item(self.get_datafile(), new_index))
+                    self.set_element(
+                        Item.get_element(self.get_datafile(), new_index, edit=True)
+                    )
                     self.fill_dialog_fields()
                 else:
                     self.message_box_exec(self.message_warning_failed("Item Save"))
 
             elif result == QMessageBox.StandardButton.No:
                 # don't save, change to new item number
-                self.set_element(Item(self.get_datafile(), new_index))
+                self.set_element(
+                    Item.get_element(self.get_datafile(), new_index, edit=True)
+                )
                 self.fill_dialog_fields()
 
             elif result == QMessageBox.StandardButton.Cancel:
                 # cancel the record_id change, restore previous item number
                 self.record_id_combo.setCurrentText(str(prev_index))
 
+    def action_next_record(self) -> int | None:
+        """
+        Step to the Item following the one shown, in record_id order.
+
+        Returns:
+            (int | None) the record_id of the next Item, None if the
+                last Item is shown.
+        """
+        return self.step_record(True)
+
+    def action_previous_record(self) -> int | None:
+        """
+        Step to the Item before the one shown, in record_id order.
+
+        Returns:
+            (int | None) the record_id of the previous Item, None if
+                the first Item is shown.
+        """
+        return self.step_record(False)
+
+    def step_record(self, forward: bool) -> int | None:
+        """
+        Step to a neighbouring Item, as if its record_id was selected.
+
+        Unsaved changes to the Item shown are handled as for a record_id
+        selection.
+
+        Parameters:
+            forward (bool): True for the next Item, False for the
+                previous one.
+
+        Returns:
+            (int | None) the record_id stepped to, None at either end.
+        """
+        record_id = get_adjacent_record_id(
+            self.get_datafile(), "items", self.get_element().get_record_id(), forward
+        )
+        if record_id is not None:
+            self.record_id_combo.setEditText(str(record_id))
+            self.action_record_id_changed()
+        return record_id
+
     def action_assembly_edit(self) -> None:
         """
         Update and validate assembly entry.
@@ -262,7 +364,9 @@ class ItemDialog(Dialog, Ui_ItemDialog):
                 ['msg'] - (str) Error message if not valid
         """
         result = {"entry": "", "valid": False, "msg": ""}
-        indices = ConditionSet(self.get_datafile()).build_option_list("record_id")
+        indices = get_option_lists(self.get_datafile()).get_option_list(
+            "conditions", "record_id"
+        )
         combo_index = self.condition_combo.currentIndex()
         if combo_index >= 0 and combo_index < len(indices):
             index = int(indices[combo_index])
@@ -297,7 +401,8 @@ class ItemDialog(Dialog, Ui_ItemDialog):
         Validate the "Part Number" entry.
 
         Load the order table and item tables. Must be one of the
-        pre-defined part numbers.
+        pre-defined part numbers; a part number typed in that is not in
+        the parts file is rejected.
 
         Returns:
             (dict)
@@ -307,8 +412,21 @@ class ItemDialog(Dialog, Ui_ItemDialog):
                 ['msg'] - (str) Error message if not valid
         """
         item = self.get_element()
+
+        def set_part_number(part_number: str) -> dict:
+            if part_number and not PartSet.exists(
+                self.get_datafile(), "part_number", part_number
+            ):
+                item.set_part_number("")
+                return {
+                    "entry": part_number,
+                    "valid": False,
+                    "msg": "Part Number not found",
+                }
+            return item.set_part_number(part_number)
+
         result = self.validate_dialog_entry(
-            self.get_element().set_part_number,
+            set_part_number,
             self.part_number_combo,
             ItemDialog.TOOLTIPS["part_number"],
         )
@@ -389,18 +507,14 @@ class ItemDialog(Dialog, Ui_ItemDialog):
         """
         item = self.get_element()
         initial_conditions = deepcopy(item.get_properties())
-        self.set_combo_box_selections(
-            self.record_id_combo,
-            ItemSet(self.get_datafile(), None, None, "record_id").build_option_list(
-                "record_id"
-            ),
-            str(item.get_record_id()),
-        )
+        self.show_record_id(item.get_record_id())
         self.assembly_edit.setText(item.get_assembly())
         self.set_combo_box_selections(
             self.condition_combo,
-            ConditionSet(self.get_datafile()).build_option_list("condition"),
-            Condition(self.get_datafile(), item.get_condition()).get_condition(),
+            get_option_lists(self.get_datafile()).get_option_list(
+                "conditions", "condition"
+            ),
+            get_lookup_cache(self.get_datafile()).get_condition(item.get_condition()),
         )
         qty = item.get_quantity()
         self.quantity_edit.setText(str(qty))
@@ -420,14 +534,32 @@ class ItemDialog(Dialog, Ui_ItemDialog):
             fill_order_table_fields(
                 self.get_datafile(), item.get_part_number(), self.order_table
             )
+        else:
+            self.order_table.setRowCount(0)
 
         item.set_initial_values(initial_conditions)
 
         if self.get_operation() == Dialog.ADD_ELEMENT:
             item.set_value_valid_flag("record_id", True)
 
-        if not item.get_record_id():
-            self.delete_button.setEnabled(False)
+        self.delete_button.setEnabled(bool(item.get_record_id()))
+        if item.get_record_id():
+            self.prefetcher.prefetch(item.get_record_id())
+
+    def show_record_id(self, record_id: int) -> None:
+        """
+        Show a record_id in the record_id combo box.
+
+        The record_id need not be among those listed yet.
+
+        Parameters:
+            record_id (int): the record_id, blank if not positive.
+        """
+        try:
+            record_id = int(record_id)
+        except (TypeError, ValueError):
+            record_id = 0
+        self.record_id_combo.setEditText(str(record_id) if record_id > 0 else "")
 
     def fill_part_fields(self, part_number: str = None) -> None:
         """
@@ -439,15 +571,9 @@ class ItemDialog(Dialog, Ui_ItemDialog):
             part_number (String) The part number for the current item,
                 default is None
         """
-        part = Part(self.get_datafile(), part_number, "part_number")
-        self.set_combo_box_selections(
-            self.part_number_combo,
-            PartSet(self.get_datafile(), None, None, "part_number").build_option_list(
-                "part_number"
-            ),
-            part_number,
-        )
-        source = Source(self.get_datafile(), part.get_source()).get_source()
+        part = Part.get_element(self.get_datafile(), part_number, "part_number")
+        self.part_number_combo.setEditText(part_number if part_number else "")
+        source = get_lookup_cache(self.get_datafile()).get_source(part.get_source())
         self.source_text.setText(source)
         self.description_text.setText(part.get_description())
         self.remarks_text.setText(part.get_remarks())
@@ -458,8 +584,30 @@ class ItemDialog(Dialog, Ui_ItemDialog):
         self.set_element(Item(self.get_datafile()))
         self.fill_dialog_fields()
 
+    def rebind(self, record_id: int, operation: int) -> None:
+        """
+        Show another Item in the dialog, as if newly built.
+
+        The widgets are kept; the tooltips and error frames left by the
+        previous Item are reset and the fields filled again.
+
+        Parameters:
+            record_id (int): the record_id of the Item to edit, None
+                when adding.
+            operation (int): Dialog.ADD_ELEMENT or Dialog.EDIT_ELEMENT.
+        """
+        self.set_operation(operation)
+        self.set_element(Item.get_element(self.get_datafile(), record_id, edit=True))
+        self.set_tooltips()
+        self.set_error_frames()
+        self.set_visible_add_edit_elements()
+        self.fill_dialog_fields()
+
     def set_visible_add_edit_elements(self) -> None:
         """Set the visible dialog elements depending on operation flag."""
+        editing = self.get_operation() != Dialog.ADD_ELEMENT
+        self.previous_button.setEnabled(editing)
+        self.next_button.setEnabled(editing)
         if self.get_operation() == Dialog.ADD_ELEMENT:
             self.record_id_combo.setEnabled(False)
             self.record_id_combo.setToolTip(self.TOOLTIPS["record_id_tbd"])
@@ -475,6 +623,8 @@ class ItemDialog(Dialog, Ui_ItemDialog):
         self.assembly_edit.setToolTip(self.TOOLTIPS["assembly"])
         self.storage_box_edit.setToolTip(self.TOOLTIPS["box"])
         self.cancel_button.setToolTip(self.TOOLTIPS["cancel"])
+        self.next_button.setToolTip(self.TOOLTIPS["next"])
+        self.previous_button.setToolTip(self.TOOLTIPS["previous"])
         self.condition_combo.setToolTip(self.TOOLTIPS["condition"])
         self.delete_button.setToolTip(self.TOOLTIPS["delete"])
         self.installed_chkbox.setToolTip(self.TOOLTIPS["installed"])
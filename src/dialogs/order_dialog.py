@@ -14,21 +14,20 @@ from lbk_library import DataFile as PartsFile
 
 #  ErrorFrame, RowState, , TableButtonGroup, TableComboBox, TableLineEdit,
 from lbk_library.gui import Dialog, TableModel
-from PyQt6 import uic
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QBrush, QColor
-from PyQt6.QtWidgets import QHeaderView, QMainWindow
 #
 from elements import (
     Order,
 #    OrderLine,
     OrderLineSet,
-    OrderSet,
     Part,
 #    PartSet,
-    Source,
-    SourceSet,
+    get_lookup_cache,
+    get_option_lists,
 )
+from forms import Ui_OrderForm
+from qt_compat.QtCore import Qt
+from qt_compat.QtGui import QBrush, QColor
+from qt_compat.QtWidgets import QHeaderView, QMainWindow
 
 from .base_dialog import BaseDialog
 
@@ -38,7 +37,7 @@ from .base_dialog import BaseDialog
 # from PyQt6.QtGui import QFont
 
 
-class OrderDialog(BaseDialog):
+class OrderDialog(BaseDialog, Ui_OrderForm):
     """
     Edit an Order in the data file.
 
@@ -162,7 +161,8 @@ class OrderDialog(BaseDialog):
         """
         super().__init__(parent, parts_file, operation)
         self.set_element(Order(parts_file, record_id))
-        self.form = uic.loadUi("./src/forms/order.ui", self)
+        self.setupUi(self)
+        self.form = self
 
         # initialize the basics of the form
         self.set_tool_tips()
@@ -222,6 +222,22 @@ class OrderDialog(BaseDialog):
 #            self.action_orderline_cell_clicked
 #        )
 
+    def rebind(self, record_id: int, operation: int) -> None:
+        """
+        Reuse the dialog for another Order.
+
+        Parameters:
+            record_id (int) the index into the data file for the order
+                to be edited
+            operation (int): Dialog.ADD_ELEMENT or Dialog.EDIT_ELEMENT.
+        """
+        self.set_operation(operation)
+        self.set_element(Order(self.get_datafile(), record_id))
+        self.set_tool_tips()
+        self.set_error_frames()
+        self.set_visible_add_edit_elements()
+        self.fill_dialog_fields()
+
     def fill_dialog_fields(self) -> None:
         """
         Fill the Dialog fields for the order being displayed.
@@ -232,16 +248,18 @@ class OrderDialog(BaseDialog):
         print(order.get_properties())
         self.set_combo_box_selections(
             self.form.order_number_combo,
-            OrderSet(
-                self.get_parts_file(), None, None, "order_number"
-            ).build_option_list("order_number"),
+            get_option_lists(self.get_parts_file()).get_option_list(
+                "orders", "order_number", "order_number"
+            ),
             order.get_order_number(),
         )
 
         self.set_combo_box_selections(
             self.form.source_combo,
-            SourceSet(self.get_parts_file()).build_option_list("source"),
-            Source(self.get_parts_file(), order.get_source()).get_source(),
+            get_option_lists(self.get_parts_file()).get_option_list(
+                "sources", "source"
+            ),
+            get_lookup_cache(self.get_parts_file()).get_source(order.get_source()),
         )
         self.form.record_id_edit.setText(str(order.get_record_id()))
         self.form.order_number_edit.setText(order.get_order_number())
@@ -280,8 +298,7 @@ class OrderDialog(BaseDialog):
         if self.get_operation() == Dialog.ADD_ELEMENT:
             order.set_value_valid_flag("record_id", True)
 
-        if not order.get_record_id():
-            self.form.delete_button.setEnabled(False)
+        self.form.delete_button.setEnabled(bool(order.get_record_id()))
         self.save_buttons_enable(False)
 
     def update_total(self) -> None:
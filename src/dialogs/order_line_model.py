@@ -5,21 +5,23 @@ File:       order_line_model.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2024 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.0
+Version:    1.1.0
 """
 
 #from lbk_library import DataFile as PartsFile
 from lbk_library.gui import Dialog, TableModel
+
+from qt_compat.QtCore import Qt     # QModelIndex, 
+from qt_compat.QtGui import QBrush, QColor
 #from PyQt6 import uic
-from PyQt6.QtCore import Qt     # QModelIndex, 
-from PyQt6.QtGui import QBrush, QColor
 #from PyQt6.QtWidgets import QHeaderView, QMainWindow
 #
 #from elements import Condition, ConditionSet
 
-file_version = "1.0.0"
+file_version = "1.1.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Changed library 'PyQt6' to 'PySide6' through 'qt_compat'",
 }
 
 
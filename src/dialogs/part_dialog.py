@@ -5,7 +5,7 @@ File:       part_dialog.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2020 - 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.1.0
+Version:    1.6.0
 """
 
 from copy import deepcopy
@@ -13,17 +13,11 @@ from typing import ClassVar
 
 from lbk_library import DataFile as PartsFile
 from lbk_library.gui import Dialog
-from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QMainWindow, QMessageBox, QTableWidgetItem
-
-from elements import (
-    ItemSet,
-    Part,
-    PartSet,
-    Source,
-    SourceSet,
-)
+
+from elements import ItemSet, Part, PartSet, get_lookup_cache, get_option_lists
 from forms import Ui_PartForm
+from qt_compat.QtCore import Qt
+from qt_compat.QtWidgets import QMainWindow, QMessageBox, QTableWidgetItem
 
 from .dialog_support import (
     PART_ORDER_COL_NAMES,
@@ -31,11 +25,17 @@ from .dialog_support import (
     fill_order_table_fields,
     set_table_header,
 )
+from .part_number_completer import PartNumberCompleter
 
-file_version = "1.0.0"
+file_version = "1.6.0"
 changes = {
     "1.0.0": "Initial release",
     "1.1.0": "Changed library 'PyQt5' to 'PySide6' and code cleanup",
+    "1.2.0": "Import Qt through 'qt_compat'",
+    "1.3.0": "Read the combo box lists from the option list cache",
+    "1.4.0": "Type-ahead part number entry replaces the full part number list",
+    "1.5.0": "Added 'rebind' to reuse the dialog for another Part",
+    "1.6.0": "Edit a copy of the Element held by the identity map",
 }
 
 
@@ -47,7 +47,7 @@ class PartDialog(Dialog, Ui_PartForm):
     """
 
     TOOLTIPS: ClassVar[dict[str, str]] = {
-        "part_number_combo": "Select Part Number, Required",
+        "part_number_combo": "Type or select a Part Number, Required",
         "part_number_edit": "Enter a Part Number, Required",
         "source_combo": "Select a Source, Required",
         "description_edit": "Description of the part, Required, up to 255 characters",
@@ -91,7 +91,18 @@ class PartDialog(Dialog, Ui_PartForm):
         """
         super().__init__(parent, parts_file, operation)
         self.setupUi(self)
-        self.set_element(Part(parts_file, record_id))
+        self.set_element(Part.get_element(parts_file, record_id, edit=True))
+
+        # the part numbers matching the text typed are offered, in place
+        # of a list of every part number
+        self.part_number_completer = PartNumberCompleter(
+            parts_file, self.part_number_combo
+        )
+        """Offers the part numbers to change to when editing."""
+        self.new_part_number_completer = PartNumberCompleter(
+            parts_file, self.part_number_edit
+        )
+        """Shows the part numbers already in use when adding."""
 
         self.set_tooltips()
         self.set_error_frames()
@@ -125,6 +136,12 @@ class PartDialog(Dialog, Ui_PartForm):
             self.action_part_number_edit_changed
         )
         self.part_number_combo.activated.connect(self.action_part_number_combo_changed)
+        self.part_number_completer.activated.connect(
+            self.action_part_number_combo_changed
+        )
+        self.part_number_combo.lineEdit().returnPressed.connect(
+            self.action_part_number_combo_changed
+        )
         self.source_combo.activated.connect(self.action_source_changed)
         self.description_edit.editingFinished.connect(self.action_description_edit)
         self.remarks_edit.editingFinished.connect(self.action_remarks_changed)
@@ -204,12 +221,10 @@ class PartDialog(Dialog, Ui_PartForm):
         Handle the entry of a new part number in the text box. update
         the changed and valid flags as needed.
         """
-        partset = PartSet(self.get_datafile(), None, None, "part_number")
-        part_number_list = partset.build_option_list("part_number")
         part_number = self.part_number_edit.text()
 
         # if the part number is not in the current set, add
-        if part_number not in part_number_list:
+        if not PartSet.exists(self.get_datafile(), "part_number", part_number):
             part = self.get_element()
             result = part.set_part_number(self.part_number_edit.text())
             # self.save_buttons_enable(part.have_values_changed() and result["valid"])
@@ -236,14 +251,22 @@ class PartDialog(Dialog, Ui_PartForm):
         the selection box. If no changes on the dialog entries,
         repopulate the form with the new Part info. If any current
         dialog element has changed, give the user the option of saving
-        the changed part info or cancelling the part number change.
+        the changed part info or cancelling the part number change. A
+        part number typed in that is not in the parts file is dropped.
         """
         part = self.get_element()
-        new_part_number = self.part_number_combo.currentText()
+        new_part_number = self.part_number_combo.currentText().strip()
+        if not PartSet.exists(self.get_datafile(), "part_number", new_part_number):
+            self.part_number_combo.setEditText(part.get_part_number())
+            return
 
         # Are there unsaved edits
         if not part.have_values_changed():
-            self.set_element(Part(self.get_datafile(), new_part_number, "part_number"))
+            self.set_element(
+                Part.get_element(
+                    self.get_datafile(), new_part_number, "part_number", edit=True
+                )
+            )
             self.fill_dialog_fields()
         else:
             prev_part_number = part.get_part_number()
@@ -253,7 +276,12 @@ class PartDialog(Dialog, Ui_PartForm):
                 save_result = part.update()
                 if save_result:
                     self.set_element(
-                        Part(self.get_datafile(), new_part_number, "part_number")
+                        Part.get_element(
+                            self.get_datafile(),
+                            new_part_number,
+                            "part_number",
+                            edit=True,
+                        )
                     )
                     self.fill_dialog_fields()
                 else:
@@ -261,7 +289,9 @@ class PartDialog(Dialog, Ui_PartForm):
             elif result == QMessageBox.StandardButton.No:
                 # don't save, change to new part number
                 self.set_element(
-                    Part(self.get_datafile(), new_part_number, "part_number")
+                    Part.get_element(
+                        self.get_datafile(), new_part_number, "part_number", edit=True
+                    )
                 )
                 self.fill_dialog_fields()
             elif result == QMessageBox.StandardButton.Cancel:
@@ -282,7 +312,9 @@ class PartDialog(Dialog, Ui_PartForm):
                 ['msg'] - (str) Error message if not valid
         """
         result = {"entry": "", "valid": False, "msg": ""}
-        indices = SourceSet(self.get_datafile()).build_option_list("record_id")
+        indices = get_option_lists(self.get_datafile()).get_option_list(
+            "sources", "record_id"
+        )
         combo_index = self.source_combo.currentIndex()
         if combo_index >= 0 and combo_index < len(indices):
             index = int(indices[combo_index])
@@ -349,19 +381,13 @@ class PartDialog(Dialog, Ui_PartForm):
         if part.get_record_id() != 0:
             self.record_id_edit.setText(str(part.get_record_id()))
         self.part_number_edit.setText(part.get_part_number())
-        self.set_combo_box_selections(
-            self.part_number_combo,
-            PartSet(self.get_datafile(), None, None, "part_number").build_option_list(
-                "part_number"
-            ),
-            part.get_part_number(),
-        )
+        self.part_number_combo.setEditText(part.get_part_number())
         self.set_combo_box_selections(
             self.source_combo,
-            SourceSet(self.get_datafile(), None, None, "source").build_option_list(
-                "source"
+            get_option_lists(self.get_datafile()).get_option_list(
+                "sources", "source", "source"
             ),
-            Source(self.get_datafile(), part.get_source()).get_source(),
+            get_lookup_cache(self.get_datafile()).get_source(part.get_source()),
         )
         self.description_edit.setText(part.get_description())
         self.remarks_edit.setText(part.get_remarks())
@@ -389,36 +415,50 @@ class PartDialog(Dialog, Ui_PartForm):
         table = self.item_table
         table.clearContents()
         if part_number:
-            itemset = ItemSet(
+            items = ItemSet.get_records(
                 self.get_datafile(), "part_number", part_number, "assembly"
             )
-            table.setRowCount(itemset.get_number_elements())
-            if len(itemset.get_property_set()) > 0:
-                row = 0
-                for item in itemset:
-                    table.setItem(row, 0, QTableWidgetItem(item.get_assembly()))
+            table.setRowCount(len(items))
+            row = 0
+            for item in items:
+                table.setItem(row, 0, QTableWidgetItem(item.assembly))
 
-                    table.setItem(row, 1, QTableWidgetItem(str(item.get_record_id())))
+                table.setItem(row, 1, QTableWidgetItem(str(item.record_id)))
 
-                    entry = QTableWidgetItem(str(item.get_quantity()))
-                    entry.setTextAlignment(
-                        Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter
-                    )
-                    table.setItem(row, 2, entry)
+                entry = QTableWidgetItem(str(item.quantity))
+                entry.setTextAlignment(
+                    Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter
+                )
+                table.setItem(row, 2, entry)
 
-                    installed = item.get_installed()
-                    if installed:
-                        entry = QTableWidgetItem("Yes")
-                    else:
-                        entry = QTableWidgetItem("No")
-                    table.setItem(row, 3, entry)
-                    row += 1
+                if item.installed:
+                    entry = QTableWidgetItem("Yes")
+                else:
+                    entry = QTableWidgetItem("No")
+                table.setItem(row, 3, entry)
+                row += 1
 
     def clear_dialog(self) -> None:
         """Clear the dialog entry fields."""
         self.set_element(Part(self.get_datafile()))
         self.fill_dialog_fields()
 
+    def rebind(self, record_id: int, operation: int) -> None:
+        """
+        Load another Part into the dialog in place of building a new one.
+
+        Parameters:
+            record_id (int): the record_id of the Part to edit, None
+                when adding.
+            operation (int): Dialog.ADD_ELEMENT or Dialog.EDIT_ELEMENT.
+        """
+        self.set_operation(operation)
+        self.set_element(Part.get_element(self.get_datafile(), record_id, edit=True))
+        self.set_tooltips()
+        self.set_error_frames()
+        self.set_visible_add_edit_elements()
+        self.fill_dialog_fields()
+
     def set_visible_add_edit_elements(self) -> None:
         """Set the visible dialog elements depending on operation flag."""
         # always hide the entry index
@@ -0,0 +1,285 @@
+"""
+Complete part numbers as they are typed in a dialog.
+
+This module contains the following classes:
+    PartNumberModel - the part numbers, with their descriptions,
+        starting with the text typed.
+    PartNumberCompleter - the type-ahead completer of a part number
+        entry.
+
+File:       part_number_completer.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.0.0
+"""
+
+from typing import Any
+
+from lbk_library import DataFile as PartsFile
+
+from elements import ChangeEvent, get_change_bus
+from qt_compat.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt
+from qt_compat.QtWidgets import (
+    QAbstractItemView,
+    QComboBox,
+    QCompleter,
+    QHeaderView,
+    QLineEdit,
+    QTreeView,
+)
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Initial release",
+}
+
+
+def get_prefix_bound(prefix: str) -> str | None:
+    """
+    Get the first string past every string starting with a prefix.
+
+    The last character of the prefix is stepped to the next code point,
+    which orders after the prefix and all its extensions under the
+    binary collation of the parts file.
+
+    Parameters:
+        prefix (str): the prefix, not empty.
+
+    Returns:
+        (str | None) the bound, None if the prefix has no upper bound.
+    """
+    while prefix and ord(prefix[-1]) == 0x10FFFF:
+        prefix = prefix[:-1]
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def find_part_numbers(
+    parts_file: PartsFile, prefix: str, limit: int
+) -> list[dict[str, str]]:
+    """
+    Find the first part numbers starting with a prefix.
+
+    The part numbers are found by a range query on the part_number
+    index, so the time taken does not grow with the number of parts.
+    A prefix holding lower case letters is also looked up in upper
+    case, the usual form of a part number.
+
+    Parameters:
+        parts_file (PartsFile): reference to the parts file.
+        prefix (str): the start of the part numbers, any part number
+            if empty.
+        limit (int): the largest number of part numbers returned.
+
+    Returns:
+        (list[dict[str, str]]) the 'part_number' and 'description' of
+            the parts found, in part number order.
+    """
+    rows = {}
+    for start in dict.fromkeys((prefix, prefix.upper())):
+        sql = "SELECT part_number, description FROM parts WHERE part_number >= ?"
+        values = [start]
+        bound = get_prefix_bound(start)
+        if bound is not None:
+            sql += " AND part_number < ?"
+            values.append(bound)
+        sql += " ORDER BY part_number LIMIT ?"
+        values.append(limit)
+        for row in parts_file.sql_fetchrowset(parts_file.sql_query(sql, values)):
+            rows.setdefault(row["part_number"], row)
+    return [
+        {"part_number": row["part_number"], "description": row["description"] or ""}
+        for _part_number, row in sorted(rows.items())[:limit]
+    ]
+
+
+class PartNumberModel(QAbstractTableModel):
+    """
+    List the part numbers starting with a prefix.
+
+    The model holds no more than LIMIT parts, the part number in the
+    first column and the description in the second. It is read again
+    only when the prefix changes or the parts table has been written.
+    """
+
+    LIMIT = 25
+    """The largest number of part numbers listed."""
+
+    COLUMNS = ("Part Number", "Description")
+    """The column headers."""
+
+    def __init__(self, parts_file: PartsFile, parent: QObject = None) -> None:
+        """
+        Initialize an empty model.
+
+        Parameters:
+            parts_file (PartsFile): reference to the parts file.
+            parent (QObject): the owner of the model.
+        """
+        super().__init__(parent)
+        self.parts_file: PartsFile = parts_file
+        self.prefix: str | None = None
+        """The prefix of the parts listed, None when not read."""
+        self.parts: list[dict[str, str]] = []
+        get_change_bus(parts_file).subscribe(self.table_changed, ["parts"])
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Get the number of parts listed.
+
+        Parameters:
+            parent (QModelIndex): unused, the model is a flat table.
+
+        Returns:
+            (int) the number of rows.
+        """
+        if parent.isValid():
+            return 0
+        return len(self.parts)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Get the number of columns.
+
+        Parameters:
+            parent (QModelIndex): unused, the model is a flat table.
+
+        Returns:
+            (int) the number of columns.
+        """
+        if parent.isValid():
+            return 0
+        return len(self.COLUMNS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        """
+        Get the part number or description of a row.
+
+        Parameters:
+            index (QModelIndex): the row and column.
+            role (int): the data role.
+
+        Returns:
+            (Any) the text, None for other roles.
+        """
+        if not index.isValid() or index.row() >= len(self.parts):
+            return None
+        part = self.parts[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if index.column() == 0:
+                return part["part_number"]
+            return part["description"]
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return part["description"]
+        return None
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        """
+        Get the column headers.
+
+        Parameters:
+            section (int): the column.
+            orientation (Qt.Orientation): the header orientation.
+            role (int): the data role.
+
+        Returns:
+            (Any) the header text, None for other roles.
+        """
+        if (
+            orientation == Qt.Orientation.Horizontal
+            and role == Qt.ItemDataRole.DisplayRole
+            and 0 <= section < len(self.COLUMNS)
+        ):
+            return self.COLUMNS[section]
+        return None
+
+    def set_prefix(self, prefix: str) -> None:
+        """
+        List the part numbers starting with a prefix.
+
+        Parameters:
+            prefix (str): the text typed.
+        """
+        prefix = prefix.strip()
+        if prefix == self.prefix:
+            return
+        parts = []
+        if self.parts_file.sql_is_connected():
+            parts = find_part_numbers(self.parts_file, prefix, self.LIMIT)
+        self.beginResetModel()
+        self.prefix = prefix
+        self.parts = parts
+        self.endResetModel()
+
+    def table_changed(self, event: ChangeEvent) -> None:
+        """
+        Read the parts again at the next prefix after a write.
+
+        Parameters:
+            event (ChangeEvent): the write published on the change bus.
+        """
+        self.prefix = None
+
+
+class PartNumberCompleter(QCompleter):
+    """
+    Offer the part numbers starting with the text typed.
+
+    A combo box it is attached to is made editable and holds no list of
+    its own. The completer pops up the first part numbers matching the
+    text, with their descriptions, each time the text is edited. Only
+    those few rows are read from the parts file, so typing stays quick
+    however many parts it holds.
+    """
+
+    def __init__(self, parts_file: PartsFile, entry: QComboBox | QLineEdit) -> None:
+        """
+        Attach a completer to a part number entry.
+
+        Parameters:
+            parts_file (PartsFile): reference to the parts file.
+            entry (QComboBox | QLineEdit): the part number combo box or
+                line edit, the owner of the completer.
+        """
+        super().__init__(entry)
+        self.part_numbers = PartNumberModel(parts_file, self)
+        """The parts matching the text typed."""
+        self.setModel(self.part_numbers)
+        self.setCompletionColumn(0)
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.setMaxVisibleItems(12)
+
+        popup = QTreeView()
+        popup.setRootIsDecorated(False)
+        popup.setUniformRowHeights(True)
+        popup.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        popup.header().hide()
+        popup.header().setStretchLastSection(True)
+        self.setPopup(popup)
+        popup.header().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+
+        if isinstance(entry, QComboBox):
+            entry.clear()
+            entry.setEditable(True)
+            entry.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        entry.setCompleter(self)
+
+    def splitPath(self, path: str) -> list[str]:
+        """
+        Read the part numbers for the text typed before it is matched.
+
+        Parameters:
+            path (str): the text typed.
+
+        Returns:
+            (list[str]) the text typed, matched as a whole.
+        """
+        self.part_numbers.set_prefix(path)
+        return [path]
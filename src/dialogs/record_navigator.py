@@ -0,0 +1,400 @@
+"""
+Step through the records of a parts file table from a dialog.
+
+This module contains the following classes:
+    RecordIdModel - the record_ids of a table, read a page at a time
+        for a record selector combo box.
+    RecordPrefetcher - read the Items next to the one shown on a worker
+        thread, so stepping to them needs no query.
+
+File:       record_navigator.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.2.0
+"""
+
+from bisect import bisect_left
+from typing import Any
+
+from lbk_library import DataFile as PartsFile
+
+from elements import (
+    ADDED,
+    DELETED,
+    ChangeEvent,
+    Item,
+    Part,
+    ReadOnlyPartsFile,
+    get_change_bus,
+    get_identity_map,
+    trusted_rows,
+)
+from qt_compat.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QObject,
+    QRunnable,
+    Qt,
+    QThreadPool,
+    Signal,
+)
+
+file_version = "1.2.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Import 'ReadOnlyPartsFile' from 'elements', not 'pages'",
+    "1.2.0": "End a prefetch on any error of its read",
+}
+
+
+def get_adjacent_record_id(
+    parts_file: PartsFile, table: str, record_id: int, forward: bool = True
+) -> int | None:
+    """
+    Get the record_id next to a record, in record_id order.
+
+    The record need not exist; the nearest record_id past it is found
+    through the primary key index.
+
+    Parameters:
+        parts_file (PartsFile): reference to the parts file.
+        table (str): the parts file table.
+        record_id (int): the record_id to step from.
+        forward (bool): True for the next record, False for the
+            previous one.
+
+    Returns:
+        (int | None) the record_id found, None at either end.
+    """
+    if forward:
+        sql = "SELECT record_id FROM " + table + " WHERE record_id > ? "
+        sql += "ORDER BY record_id LIMIT 1"
+    else:
+        sql = "SELECT record_id FROM " + table + " WHERE record_id < ? "
+        sql += "ORDER BY record_id DESC LIMIT 1"
+    row = parts_file.sql_fetchrow(parts_file.sql_query(sql, [int(record_id)]))
+    return int(row["record_id"]) if row else None
+
+
+def get_parts_file_path(parts_file: PartsFile) -> str:
+    """
+    Get the path of the file open on a parts file connection.
+
+    Parameters:
+        parts_file (PartsFile): reference to the parts file.
+
+    Returns:
+        (str) the file path, empty if not open or held in memory.
+    """
+    if not parts_file.sql_is_connected():
+        return ""
+    for row in parts_file.sql_fetchrowset(parts_file.sql_query("PRAGMA database_list")):
+        if row["name"] == "main":
+            return row["file"] or ""
+    return ""
+
+
+class RecordIdModel(QAbstractListModel):
+    """
+    List the record_ids of a table for a record selector.
+
+    Only the first page of record_ids is read when the model is set on
+    a combo box; the following pages are read as the list is scrolled,
+    each by an indexed range query starting after the last record_id
+    read. Rows added to or deleted from the table are patched into the
+    list.
+    """
+
+    PAGE_SIZE = 200
+    """The number of record_ids read at a time."""
+
+    def __init__(
+        self, parts_file: PartsFile, table: str, parent: QObject = None
+    ) -> None:
+        """
+        Initialize the model; nothing is read until the list is shown.
+
+        Parameters:
+            parts_file (PartsFile): reference to the parts file.
+            table (str): the parts file table listed.
+            parent (QObject): the owner of the model.
+        """
+        super().__init__(parent)
+        self.parts_file: PartsFile = parts_file
+        self.table: str = table
+        self.record_ids: list[int] = []
+        """The record_ids read so far, in order."""
+        self.complete: bool = False
+        """True once the last record_id has been read."""
+        get_change_bus(parts_file).subscribe(self.table_changed, [table])
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Get the number of record_ids read.
+
+        Parameters:
+            parent (QModelIndex): unused, the model is a flat list.
+
+        Returns:
+            (int) the number of rows.
+        """
+        if parent.isValid():
+            return 0
+        return len(self.record_ids)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        """
+        Get the record_id of a row as text.
+
+        Parameters:
+            index (QModelIndex): the row.
+            role (int): the data role.
+
+        Returns:
+            (Any) the record_id text, None for other roles.
+        """
+        if not index.isValid() or index.row() >= len(self.record_ids):
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return str(self.record_ids[index.row()])
+        return None
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """
+        Check if more record_ids remain to be read.
+
+        Parameters:
+            parent (QModelIndex): unused, the model is a flat list.
+
+        Returns:
+            (bool) True if another page may be read.
+        """
+        return (
+            not parent.isValid()
+            and not self.complete
+            and self.parts_file.sql_is_connected()
+        )
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        """
+        Read the next page of record_ids.
+
+        Parameters:
+            parent (QModelIndex): unused, the model is a flat list.
+        """
+        if not self.canFetchMore(parent):
+            return
+        last = self.record_ids[-1] if self.record_ids else 0
+        rows = self.parts_file.sql_fetchrowset(
+            self.parts_file.sql_query(
+                "SELECT record_id FROM "
+                + self.table
+                + " WHERE record_id > ? ORDER BY record_id LIMIT ?",
+                [last, self.PAGE_SIZE],
+            )
+        )
+        if len(rows) < self.PAGE_SIZE:
+            self.complete = True
+        if rows:
+            first = len(self.record_ids)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self.record_ids.extend(int(row["record_id"]) for row in rows)
+            self.endInsertRows()
+
+    def table_changed(self, event: ChangeEvent) -> None:
+        """
+        Patch the list for a row added or deleted.
+
+        The rows are inserted or removed in place rather than the model
+        reset, which would clear the text of an editable combo box. An
+        added record_id past the rows read is left to be read with its
+        page.
+
+        Parameters:
+            event (ChangeEvent): the write published on the change bus.
+        """
+        row = bisect_left(self.record_ids, event.record_id)
+        if event.action == ADDED:
+            if row < len(self.record_ids) or self.complete:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self.record_ids.insert(row, event.record_id)
+                self.endInsertRows()
+        elif event.action == DELETED:
+            if row < len(self.record_ids) and self.record_ids[row] == event.record_id:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.record_ids[row]
+                self.endRemoveRows()
+
+
+class PrefetchTask(QRunnable):
+    """Run the reads of a RecordPrefetcher on a thread pool thread."""
+
+    def __init__(
+        self, prefetcher: "RecordPrefetcher", record_id: int, generation: int
+    ) -> None:
+        """
+        Build the task.
+
+        Parameters:
+            prefetcher (RecordPrefetcher): the prefetcher to read for.
+            record_id (int): the record_id of the Item shown.
+            generation (int): the generation of the prefetcher at the
+                time of the request.
+        """
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.record_id = record_id
+        self.generation = generation
+
+    def run(self) -> None:
+        """Read the neighbouring rows."""
+        self.prefetcher.run(self.record_id, self.generation)
+
+
+class RecordPrefetcher(QObject):
+    """
+    Read the Items next to the one shown, ahead of the user stepping.
+
+    The Item rows on either side of the Item shown, and the rows of
+    their Parts, are read on a worker thread through a read only
+    connection of the prefetcher's own. Back on the main thread they
+    are built into Items and Parts held by the identity map of the
+    parts file, where 'Item.get_element' and 'Part.get_element' find
+    them without a query.
+
+    Rows read before a write to the items or parts tables are dropped,
+    so a stale copy is never put in the identity map. At most one read
+    runs at a time; a request made meanwhile replaces any request
+    already waiting.
+    """
+
+    COUNT = 5
+    """The number of Items read on each side of the one shown."""
+
+    rows_read = Signal(int, list, list)
+    """The generation, Item rows and Part rows read by the worker."""
+
+    def __init__(self, parts_file: PartsFile, parent: QObject = None) -> None:
+        """
+        Set up the prefetcher.
+
+        Parameters:
+            parts_file (PartsFile): reference to the parts file.
+            parent (QObject): the owner of the prefetcher.
+        """
+        super().__init__(parent)
+        self.parts_file: PartsFile = parts_file
+        self.thread_pool: QThreadPool = QThreadPool.globalInstance()
+        self.filepath: str = ""
+        """The path of the parts file, read by the worker."""
+        self.generation: int = 0
+        """Counts the writes, to recognise rows read before one."""
+        self.running: bool = False
+        self.pending: int | None = None
+        """The record_id of the request waiting for the running read."""
+        self.rows_read.connect(self.store_rows)
+        get_change_bus(parts_file).subscribe(self.table_changed, ["items", "parts"])
+
+    def prefetch(self, record_id: int) -> None:
+        """
+        Read the Items around a record_id in the background.
+
+        Parameters:
+            record_id (int): the record_id of the Item shown.
+        """
+        filepath = get_parts_file_path(self.parts_file)
+        if not filepath:
+            return
+        if self.running:
+            self.pending = int(record_id)
+            return
+        self.running = True
+        self.filepath = filepath
+        self.thread_pool.start(PrefetchTask(self, int(record_id), self.generation))
+
+    def run(self, record_id: int, generation: int) -> None:
+        """
+        Read the neighbouring rows, on the worker thread.
+
+        Parameters:
+            record_id (int): the record_id of the Item shown.
+            generation (int): the generation at the time of the request.
+        """
+        item_rows = []
+        part_rows = []
+        try:
+            parts_file = ReadOnlyPartsFile(self.filepath)
+            try:
+                for sql in (
+                    "SELECT * FROM items WHERE record_id > ? "
+                    "ORDER BY record_id LIMIT ?",
+                    "SELECT * FROM items WHERE record_id < ? "
+                    "ORDER BY record_id DESC LIMIT ?",
+                ):
+                    item_rows.extend(
+                        parts_file.sql_fetchrowset(
+                            parts_file.sql_query(sql, [record_id, self.COUNT])
+                        )
+                    )
+                part_numbers = sorted(
+                    {row["part_number"] for row in item_rows if row["part_number"]}
+                )
+                if part_numbers:
+                    part_rows = parts_file.sql_fetchrowset(
+                        parts_file.sql_query(
+                            "SELECT * FROM parts WHERE part_number IN ("
+                            + ", ".join("?" * len(part_numbers))
+                            + ")",
+                            part_numbers,
+                        )
+                    )
+            finally:
+                parts_file.sql_close()
+        except Exception:
+            # a worker thread has no caller to raise to, and prefetching
+            # is only an optimization, the rows are read when needed
+            # instead; 'rows_read' is still emitted to end the read
+            item_rows = []
+            part_rows = []
+        try:
+            self.rows_read.emit(generation, item_rows, part_rows)
+        except RuntimeError:
+            # the prefetcher was deleted with its dialog
+            pass
+
+    def store_rows(
+        self, generation: int, item_rows: list[dict], part_rows: list[dict]
+    ) -> None:
+        """
+        Put the Items and Parts read in the identity map.
+
+        Elements already held are kept as they are.
+
+        Parameters:
+            generation (int): the generation of the request.
+            item_rows (list[dict]): the Item rows read.
+            part_rows (list[dict]): the Part rows read.
+        """
+        self.running = False
+        if generation == self.generation and self.parts_file.sql_is_connected():
+            identity_map = get_identity_map(self.parts_file)
+            with trusted_rows():
+                for row in item_rows:
+                    if identity_map.get("items", "record_id", row["record_id"]) is None:
+                        identity_map.put(Item(self.parts_file, row))
+                for row in part_rows:
+                    if identity_map.get("parts", "record_id", row["record_id"]) is None:
+                        identity_map.put(Part(self.parts_file, row))
+        if self.pending is not None:
+            record_id, self.pending = self.pending, None
+            self.prefetch(record_id)
+
+    def table_changed(self, event: ChangeEvent) -> None:
+        """
+        Drop the rows being read when the tables are written.
+
+        Parameters:
+            event (ChangeEvent): the write published on the change bus.
+        """
+        self.generation += 1
@@ -2,40 +2,71 @@
 The Parts Tracker Database Element Collection.
 
 This module contains the following classes
+    ChangeBus delivers the writes to a parts file to its subscribers
+    ChangeEvent describes a single row written
     Condition extends lbk_library.Element
     ConditionSet extends lbk_library.ElementSet
+    IdentityMap holds the Elements already read from a parts file
     Item extends lbk_library.Element
     ItemSet extends lbk_library.ElementSet
+    ItemView is a read only view of the Items with display values
+    LookupCache holds the Source and Condition names of a parts file
+    OptionListCache holds the combo box option lists of a parts file
     OrderLine extends lbk_library.Element
     OrderLineSet extends lbk_library.ElementSet
     Part extends lbk_library.Element
     PartSet extends lbk_library.ElementSet
     Order extends lbk_library.Element
     OrderSet extends lbk_library.ElementSet
+    PublishingElement publishes the writes of an Element on the ChangeBus
+    ReadOnlyPartsFile is a read only parts file connection for a worker
+        thread
+    Record is a compact read only row; ItemRecord, OrderLineRecord,
+        OrderRecord and PartRecord hold the rows of each table
     Source extends lbk_library.Element
     SourceSet extends lbk_library.ElementSet
+    TrustedElement builds Elements directly from parts file rows
 
 File:       __init__.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT (https://opensource.org/licenses/MIT)
-Version:    1.0.0
+Version:    1.3.0
 """
 
+from .change_bus import (
+    ADDED,
+    DELETED,
+    UPDATED,
+    ChangeBus,
+    ChangeEvent,
+    PublishingElement,
+    get_change_bus,
+)
 from .condition import Condition
 from .condition_set import ConditionSet
+from .identity_map import IdentityMap, get_identity_map
 from .item import Item
 from .item_set import ItemSet
+from .item_view import ItemView
+from .lookup_cache import LookupCache, get_lookup_cache
+from .option_lists import OptionListCache, get_option_lists
 from .order import Order
 from .order_line import OrderLine
 from .order_line_set import OrderLineSet
 from .order_set import OrderSet
 from .part import Part
 from .part_set import PartSet
+from .read_only_parts_file import ReadOnlyPartsFile
+from .record import ItemRecord, OrderLineRecord, OrderRecord, PartRecord, Record
 from .source import Source
 from .source_set import SourceSet
+from .trusted_element import TrustedElement, trusted_rows
 
-file_version = "1.0.0"
+file_version = "1.3.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Add the change bus",
+    "1.2.0": "Add the option list cache",
+    "1.3.0": "Add the read only parts file",
 }
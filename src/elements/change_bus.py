@@ -0,0 +1,286 @@
+"""
+Publish the writes to an open parts file to the parts of the program
+showing its contents.
+
+File:       change_bus.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.1.0
+"""
+
+from inspect import ismethod
+from typing import Any, Callable, Iterable, NamedTuple
+from weakref import WeakKeyDictionary, WeakMethod
+
+from lbk_library import DataFile as PartsFile
+
+file_version = "1.1.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Take the row written from the initial values, not a query",
+}
+
+ADDED = "added"
+"""The action of a ChangeEvent for a new row."""
+
+UPDATED = "updated"
+"""The action of a ChangeEvent for a revised row."""
+
+DELETED = "deleted"
+"""The action of a ChangeEvent for a removed row."""
+
+
+class ChangeEvent(NamedTuple):
+    """A single row written to a parts file table."""
+
+    table: str
+    """The parts file table written."""
+
+    record_id: int
+    """The record_id of the row."""
+
+    action: str
+    """One of ADDED, UPDATED or DELETED."""
+
+    columns: tuple[str, ...]
+    """The columns changed; every column for an added or deleted row."""
+
+    values: dict[str, Any]
+    """The row as written; the row removed for a deleted row."""
+
+    old_values: dict[str, Any]
+    """The values the changed columns held before an update."""
+
+
+class ChangeBus:
+    """
+    Deliver the ChangeEvents of a parts file to its subscribers.
+
+    The events are delivered at once, in the order the subscribers
+    were added, on the thread doing the write. A bound method is held
+    weakly, so subscribing does not keep its object, such as a page,
+    alive; it is dropped when the object goes.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a bus without subscribers."""
+        self._subscribers: list[
+            tuple[Callable[[], Callable[[ChangeEvent], None]], frozenset[str] | None]
+        ] = []
+
+    def subscribe(
+        self,
+        callback: Callable[[ChangeEvent], None],
+        tables: Iterable[str] = None,
+        first: bool = False,
+    ) -> None:
+        """
+        Add a subscriber.
+
+        Parameters:
+            callback (Callable[[ChangeEvent], None]): called with each
+                event of the tables.
+            tables (Iterable[str]): the tables of interest, all tables
+                if None.
+            first (bool): True to be called ahead of the subscribers
+                already added, as the caches are, so the others see
+                the values written.
+        """
+        self.unsubscribe(callback)
+        if ismethod(callback):
+            reference = WeakMethod(callback)
+        else:
+            reference = lambda: callback  # noqa: E731
+        subscriber = (reference, frozenset(tables) if tables is not None else None)
+        if first:
+            self._subscribers.insert(0, subscriber)
+        else:
+            self._subscribers.append(subscriber)
+
+    def unsubscribe(self, callback: Callable[[ChangeEvent], None]) -> None:
+        """
+        Remove a subscriber, if present.
+
+        Parameters:
+            callback (Callable[[ChangeEvent], None]): the subscriber.
+        """
+        self._subscribers = [
+            (reference, tables)
+            for reference, tables in self._subscribers
+            if reference() not in (None, callback)
+        ]
+
+    def has_subscribers(self, table: str) -> bool:
+        """
+        Check if any subscriber is interested in a table.
+
+        Parameters:
+            table (str): the parts file table.
+
+        Returns:
+            (bool) True if an event of the table would be delivered.
+        """
+        return any(
+            reference() is not None and (tables is None or table in tables)
+            for reference, tables in self._subscribers
+        )
+
+    def publish(self, event: ChangeEvent) -> None:
+        """
+        Deliver an event to the subscribers of its table.
+
+        Parameters:
+            event (ChangeEvent): the event.
+        """
+        for reference, tables in list(self._subscribers):
+            if tables is None or event.table in tables:
+                callback = reference()
+                if callback is not None:
+                    callback(event)
+
+
+_change_buses: WeakKeyDictionary = WeakKeyDictionary()
+"""The change bus of each parts file in use."""
+
+
+def get_change_bus(parts_file: PartsFile) -> ChangeBus:
+    """
+    Get the change bus attached to a parts file.
+
+    The bus is created the first time it is requested and is dropped
+    with the parts file.
+
+    Parameters:
+        parts_file (PartsFile): reference to the parts file.
+
+    Returns:
+        (ChangeBus) the bus of the parts file.
+    """
+    bus = _change_buses.get(parts_file)
+    if bus is None:
+        bus = ChangeBus()
+        _change_buses[parts_file] = bus
+    return bus
+
+
+def _same_value(stored: Any, value: Any) -> bool:
+    """
+    Compare a stored column value with an Element property.
+
+    Parameters:
+        stored (Any): the value read from the parts file.
+        value (Any): the Element property.
+
+    Returns:
+        (bool) True if the two hold the same value.
+    """
+    if stored in (None, "") and value in (None, ""):
+        return True
+    if isinstance(value, (bool, int, float)) and isinstance(stored, (int, float)):
+        return stored == value
+    return str(stored) == str(value)
+
+
+class PublishingElement:
+    """
+    Publish a ChangeEvent for each successful write of an Element.
+
+    The columns changed by an update, and the row removed by a
+    deletion, are taken from the initial values of the Element, the
+    values it was read or last written with, so no row is read from the
+    parts file to publish a write.
+
+    This is a mixin listed ahead of lbk_library.Element.
+    """
+
+    def _get_stored_row(self) -> dict[str, Any] | None:
+        """
+        Get the row of this Element, as read or last written.
+
+        Returns:
+            (dict[str, Any] | None) the initial values, None if nobody
+                listens for the table.
+        """
+        if not get_change_bus(self.get_datafile()).has_subscribers(self.get_table()):
+            return None
+        stored = dict(self.get_initial_values() or {})
+        stored["record_id"] = self.get_record_id()
+        return stored
+
+    def _publish(
+        self,
+        action: str,
+        record_id: int,
+        columns: tuple[str, ...],
+        values: dict[str, Any],
+        old_values: dict[str, Any],
+    ) -> None:
+        """Publish an event for this Element's table."""
+        get_change_bus(self.get_datafile()).publish(
+            ChangeEvent(
+                self.get_table(), int(record_id), action, columns, values, old_values
+            )
+        )
+
+    def add(self) -> int:
+        """
+        Add this Element to the parts file and publish the new row.
+
+        Returns:
+            (int) the result of the parts file insertion.
+        """
+        result = super().add()
+        if result:
+            record_id = self.get_record_id()
+            if isinstance(result, int) and not isinstance(result, bool):
+                record_id = result
+            values = dict(self.get_properties())
+            values["record_id"] = record_id
+            self.set_initial_values(dict(values))
+            if get_change_bus(self.get_datafile()).has_subscribers(self.get_table()):
+                self._publish(ADDED, record_id, tuple(values), values, {})
+        return result
+
+    def update(self) -> bool:
+        """
+        Update this Element in the parts file and publish the change.
+
+        No event is published if no column changed.
+
+        Returns:
+            (bool) True if the update succeeded, False otherwise.
+        """
+        stored = self._get_stored_row()
+        result = super().update()
+        if result:
+            values = dict(self.get_properties())
+            self.set_initial_values(dict(values))
+            if stored is not None:
+                columns = tuple(
+                    column
+                    for column, value in values.items()
+                    if column not in stored or not _same_value(stored[column], value)
+                )
+                if columns:
+                    self._publish(
+                        UPDATED,
+                        self.get_record_id(),
+                        columns,
+                        values,
+                        {column: stored.get(column) for column in columns},
+                    )
+        return result
+
+    def delete(self) -> bool:
+        """
+        Delete this Element from the parts file and publish the removal.
+
+        Returns:
+            (bool) True if the deletion succeeded, False otherwise.
+        """
+        stored = self._get_stored_row()
+        result = super().delete()
+        if result and stored is not None:
+            self._publish(DELETED, stored["record_id"], tuple(stored), stored, {})
+        return result
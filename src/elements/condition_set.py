@@ -5,17 +5,19 @@ File:       condition_set.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.0
+Version:    1.1.0
 """
 
 from lbk_library import DataFile as PartsFile
 from lbk_library import ElementSet
 
 from .condition import Condition
+from .set_query import NO_ROWS
 
-file_version = "1.0.0"
+file_version = "1.1.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "A None where value matches no rows",
 }
 
 
@@ -41,13 +43,17 @@ class ConditionSet(ElementSet):
                 the key value to determine the elements being retrieved.
                 Default is all rows are retrieved.
             where_value (int | str): The key value to retrieve. Required
-                if where_column is set.
+                if where_column is set, None matches no rows.
             order_by_column (str): zero or more column names separated by
                 commas to order the resulting set of elements.
         """
         table_name = "conditions"
         element_type = Condition
 
+        if where_column and where_value is None:
+            # a key column without a key value matches no rows
+            where_column, where_value = NO_ROWS
+
         super().__init__(
             parts_file,
             table_name,
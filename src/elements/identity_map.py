@@ -0,0 +1,250 @@
+"""
+Hold the Elements already read from an open parts file.
+
+File:       identity_map.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.2.0
+"""
+
+from collections import OrderedDict
+from typing import Any
+from weakref import WeakKeyDictionary, WeakValueDictionary
+
+from lbk_library import DataFile as PartsFile
+from lbk_library import Element
+
+from .change_bus import ADDED, ChangeEvent, get_change_bus
+from .trusted_element import trusted_rows
+
+file_version = "1.2.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Evict the written rows by key from the change bus",
+    "1.2.0": "Added 'copy_element' for the Elements opened for editing",
+}
+
+
+class IdentityMap:
+    """
+    Map the parts file keys to the Element instances already built.
+
+    An Element is held under (table, column, value) for each of the key
+    columns of its table, so an Item is found by its record_id and a
+    Part by either its record_id or its part_number. Elements are held
+    by weak reference; the most recently used are also held strongly
+    so they survive until pushed out by newer ones.
+
+    A held Element is shared by every reader, so it is only ever read;
+    an Element to be edited is a copy, taken with 'copy_element'. An
+    Element with unsaved changes is never returned, the caller reads a
+    fresh copy from the parts file instead. Every row updated or
+    deleted is evicted, under its old and new keys, as its write is
+    published on the change bus, whichever instance did the write.
+    """
+
+    KEY_COLUMNS: dict[str, tuple[str, ...]] = {
+        "items": ("record_id",),
+        "order_lines": ("record_id",),
+        "orders": ("record_id", "order_number"),
+        "parts": ("record_id", "part_number"),
+    }
+    """The columns each table's Elements can be looked up by."""
+
+    def __init__(self, capacity: int = 256) -> None:
+        """
+        Initialize an empty identity map.
+
+        Parameters:
+            capacity (int): the number of recently used Elements held
+                strongly, default is 256.
+        """
+        self._capacity: int = capacity
+        self._elements: WeakValueDictionary = WeakValueDictionary()
+        self._recent: OrderedDict = OrderedDict()
+
+    def get(self, table: str, column: str, value: Any) -> Element | None:
+        """
+        Get the Element held for a key.
+
+        Parameters:
+            table (str): the parts file table of the Element.
+            column (str): one of the key columns of the table.
+            value (Any): the key value.
+
+        Returns:
+            (Element | None) the held Element or None if the key is not
+                held or the Element held has unsaved changes.
+        """
+        key = self._make_key(table, column, value)
+        if key is None:
+            return None
+        element = self._elements.get(key)
+        if element is None:
+            return None
+        if (
+            element.have_values_changed()
+            or self._make_key(table, column, element.get_properties()[column]) != key
+        ):
+            # stale entry, the Element has been edited since stored
+            self._forget(key)
+            return None
+        self._touch(key, element)
+        return element
+
+    def put(self, element: Element) -> None:
+        """
+        Hold an Element under each of its key columns.
+
+        Elements not yet saved in the parts file are not held.
+
+        Parameters:
+            element (Element): the Element to hold.
+        """
+        table = element.get_table()
+        properties = element.get_properties()
+        if table not in self.KEY_COLUMNS or not properties.get("record_id"):
+            return
+        for column in self.KEY_COLUMNS[table]:
+            key = self._make_key(table, column, properties.get(column))
+            if key is not None:
+                self._elements[key] = element
+                self._touch(key, element)
+
+    def evict(self, table: str, values: dict[str, Any]) -> None:
+        """
+        Drop the keys of a row.
+
+        Parameters:
+            table (str): the parts file table of the row.
+            values (dict[str, Any]): the row values; the key columns
+                missing are skipped.
+        """
+        for column in self.KEY_COLUMNS.get(table, ()):
+            key = self._make_key(table, column, values.get(column))
+            if key is not None:
+                self._forget(key)
+
+    def table_changed(self, event: ChangeEvent) -> None:
+        """
+        Evict a row updated or deleted in the parts file.
+
+        Both the keys the row is stored under and those it held before
+        an update, such as a Part's old part_number, are dropped.
+
+        Parameters:
+            event (ChangeEvent): the write published on the change bus.
+        """
+        if event.action == ADDED:
+            return
+        self.evict(event.table, {**event.values, "record_id": event.record_id})
+        self.evict(event.table, event.old_values)
+
+    def clear(self) -> None:
+        """Drop all the held Elements."""
+        self._elements.clear()
+        self._recent.clear()
+
+    def __len__(self) -> int:
+        """
+        Get the number of keys held.
+
+        Returns:
+            (int) the number of keys held.
+        """
+        return len(self._elements)
+
+    def _make_key(self, table: str, column: str, value: Any) -> tuple | None:
+        """
+        Build the map key for a table, column and value.
+
+        Parameters:
+            table (str): the parts file table.
+            column (str): the key column.
+            value (Any): the key value.
+
+        Returns:
+            (tuple | None) the normalized key, None if the value cannot
+                identify a saved Element.
+        """
+        if column == "record_id":
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                return None
+            if value <= 0:
+                return None
+        elif value is None or str(value) == "":
+            return None
+        else:
+            value = str(value)
+        return (table, column, value)
+
+    def _touch(self, key: tuple, element: Element) -> None:
+        """
+        Mark a key as most recently used, evicting the oldest entries.
+
+        Parameters:
+            key (tuple): the map key.
+            element (Element): the Element held under the key.
+        """
+        self._recent[key] = element
+        self._recent.move_to_end(key)
+        while len(self._recent) > self._capacity:
+            self._recent.popitem(last=False)
+
+    def _forget(self, key: tuple) -> None:
+        """
+        Drop a single key.
+
+        Parameters:
+            key (tuple): the map key.
+        """
+        self._elements.pop(key, None)
+        self._recent.pop(key, None)
+
+
+_identity_maps: WeakKeyDictionary = WeakKeyDictionary()
+"""The identity map of each parts file in use."""
+
+
+def get_identity_map(parts_file: PartsFile) -> IdentityMap:
+    """
+    Get the identity map attached to a parts file.
+
+    The map is created empty the first time it is requested, listening
+    on the change bus for the writes of the tables it holds, and is
+    dropped with the parts file.
+
+    Parameters:
+        parts_file (PartsFile): reference to the parts file.
+
+    Returns:
+        (IdentityMap) the identity map of the parts file.
+    """
+    identity_map = _identity_maps.get(parts_file)
+    if identity_map is None:
+        identity_map = IdentityMap()
+        _identity_maps[parts_file] = identity_map
+        get_change_bus(parts_file).subscribe(
+            identity_map.table_changed, tuple(IdentityMap.KEY_COLUMNS), first=True
+        )
+    return identity_map
+
+
+def copy_element(element: Element) -> Element:
+    """
+    Copy a held Element, for editing without changing the one held.
+
+    The copy is built from the values of the Element, without reading
+    the parts file.
+
+    Parameters:
+        element (Element): the Element to copy.
+
+    Returns:
+        (Element) a new Element of the same type and values.
+    """
+    with trusted_rows():
+        return type(element)(element.get_datafile(), dict(element.get_properties()))
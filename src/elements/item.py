@@ -5,7 +5,7 @@ File:       item.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2022 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.0
+Version:    1.4.0
 """
 
 from copy import deepcopy
@@ -14,13 +14,21 @@ from typing import Any
 from lbk_library import DataFile as PartsFile
 from lbk_library import Element
 
-file_version = "1.0.0"
+from .change_bus import PublishingElement
+from .identity_map import copy_element, get_identity_map
+from .trusted_element import TrustedElement, rows_are_trusted
+
+file_version = "1.4.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Publish the writes on the change bus",
+    "1.2.0": "The identity map evicts written rows from the change bus",
+    "1.3.0": "Keep a copy of the values read as the initial values",
+    "1.4.0": "An Element opened for editing is a copy of the one held",
 }
 
 
-class Item(Element):
+class Item(PublishingElement, TrustedElement, Element):
     """
     Implement a single Item in the data file.
 
@@ -65,6 +73,12 @@ class Item(Element):
             "remarks": "",
             "box": 0,
         }
+
+        # rows read by an ElementSet were validated when saved
+        if isinstance(item_key, dict) and rows_are_trusted():
+            if self.set_trusted_properties(item_key, self.defaults):
+                return
+
         self.set_initial_values(deepcopy(self.defaults))
         self.clear_value_valid_flags()
 
@@ -83,6 +97,39 @@ class Item(Element):
         self.set_properties(item_key)
         self.clear_value_changed_flags()
 
+    @classmethod
+    def get_element(
+        cls, parts_file: PartsFile, item_key: int | str, edit: bool = False
+    ) -> "Item":
+        """
+        Get a saved Item, reusing the instance already read if held.
+
+        The Item is taken from the parts file identity map when held
+        there without unsaved changes, otherwise it is read from the
+        parts file and added to the map. An Item to be edited is a copy,
+        never the one held.
+
+        Parameters:
+            parts_file (PartsFile): reference to the parts file holding
+                the Item.
+            item_key (int | str): the record_id of the Item.
+            edit (bool): True to get a copy of its own, to be edited,
+                False to get the Item shared by every reader, which
+                must only be read.
+
+        Returns:
+            (Item) the requested Item, with default values if not found.
+        """
+        identity_map = get_identity_map(parts_file)
+        item = identity_map.get("items", "record_id", item_key)
+        if item is None:
+            item = cls(parts_file, item_key)
+            if not edit:
+                identity_map.put(item)
+        elif edit:
+            item = copy_element(item)
+        return item
+
     def set_properties(self, properties: dict[str, Any]) -> None:
         """
         Set the values of the Item properties array.
@@ -113,7 +160,7 @@ class Item(Element):
                 elif key == "box":
                     self.set_box(properties[key])
 
-        self.set_initial_values(self.get_properties())
+        self.set_initial_values(deepcopy(self.get_properties()))
         self.clear_value_changed_flags()
 
     def get_part_number(self) -> str:
@@ -366,3 +413,30 @@ class Item(Element):
 
         self.update_property_flags("box", result["entry"], result["valid"])
         return result
+
+    def add(self) -> int:
+        """
+        Add this Item to the parts file and the identity map.
+
+        Returns:
+            (int) the result of the parts file insertion.
+        """
+        result = super().add()
+        if result:
+            get_identity_map(self.get_datafile()).put(self)
+        return result
+
+    def update(self) -> bool:
+        """
+        Update this Item in the parts file and the identity map.
+
+        The identity map drops the copies held of the row as the update
+        is published; this Item is then held in their place.
+
+        Returns:
+            (bool) True if the update succeeded, False otherwise.
+        """
+        result = super().update()
+        if result:
+            get_identity_map(self.get_datafile()).put(self)
+        return result
@@ -0,0 +1,211 @@
+"""
+A read only view of the Items joined with their display values.
+
+File:       item_view.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.2.0
+"""
+
+from typing import Any, Iterator
+
+from lbk_library import DataFile as PartsFile
+
+file_version = "1.2.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Added 'get_assembly_children' for the lazily loaded tree",
+    "1.2.0": "A None where value matches no rows",
+}
+
+
+class ItemView:
+    """
+    Provide a read only view of the Items in the parts file.
+
+    Each row of the view is a dict holding the Item columns with the
+    'condition' entry replaced by the condition name and a
+    'description' entry holding the description of the Item's part.
+    The whole view is retrieved with a single query, so no Part or
+    Condition is built for the individual rows.
+    """
+
+    COLUMNS = [
+        "record_id",
+        "part_number",
+        "assembly",
+        "quantity",
+        "condition",
+        "installed",
+        "box",
+        "remarks",
+        "description",
+    ]
+    """The keys of each row in the view."""
+
+    SELECT_SQL = (
+        "SELECT items.record_id, items.part_number, items.assembly, "
+        "items.quantity, COALESCE(conditions.condition, '') AS condition, "
+        "items.installed, items.box, COALESCE(items.remarks, '') AS remarks, "
+        "COALESCE((SELECT parts.description FROM parts "
+        "WHERE parts.part_number = items.part_number LIMIT 1), '') "
+        "AS description"
+    )
+    """The select list of a view row, without the FROM clause."""
+
+    FROM_SQL = (
+        " FROM items LEFT JOIN conditions ON conditions.record_id = items.condition"
+    )
+    """The FROM clause of a view row."""
+
+    ASSEMBLY_END = "\U0010ffff"
+    """Appended to an assembly to bound the assemblies it prefixes."""
+
+    def __init__(
+        self,
+        parts_file: PartsFile,
+        where_column: str = None,
+        where_value: Any = None,
+        order_by_column: str = "assembly",
+    ) -> None:
+        """
+        Build the view of the Items from the parts file.
+
+        Parameters:
+            parts_file (PartsFile): reference to the parts file holding
+                the items.
+            where_column (str): The column of the 'items' table holding
+                the key value to determine the rows being retrieved.
+                If None, all rows are retrieved.
+            where_value (Any): The key value to retrieve. Required if
+                where_column is set, None matches no rows.
+            order_by_column (str): column of the 'items' table to set
+                the order of the view, default is 'assembly'.
+        """
+        self._parts_file: PartsFile = parts_file
+        self._rows: list[dict[str, Any]] = []
+
+        sql = self.SELECT_SQL + self.FROM_SQL
+        values = []
+        if where_column:
+            sql += " WHERE items." + where_column + " = ?"
+            values.append(where_value)
+        if order_by_column:
+            sql += " ORDER BY items." + order_by_column + ", items.record_id"
+
+        if parts_file.sql_is_connected():
+            result = parts_file.sql_query(sql, values)
+            self._rows = parts_file.sql_fetchrowset(result)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """
+        Iterate over the rows of the view.
+
+        Returns:
+            (Iterator[dict[str, Any]]) the rows in view order.
+        """
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        """
+        Get the number of rows in the view.
+
+        Returns:
+            (int) the number of rows.
+        """
+        return len(self._rows)
+
+    def get_property_set(self) -> list[dict[str, Any]]:
+        """
+        Get the rows of the view.
+
+        Returns:
+            (list[dict[str, Any]]) the rows in view order.
+        """
+        return self._rows
+
+    def get_number_elements(self) -> int:
+        """
+        Get the number of rows in the view.
+
+        Returns:
+            (int) the number of rows.
+        """
+        return len(self._rows)
+
+    def get_datafile(self) -> PartsFile:
+        """
+        Get the parts file holding the items.
+
+        Returns:
+            (PartsFile) the parts file reference.
+        """
+        return self._parts_file
+
+    @classmethod
+    def get_assembly_children(
+        cls, parts_file: PartsFile, assembly: str = None
+    ) -> list[dict[str, Any]]:
+        """
+        Get the view rows of the assemblies directly below an assembly.
+
+        An assembly is below the nearest shorter assembly that prefixes
+        it, so 'ACRGE' is below 'ACRG', or below 'AC' if there is no
+        'ACRG'. Assemblies with no prefixing assembly are at the top.
+
+        Each child is found with an index seek on the assembly, skipping
+        the assemblies below it, so only the rows returned are read.
+        Each row has an added 'has_children' entry, True if assemblies
+        are below it.
+
+        Parameters:
+            parts_file (PartsFile): reference to the parts file holding
+                the items.
+            assembly (str): the parent assembly, None for the top level.
+
+        Returns:
+            (list[dict[str, Any]]) the child rows in assembly order.
+        """
+        rows = []
+        if not parts_file.sql_is_connected():
+            return rows
+
+        sql = (
+            cls.SELECT_SQL
+            + ", EXISTS(SELECT 1 FROM items AS below "
+            + "WHERE below.assembly > items.assembly "
+            + "AND below.assembly < items.assembly || ?) AS has_children"
+            + cls.FROM_SQL
+            + " WHERE items.assembly = "
+        )
+        if assembly is None:
+            # an empty assembly is at the top, and prefixes nothing
+            result = parts_file.sql_query(
+                sql + "'' ORDER BY items.record_id", [cls.ASSEMBLY_END]
+            )
+            for row in parts_file.sql_fetchrowset(result):
+                row["has_children"] = 0
+                rows.append(row)
+            lower = ""
+            upper_clause = ""
+            upper_values = []
+        else:
+            lower = assembly
+            upper_clause = " AND assembly < ?"
+            upper_values = [assembly + cls.ASSEMBLY_END]
+
+        sql += (
+            "(SELECT MIN(assembly) FROM items WHERE assembly > ?"
+            + upper_clause
+            + ") ORDER BY items.record_id"
+        )
+        while True:
+            result = parts_file.sql_query(sql, [cls.ASSEMBLY_END, lower] + upper_values)
+            child_rows = parts_file.sql_fetchrowset(result)
+            if not child_rows:
+                break
+            rows.extend(child_rows)
+            # skip past every assembly below this child
+            lower = child_rows[0]["assembly"] + cls.ASSEMBLY_END
+        return rows
@@ -0,0 +1,183 @@
+"""
+Cache the small lookup tables of an open parts file.
+
+File:       lookup_cache.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.1.0
+"""
+
+from weakref import WeakKeyDictionary
+
+from lbk_library import DataFile as PartsFile
+
+from .change_bus import ChangeEvent, get_change_bus
+
+file_version = "1.1.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Invalidate the tables from the change bus",
+}
+
+
+class LookupCache:
+    """
+    Hold the record_id to name lookups for a parts file.
+
+    The 'sources' and 'conditions' tables hold a few dozen rows that are
+    resolved by record_id for nearly every Part, Item and Order shown.
+    Each table is read once into memory and the names are served from
+    there until the table is invalidated by a write published on the
+    change bus of the parts file.
+    """
+
+    TABLES = {
+        "conditions": "condition",
+        "sources": "source",
+    }
+    """The cached tables and the name column of each."""
+
+    def __init__(self, parts_file: PartsFile) -> None:
+        """
+        Initialize an empty cache for the parts file.
+
+        Parameters:
+            parts_file (PartsFile): reference to the parts file holding
+                the lookup tables.
+        """
+        self._parts_file: PartsFile = parts_file
+        self._lookups: dict[str, dict[int, str]] = {}
+
+    def load(self) -> None:
+        """Read all the lookup tables from the parts file."""
+        self._lookups = {}
+        if self._parts_file.sql_is_connected():
+            for table in self.TABLES:
+                self._load_table(table)
+
+    def invalidate(self, table: str = None) -> None:
+        """
+        Discard the cached names of a table.
+
+        The table is read again the next time one of its names is
+        requested.
+
+        Parameters:
+            table (str): the table to discard, if None all the tables
+                are discarded.
+        """
+        if table is None:
+            self._lookups = {}
+        else:
+            self._lookups.pop(table, None)
+
+    def table_changed(self, event: ChangeEvent) -> None:
+        """
+        Discard the names of a table written.
+
+        Parameters:
+            event (ChangeEvent): the write published on the change bus.
+        """
+        self.invalidate(event.table)
+
+    def get_lookup(self, table: str) -> dict[int, str]:
+        """
+        Get the record_id to name lookup of a table.
+
+        Parameters:
+            table (str): one of the cached tables.
+
+        Returns:
+            (dict[int, str]) the names keyed by record_id.
+        """
+        if table not in self._lookups:
+            self._load_table(table)
+        return self._lookups[table]
+
+    def get_name(self, table: str, record_id: int | str) -> str:
+        """
+        Get the name of a single record.
+
+        Parameters:
+            table (str): one of the cached tables.
+            record_id (int | str): the record_id of the requested row.
+
+        Returns:
+            (str) the name of the row or an empty string if the row
+                does not exist.
+        """
+        try:
+            record_id = int(record_id)
+        except (TypeError, ValueError):
+            return ""
+        return self.get_lookup(table).get(record_id, "")
+
+    def get_condition(self, record_id: int | str) -> str:
+        """
+        Get the name of a Condition.
+
+        Parameters:
+            record_id (int | str): the record_id of the Condition.
+
+        Returns:
+            (str) the condition or an empty string if not found.
+        """
+        return self.get_name("conditions", record_id)
+
+    def get_source(self, record_id: int | str) -> str:
+        """
+        Get the name of a Source.
+
+        Parameters:
+            record_id (int | str): the record_id of the Source.
+
+        Returns:
+            (str) the source or an empty string if not found.
+        """
+        return self.get_name("sources", record_id)
+
+    def _load_table(self, table: str) -> None:
+        """
+        Read a single lookup table from the parts file.
+
+        Parameters:
+            table (str): one of the cached tables.
+        """
+        lookup = {}
+        if self._parts_file.sql_is_connected():
+            column = self.TABLES[table]
+            result = self._parts_file.sql_query(
+                "SELECT record_id, " + column + " FROM " + table
+            )
+            for row in self._parts_file.sql_fetchrowset(result):
+                lookup[int(row["record_id"])] = row[column] or ""
+        self._lookups[table] = lookup
+
+
+_lookup_caches: WeakKeyDictionary = WeakKeyDictionary()
+"""The lookup cache of each parts file in use."""
+
+
+def get_lookup_cache(parts_file: PartsFile) -> LookupCache:
+    """
+    Get the lookup cache attached to a parts file.
+
+    The cache is created empty the first time it is requested, when it
+    is subscribed to the change bus of the parts file ahead of the other
+    subscribers, and is dropped with the parts file.
+
+    Parameters:
+        parts_file (PartsFile): reference to the parts file.
+
+    Returns:
+        (LookupCache) the cache of the parts file.
+    """
+    cache = _lookup_caches.get(parts_file)
+    if cache is None:
+        cache = LookupCache(parts_file)
+        _lookup_caches[parts_file] = cache
+        get_change_bus(parts_file).subscribe(
+            cache.table_changed, LookupCache.TABLES, first=True
+        )
+    return cache
@@ -0,0 +1,187 @@
+"""
+Cache the combo box option lists of an open parts file.
+
+File:       option_lists.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.0.0
+"""
+
+from weakref import WeakKeyDictionary
+
+from lbk_library import DataFile as PartsFile
+
+from .change_bus import UPDATED, ChangeEvent, get_change_bus
+from .condition_set import ConditionSet
+from .item_set import ItemSet
+from .order_set import OrderSet
+from .part_set import PartSet
+from .source_set import SourceSet
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Initial release",
+}
+
+
+class OptionListCache:
+    """
+    Hold the option lists built for the dialog combo boxes.
+
+    A list is built with 'ElementSet.build_option_list' the first time
+    it is requested and kept, keyed by table, column and ordering,
+    until its table is written. The cache listens on the change bus
+    only for the tables it holds lists of.
+    """
+
+    SETS = {
+        "conditions": ConditionSet,
+        "items": ItemSet,
+        "orders": OrderSet,
+        "parts": PartSet,
+        "sources": SourceSet,
+    }
+    """The ElementSet building the lists of each table."""
+
+    COLUMN_SETS = (ItemSet, OrderSet, PartSet)
+    """The ElementSets able to read only the listed column."""
+
+    def __init__(self, parts_file: PartsFile) -> None:
+        """
+        Initialize an empty cache for the parts file.
+
+        Parameters:
+            parts_file (PartsFile): reference to the parts file holding
+                the tables.
+        """
+        self._parts_file: PartsFile = parts_file
+        self._option_lists: dict[tuple[str, str, str | None], list[str]] = {}
+        self._tables: set[str] = set()
+
+    def get_option_list(
+        self, table: str, column: str, order_by_column: str = None
+    ) -> list[str]:
+        """
+        Get the values of a column, as for a combo box.
+
+        The list returned is shared by every caller and must not be
+        changed.
+
+        Parameters:
+            table (str): one of the tables in SETS.
+            column (str): the column listed.
+            order_by_column (str): the ordering of the list, the
+                default ordering of the ElementSet if None.
+
+        Returns:
+            (list[str]) the column values of every row of the table.
+        """
+        key = (table, column, order_by_column)
+        option_list = self._option_lists.get(key)
+        if option_list is None:
+            option_list = self._build_option_list(table, column, order_by_column)
+            if self._parts_file.sql_is_connected():
+                self._option_lists[key] = option_list
+                self._listen(table)
+        return option_list
+
+    def invalidate(self, table: str = None) -> None:
+        """
+        Discard the option lists of a table.
+
+        Parameters:
+            table (str): the table to discard, if None the lists of all
+                the tables are discarded.
+        """
+        if table is None:
+            self._option_lists = {}
+        else:
+            self._option_lists = {
+                key: option_list
+                for key, option_list in self._option_lists.items()
+                if key[0] != table
+            }
+
+    def table_changed(self, event: ChangeEvent) -> None:
+        """
+        Discard the option lists changed by a write.
+
+        An update leaves the lists of the columns it did not change,
+        such as the record_ids of the Items, in place.
+
+        Parameters:
+            event (ChangeEvent): the write published on the change bus.
+        """
+        if event.action != UPDATED:
+            self.invalidate(event.table)
+            return
+        self._option_lists = {
+            key: option_list
+            for key, option_list in self._option_lists.items()
+            if key[0] != event.table
+            or (key[1] not in event.columns and key[2] not in event.columns)
+        }
+
+    def _build_option_list(
+        self, table: str, column: str, order_by_column: str = None
+    ) -> list[str]:
+        """
+        Read an option list from the parts file.
+
+        Parameters:
+            table (str): one of the tables in SETS.
+            column (str): the column listed.
+            order_by_column (str): the ordering of the list.
+
+        Returns:
+            (list[str]) the column values.
+        """
+        set_class = OptionListCache.SETS[table]
+        if set_class in OptionListCache.COLUMN_SETS and order_by_column in (
+            None,
+            column,
+        ):
+            element_set = set_class(
+                self._parts_file, None, None, order_by_column, columns=[column]
+            )
+        else:
+            element_set = set_class(self._parts_file, None, None, order_by_column)
+        return element_set.build_option_list(column)
+
+    def _listen(self, table: str) -> None:
+        """
+        Follow the writes to a table on the change bus.
+
+        Parameters:
+            table (str): the table holding a cached list.
+        """
+        if table not in self._tables:
+            self._tables.add(table)
+            get_change_bus(self._parts_file).subscribe(
+                self.table_changed, self._tables, first=True
+            )
+
+
+_option_list_caches: WeakKeyDictionary = WeakKeyDictionary()
+"""The option list cache of each parts file in use."""
+
+
+def get_option_lists(parts_file: PartsFile) -> OptionListCache:
+    """
+    Get the option list cache attached to a parts file.
+
+    The cache is created empty the first time it is requested and is
+    dropped with the parts file.
+
+    Parameters:
+        parts_file (PartsFile): reference to the parts file.
+
+    Returns:
+        (OptionListCache) the cache of the parts file.
+    """
+    cache = _option_list_caches.get(parts_file)
+    if cache is None:
+        cache = OptionListCache(parts_file)
+        _option_list_caches[parts_file] = cache
+    return cache
@@ -5,7 +5,7 @@ File:       order.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2022, 2023 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.0
+Version:    1.4.0
 """
 
 import re
@@ -15,13 +15,21 @@ from typing import Any
 from lbk_library import DataFile as PartsFile
 from lbk_library import Element
 
-file_version = "1.0.0"
+from .change_bus import PublishingElement
+from .identity_map import copy_element, get_identity_map
+from .trusted_element import TrustedElement, rows_are_trusted
+
+file_version = "1.4.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Publish the writes on the change bus",
+    "1.2.0": "The identity map evicts written rows from the change bus",
+    "1.3.0": "Keep a copy of the values read as the initial values",
+    "1.4.0": "An Element opened for editing is a copy of the one held",
 }
 
 
-class Order(Element):
+class Order(PublishingElement, TrustedElement, Element):
     """Implement a single Order in the parts file."""
 
     def __init__(
@@ -81,6 +89,11 @@ class Order(Element):
             "remarks": "",
         }
 
+        # rows read by an ElementSet were validated when saved
+        if isinstance(order_key, dict) and rows_are_trusted():
+            if self.set_trusted_properties(order_key, self._defaults):
+                return
+
         self.set_initial_values(deepcopy(self._defaults))
         self.clear_value_valid_flags()
 
@@ -104,9 +117,51 @@ class Order(Element):
             order_key = deepcopy(self._defaults)
 
         self.set_properties(order_key)
-        self.set_initial_values(self.get_properties())
+        self.set_initial_values(deepcopy(self.get_properties()))
         self.clear_value_changed_flags()
 
+    @classmethod
+    def get_element(
+        cls,
+        parts_file: PartsFile,
+        order_key: int | str,
+        column: str = None,
+        edit: bool = False,
+    ) -> "Order":
+        """
+        Get a saved Order, reusing the instance already read if held.
+
+        The Order is taken from the parts file identity map when held
+        there without unsaved changes, otherwise it is read from the
+        parts file and added to the map. An Order to be edited is a copy,
+        never the one held.
+
+        Parameters:
+            parts_file (PartsFile): reference to the parts file holding
+                the Order.
+            order_key (int | str): the record_id or order_number of
+                the Order, as given by 'column'.
+            column (str): Either 'record_id' or 'order_number',
+                default is 'order_number'.
+            edit (bool): True to get a copy of its own, to be edited,
+                False to get the Order shared by every reader, which
+                must only be read.
+
+        Returns:
+            (Order) the requested Order, with default values if not found.
+        """
+        if column is None:
+            column = "order_number"
+        identity_map = get_identity_map(parts_file)
+        order = identity_map.get("orders", column, order_key)
+        if order is None:
+            order = cls(parts_file, order_key, column)
+            if not edit:
+                identity_map.put(order)
+        elif edit:
+            order = copy_element(order)
+        return order
+
     def set_properties(self, properties: dict) -> None:
         """
         Set the values of the Order properties array.
@@ -500,3 +555,30 @@ class Order(Element):
             self._set_property("total", self._defaults["total"])
         self.update_property_flags("total", result["entry"], result["valid"])
         return result
+
+    def add(self) -> int:
+        """
+        Add this Order to the parts file and the identity map.
+
+        Returns:
+            (int) the result of the parts file insertion.
+        """
+        result = super().add()
+        if result:
+            get_identity_map(self.get_datafile()).put(self)
+        return result
+
+    def update(self) -> bool:
+        """
+        Update this Order in the parts file and the identity map.
+
+        The identity map drops the copies held of the row as the update
+        is published; this Order is then held in their place.
+
+        Returns:
+            (bool) True if the update succeeded, False otherwise.
+        """
+        result = super().update()
+        if result:
+            get_identity_map(self.get_datafile()).put(self)
+        return result
@@ -5,7 +5,7 @@ File:       order_line.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2022 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.0
+Version:    1.2.0
 """
 
 from copy import deepcopy
@@ -14,13 +14,18 @@ from typing import Any
 from lbk_library import DataFile as PartsFile
 from lbk_library import Element
 
-file_version = "1.0.0"
+from .change_bus import PublishingElement
+from .trusted_element import TrustedElement, rows_are_trusted
+
+file_version = "1.2.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Publish the writes on the change bus",
+    "1.2.0": "Keep a copy of the values read as the initial values",
 }
 
 
-class OrderLine(Element):
+class OrderLine(PublishingElement, TrustedElement, Element):
     """Implements single OrderLine in the parts file."""
 
     def __init__(self, parts_file: PartsFile, order_line_key: Any = None) -> None:
@@ -60,6 +65,11 @@ class OrderLine(Element):
             "remarks": "",
         }
 
+        # rows read by an ElementSet were validated when saved
+        if isinstance(order_line_key, dict) and rows_are_trusted():
+            if self.set_trusted_properties(order_line_key, self._defaults):
+                return
+
         self.set_initial_values(deepcopy(self._defaults))
         self.clear_value_valid_flags()
 
@@ -78,7 +88,7 @@ class OrderLine(Element):
             order_line_key = deepcopy(self._defaults)
 
         self.set_properties(order_line_key)
-        self.set_initial_values(self.get_properties())
+        self.set_initial_values(deepcopy(self.get_properties()))
         self.clear_value_changed_flags()
 
     def set_properties(self, properties: dict[str, Any]) -> None:
@@ -5,19 +5,37 @@ File:       order_line_set.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.0
+Version:    1.7.0
 """
 
-from typing import Any
+from typing import Any, Iterator
 
 from lbk_library import DataFile as PartsFile
 from lbk_library import ElementSet
 
 from .order_line import OrderLine
+from .record import OrderLineRecord
+from .set_query import (
+    DEFAULT_BATCH_SIZE,
+    NO_ROWS,
+    build_select,
+    count_rows,
+    row_exists,
+    select_elements,
+    stream_elements,
+)
+from .trusted_element import trusted_rows
 
-file_version = "1.0.0"
+file_version = "1.7.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Added the read only 'get_records' mode",
+    "1.2.0": "Added the streaming 'stream' mode",
+    "1.3.0": "Added the 'columns' projection",
+    "1.4.0": "Added 'count' and 'exists'",
+    "1.5.0": "Build the empty base of a projected set without a query",
+    "1.6.0": "Build the empty base of a projected set on 'NO_ROWS' again",
+    "1.7.0": "A None where value matches no rows",
 }
 
 
@@ -32,6 +50,7 @@ class OrderLineSet(ElementSet):
         order_by_column: str = None,
         limit: int = None,
         offset: int = None,
+        columns: list[str] = None,
     ) -> None:
         """
         Build a set of OrderLines from the parts file table 'order_lines'.
@@ -41,24 +60,152 @@ class OrderLineSet(ElementSet):
             where_column (str): The key column of the table containing
                 the key value to determine the elements being retrieved,
                 defaults to all rows are retrieved.
-            where_value (Mixed): The key value to retrieve, equired if
-                where_column is set.
+            where_value (Mixed): The key value to retrieve. Required if
+                where_column is set, None matches no rows.
             order_by_column (str): one or more column names separated
                 by commas to order the resulting set of elements.
             limit (int)aa; number of rows to retrieve, defaults to all.
             offset (int): row number to start retrieval, 0 based,
                 defaults to row 0.
+            columns (list[str]): the columns to read, all if None. The
+                other columns hold their defaults, so the Elements are
+                for display and option lists only and must not be saved.
         """
         table_name = "order_lines"
         element_type = OrderLine
 
-        super().__init__(
-            parts_file,
-            table_name,
-            element_type,
-            where_column,
-            where_value,
-            order_by_column,
-            limit,
-            offset,
+        if where_column and where_value is None:
+            # a key column without a key value matches no rows
+            where_column, where_value = NO_ROWS
+        with trusted_rows():
+            if columns:
+                # an empty set, filled with only the requested columns
+                super().__init__(parts_file, table_name, element_type, *NO_ROWS)
+                self.set_property_set(
+                    select_elements(
+                        parts_file,
+                        element_type,
+                        table_name,
+                        columns,
+                        where_column,
+                        where_value,
+                        order_by_column,
+                        limit,
+                        offset,
+                    )
+                )
+            else:
+                super().__init__(
+                    parts_file,
+                    table_name,
+                    element_type,
+                    where_column,
+                    where_value,
+                    order_by_column,
+                    limit,
+                    offset,
+                )
+
+    @staticmethod
+    def get_records(
+        parts_file: PartsFile,
+        where_column: str = None,
+        where_value: Any = None,
+        order_by_column: str = None,
+        limit: int = None,
+        offset: int = None,
+    ) -> list[OrderLineRecord]:
+        """
+        Get the rows of the table 'order_lines' as read only records.
+
+        A OrderLineRecord holds far less memory than a OrderLine; use
+        'get_element' on a record to edit its row. The parameters
+        are the same as for building the set.
+
+        Parameters:
+            parts_file (PartsFile): the dababase instance to use.
+            where_column (str): The key column of the table containing
+                the key value to determine the rows being retrieved.
+                If None, all rows are retrieved.
+            where_value (Any): The key value to retrieve. Required if
+                where_column is set, None matches no rows.
+            order_by_column (str): column of the table to set the
+                order of the records.
+            limit (int): number of rows to retrieve, defaults to all.
+            offset (int): row number to start retrieval, 0 based,
+                defaults to row 0.
+
+        Returns:
+            (list[OrderLineRecord]) the records read.
+        """
+        return OrderLineRecord.select(
+            parts_file, where_column, where_value, order_by_column, limit, offset
+        )
+
+    @staticmethod
+    def stream(
+        parts_file: PartsFile,
+        where_column: str = None,
+        where_value: Any = None,
+        order_by_column: str = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[OrderLine]:
+        """
+        Yield the OrderLines of the table 'order_lines' as the rows are read.
+
+        Rows are fetched 'batch_size' at a time and no OrderLine is kept,
+        so a scan of the whole table runs in constant memory.
+
+        Parameters:
+            parts_file (PartsFile): the dababase instance to use.
+            where_column (str): The key column of the table containing
+                the key value to determine the rows being retrieved.
+                If None, all rows are retrieved.
+            where_value (Any): The key value to retrieve. Required if
+                where_column is set, None matches no rows.
+            order_by_column (str): column of the table to set the
+                order of the OrderLines.
+            batch_size (int): the number of rows fetched at a time.
+
+        Yields:
+            (OrderLine) each OrderLine read.
+        """
+        sql, values = build_select(
+            "order_lines", None, where_column, where_value, order_by_column
         )
+        return stream_elements(parts_file, OrderLine, sql, values, batch_size)
+
+    @staticmethod
+    def count(
+        parts_file: PartsFile, where_column: str = None, where_value: Any = None
+    ) -> int:
+        """
+        Count the rows of the table 'order_lines' without building the set.
+
+        Parameters:
+            parts_file (PartsFile): the dababase instance to use.
+            where_column (str): The key column of the table containing
+                the key value to determine the rows being counted. If
+                None, all rows are counted.
+            where_value (Any): The key value to count. Required if
+                where_column is set, None matches no rows.
+
+        Returns:
+            (int) the number of rows.
+        """
+        return count_rows(parts_file, "order_lines", where_column, where_value)
+
+    @staticmethod
+    def exists(parts_file: PartsFile, column: str, value: Any) -> bool:
+        """
+        Check if a row of the table 'order_lines' holds a column value.
+
+        Parameters:
+            parts_file (PartsFile): the dababase instance to use.
+            column (str): the column to search.
+            value (Any): the value to find.
+
+        Returns:
+            (bool) True if a row holds the value, False if not.
+        """
+        return row_exists(parts_file, "order_lines", column, value)
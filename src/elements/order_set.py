@@ -3,25 +3,66 @@ This is a set of Orders in the parts file.
 
 File:       order_set.py
 Author:     Lorn B Kerr
-Copyright:  (c) 2023 Lorn B Kerr
+Copyright:  (c) 2023, 2024 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.0
+Version:    1.11.0
 """
 
+from typing import Any, Iterator
+
 from lbk_library import DataFile as PartsFile
 from lbk_library import ElementSet
 
 from .order import Order
+from .record import OrderRecord
+from .set_query import (
+    DEFAULT_BATCH_SIZE,
+    NO_ROWS,
+    build_select,
+    count_rows,
+    row_exists,
+    select_elements,
+    stream_elements,
+)
+from .trusted_element import trusted_rows
 
-file_version = "1.0.0"
+file_version = "1.11.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Added the per order aggregate 'get_order_summaries'",
+    "1.2.0": "Added the read only 'get_records' mode",
+    "1.3.0": "Added the streaming 'stream' mode",
+    "1.4.0": "Added the 'columns' projection",
+    "1.5.0": "Added 'count' and 'exists'",
+    "1.6.0": "Page, filter and sort 'get_order_summaries'",
+    "1.7.0": "Build the empty base of a projected set without a query",
+    "1.8.0": "Documented the page cost of each 'get_order_summaries' order",
+    "1.9.0": "Build the empty base of a projected set on 'NO_ROWS' again",
+    "1.10.0": "A None where value matches no rows",
+    "1.11.0": "Order a missing summary text as the empty string listed",
 }
 
 
 class OrderSet(ElementSet):
     """Set of Orders in the parts file."""
 
+    SUMMARY_ORDER = {
+        "record_id": "orders.record_id",
+        "order_number": "orders.order_number",
+        "date": "COALESCE(orders.date, '')",
+        "source": "COALESCE(sources.source, '')",
+        "remarks": "COALESCE(orders.remarks, '')",
+        "total": "total",
+        "number_lines": "number_lines",
+        "lines_cost": "lines_cost",
+    }
+    """
+    The sql ordering expression of each 'get_order_summaries' key.
+
+    A missing date, source or remarks is ordered as the empty string it
+    is listed as.
+    """
+
     def __init__(
         self,
         parts_file: PartsFile,
@@ -30,6 +71,7 @@ class OrderSet(ElementSet):
         order_by_column: str = None,
         limit: int = None,
         offset: int = None,
+        columns: list[str] = None,
     ):
         """
         Build a set of Orders from the parts file table 'orders'.
@@ -40,23 +82,235 @@ class OrderSet(ElementSet):
                 the key value to determine the elements being retrieved,
                 default is all rows are retrieved.
         where_value (stry): The key value to retrieve. Required if
-            where_column is set.
+            where_column is set, None matches no rows.
         order_by_column (str): one or more column names separated by
             commas to order the resulting set of elements.
         limit (int): number of rows to retrieve, defaults to all.
         offset (intr): row number to start retrieval, 0 based, defaults
             to row 0.
+        columns (list[str]): the columns to read, all if None. The
+            other columns hold their defaults, so the Elements are
+            for display and option lists only and must not be saved.
         """
         table_name = "orders"  # The parts file table for this element
         element_type = Order
 
-        super().__init__(
-            parts_file,
-            table_name,
-            element_type,
-            where_column,
-            where_value,
-            order_by_column,
-            limit,
-            offset,
+        if where_column and where_value is None:
+            # a key column without a key value matches no rows
+            where_column, where_value = NO_ROWS
+        with trusted_rows():
+            if columns:
+                # an empty set, filled with only the requested columns
+                super().__init__(parts_file, table_name, element_type, *NO_ROWS)
+                self.set_property_set(
+                    select_elements(
+                        parts_file,
+                        element_type,
+                        table_name,
+                        columns,
+                        where_column,
+                        where_value,
+                        order_by_column,
+                        limit,
+                        offset,
+                    )
+                )
+            else:
+                super().__init__(
+                    parts_file,
+                    table_name,
+                    element_type,
+                    where_column,
+                    where_value,
+                    order_by_column,
+                    limit,
+                    offset,
+                )
+
+    @staticmethod
+    def get_order_summaries(
+        parts_file: PartsFile,
+        order_by_column: str = "order_number",
+        descending: bool = False,
+        limit: int = None,
+        offset: int = None,
+        where_column: str = None,
+        where_value: Any = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Get the Orders with their source names and order line totals.
+
+        The 'orders' table is joined with the 'sources' table, and the
+        order line count and cost of each order are read through the
+        'order_lines' order number index, in one query, so no Source or
+        OrderLineSet is built for each order.
+
+        Ordered by 'record_id' or 'order_number', the orders are walked
+        in index order and only the order lines of the orders returned
+        are read, though the OFFSET rows are still stepped over. Ordered
+        by any other key, 'date' included as a missing date is ordered
+        as an empty one, every order and its order lines are read and
+        sorted for each page, so the cost of a page grows with the
+        number of orders.
+
+        Parameters:
+            parts_file (PartsFile): reference to the parts file holding
+                the orders.
+            order_by_column (str): key of the summaries to set their
+                order, default is 'order_number'.
+            descending (bool): True to sort in descending order.
+            limit (int): number of summaries to retrieve, defaults to
+                all.
+            offset (int): summary number to start retrieval, 0 based,
+                defaults to 0.
+            where_column (str): column of the 'orders' table holding
+                the key value to determine the orders retrieved. If
+                None, all orders are retrieved.
+            where_value (Any): The key value to retrieve. Required if
+                where_column is set, None matches no rows.
+
+        Returns:
+            (list[dict[str, Any]]) one entry per order with the keys
+                'record_id', 'order_number', 'date', 'source' (the
+                source name), 'remarks', 'total', 'number_lines' (the
+                count of order lines) and 'lines_cost' (the summed
+                quantity * cost_each of the order lines).
+        """
+        sql = (
+            "SELECT orders.record_id, orders.order_number, "
+            "COALESCE(orders.date, '') AS date, "
+            "COALESCE(sources.source, '') AS source, "
+            "COALESCE(orders.remarks, '') AS remarks, "
+            "COALESCE(orders.total, 0.0) AS total, "
+            "(SELECT COUNT(*) FROM order_lines "
+            "WHERE order_lines.order_number = orders.order_number) "
+            "AS number_lines, "
+            "(SELECT COALESCE(SUM(CASE WHEN cost_each > 0 AND quantity > 0 "
+            "THEN cost_each * quantity ELSE 0 END), 0.0) FROM order_lines "
+            "WHERE order_lines.order_number = orders.order_number) "
+            "AS lines_cost "
+            "FROM orders "
+            "LEFT JOIN sources ON sources.record_id = orders.source"
+        )
+        values = []
+        if where_column:
+            sql += " WHERE orders." + where_column + " = ?"
+            values.append(where_value)
+        sql += (
+            " ORDER BY "
+            + OrderSet.SUMMARY_ORDER.get(order_by_column, "orders." + order_by_column)
+            + (" DESC" if descending else "")
+            + ", orders.record_id"
         )
+        if limit is not None:
+            sql += " LIMIT ?"
+            values.append(int(limit))
+            if offset is not None:
+                sql += " OFFSET ?"
+                values.append(int(offset))
+        result = parts_file.sql_query(sql, values)
+        return parts_file.sql_fetchrowset(result)
+
+    @staticmethod
+    def get_records(
+        parts_file: PartsFile,
+        where_column: str = None,
+        where_value: Any = None,
+        order_by_column: str = None,
+        limit: int = None,
+        offset: int = None,
+    ) -> list[OrderRecord]:
+        """
+        Get the rows of the table 'orders' as read only records.
+
+        A OrderRecord holds far less memory than a Order; use
+        'get_element' on a record to edit its row. The parameters
+        are the same as for building the set.
+
+        Parameters:
+            parts_file (PartsFile): the dababase instance to use.
+            where_column (str): The key column of the table containing
+                the key value to determine the rows being retrieved.
+                If None, all rows are retrieved.
+            where_value (Any): The key value to retrieve. Required if
+                where_column is set, None matches no rows.
+            order_by_column (str): column of the table to set the
+                order of the records.
+            limit (int): number of rows to retrieve, defaults to all.
+            offset (int): row number to start retrieval, 0 based,
+                defaults to row 0.
+
+        Returns:
+            (list[OrderRecord]) the records read.
+        """
+        return OrderRecord.select(
+            parts_file, where_column, where_value, order_by_column, limit, offset
+        )
+
+    @staticmethod
+    def stream(
+        parts_file: PartsFile,
+        where_column: str = None,
+        where_value: Any = None,
+        order_by_column: str = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[Order]:
+        """
+        Yield the Orders of the table 'orders' as the rows are read.
+
+        Rows are fetched 'batch_size' at a time and no Order is kept,
+        so a scan of the whole table runs in constant memory.
+
+        Parameters:
+            parts_file (PartsFile): the dababase instance to use.
+            where_column (str): The key column of the table containing
+                the key value to determine the rows being retrieved.
+                If None, all rows are retrieved.
+            where_value (Any): The key value to retrieve. Required if
+                where_column is set, None matches no rows.
+            order_by_column (str): column of the table to set the
+                order of the Orders.
+            batch_size (int): the number of rows fetched at a time.
+
+        Yields:
+            (Order) each Order read.
+        """
+        sql, values = build_select(
+            "orders", None, where_column, where_value, order_by_column
+        )
+        return stream_elements(parts_file, Order, sql, values, batch_size)
+
+    @staticmethod
+    def count(
+        parts_file: PartsFile, where_column: str = None, where_value: Any = None
+    ) -> int:
+        """
+        Count the rows of the table 'orders' without building the set.
+
+        Parameters:
+            parts_file (PartsFile): the dababase instance to use.
+            where_column (str): The key column of the table containing
+                the key value to determine the rows being counted. If
+                None, all rows are counted.
+            where_value (Any): The key value to count. Required if
+                where_column is set, None matches no rows.
+
+        Returns:
+            (int) the number of rows.
+        """
+        return count_rows(parts_file, "orders", where_column, where_value)
+
+    @staticmethod
+    def exists(parts_file: PartsFile, column: str, value: Any) -> bool:
+        """
+        Check if a row of the table 'orders' holds a column value.
+
+        Parameters:
+            parts_file (PartsFile): the dababase instance to use.
+            column (str): the column to search.
+            value (Any): the value to find.
+
+        Returns:
+            (bool) True if a row holds the value, False if not.
+        """
+        return row_exists(parts_file, "orders", column, value)
@@ -5,7 +5,7 @@ File:       part.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2022, 2023 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.0
+Version:    1.5.0
 """
 
 from copy import deepcopy
@@ -14,15 +14,22 @@ from typing import Any
 from lbk_library import DataFile as PartsFile
 from lbk_library import Element
 
-from .item_set import ItemSet
+from .change_bus import PublishingElement
+from .identity_map import copy_element, get_identity_map
+from .trusted_element import TrustedElement, rows_are_trusted
 
-file_version = "1.0.0"
+file_version = "1.5.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Summed the total quantity in the parts file query",
+    "1.2.0": "Publish the writes on the change bus",
+    "1.3.0": "The identity map evicts written rows from the change bus",
+    "1.4.0": "Keep a copy of the values read as the initial values",
+    "1.5.0": "An Element opened for editing is a copy of the one held",
 }
 
 
-class Part(Element):
+class Part(PublishingElement, TrustedElement, Element):
     """Implement a single Part in the parts_file."""
 
     def __init__(
@@ -73,6 +80,11 @@ class Part(Element):
             "remarks": "",
         }
 
+        # rows read by an ElementSet were validated when saved
+        if isinstance(part_key, dict) and rows_are_trusted():
+            if self.set_trusted_properties(part_key, self._defaults):
+                return
+
         self.set_initial_values(deepcopy(self._defaults))
         self.clear_value_valid_flags()
 
@@ -96,9 +108,51 @@ class Part(Element):
             part_key = deepcopy(self._defaults)
 
         self.set_properties(part_key)
-        self.set_initial_values(self.get_properties())
+        self.set_initial_values(deepcopy(self.get_properties()))
         self.clear_value_changed_flags()
 
+    @classmethod
+    def get_element(
+        cls,
+        parts_file: PartsFile,
+        part_key: int | str,
+        column: str = None,
+        edit: bool = False,
+    ) -> "Part":
+        """
+        Get a saved Part, reusing the instance already read if held.
+
+        The Part is taken from the parts file identity map when held
+        there without unsaved changes, otherwise it is read from the
+        parts file and added to the map. A Part to be edited is a copy,
+        never the one held.
+
+        Parameters:
+            parts_file (PartsFile): reference to the parts file holding
+                the Part.
+            part_key (int | str): the record_id or part_number of
+                the Part, as given by 'column'.
+            column (str): Either 'record_id' or 'part_number',
+                default is 'record_id'.
+            edit (bool): True to get a copy of its own, to be edited,
+                False to get the Part shared by every reader, which
+                must only be read.
+
+        Returns:
+            (Part) the requested Part, with default values if not found.
+        """
+        if column is None:
+            column = "record_id"
+        identity_map = get_identity_map(parts_file)
+        part = identity_map.get("parts", column, part_key)
+        if part is None:
+            part = cls(parts_file, part_key, column)
+            if not edit:
+                identity_map.put(part)
+        elif edit:
+            part = copy_element(part)
+        return part
+
     def set_properties(self, properties: dict[str, Any]) -> None:
         """
         Set the values of the Part properties array.
@@ -123,7 +177,7 @@ class Part(Element):
                 elif key == "description":
                     self.set_description(properties[key])
 
-        self.set_initial_values(self.get_properties())
+        self.set_initial_values(deepcopy(self.get_properties()))
         self.clear_value_changed_flags()
 
     def get_part_number(self) -> str:
@@ -254,18 +308,44 @@ class Part(Element):
         """
         Get the total quantity for this part number from the 'items' table.
 
-        The items table is searched for the items using this part number
-        then the quantities for each of these items is summed and returned.
+        The quantities of the items using this part number are summed
+        by the parts file in a single query.
 
         Return (integer) the total quantity of this part number used.
         """
-        item_set = ItemSet(
-            self.get_datafile(),
-            "part_number",
-            self.get_part_number(),
-            "record_id",
+        result = self.get_datafile().sql_query(
+            "SELECT SUM(quantity) AS quantity FROM items WHERE part_number = ?",
+            [self.get_part_number()],
         )
+        row = self.get_datafile().sql_fetchrow(result)
         quantity = 0
-        for item in item_set:
-            quantity += item.get_quantity()
+        if row and row["quantity"]:
+            quantity = int(row["quantity"])
         return quantity
+
+    def add(self) -> int:
+        """
+        Add this Part to the parts file and the identity map.
+
+        Returns:
+            (int) the result of the parts file insertion.
+        """
+        result = super().add()
+        if result:
+            get_identity_map(self.get_datafile()).put(self)
+        return result
+
+    def update(self) -> bool:
+        """
+        Update this Part in the parts file and the identity map.
+
+        The identity map drops the copies held of the row as the update
+        is published; this Part is then held in their place.
+
+        Returns:
+            (bool) True if the update succeeded, False otherwise.
+        """
+        result = super().update()
+        if result:
+            get_identity_map(self.get_datafile()).put(self)
+        return result
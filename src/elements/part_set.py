@@ -3,27 +3,65 @@ This is a set of Partss in the parts file.
 
 File:       part_setl.py
 Author:     Lorn B Kerr
-Copyright:  (c) 2023 Lorn B Kerr
+Copyright:  (c) 2023, 2024 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.0
+Version:    1.12.0
 """
 
-from typing import Any
+from typing import Any, Iterator
 
 from lbk_library import DataFile as PartsFile
 from lbk_library import ElementSet
 
 from .part import Part
+from .record import PartRecord
+from .set_query import (
+    DEFAULT_BATCH_SIZE,
+    NO_ROWS,
+    build_select,
+    count_rows,
+    row_exists,
+    select_elements,
+    stream_elements,
+)
+from .trusted_element import trusted_rows
 
-file_version = "1.0.0"
+file_version = "1.12.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Added the aggregate 'get_total_quantities' and 'get_parts_listing'",
+    "1.2.0": "Added the read only 'get_records' mode",
+    "1.3.0": "Added the streaming 'stream' mode",
+    "1.4.0": "Added the 'columns' projection",
+    "1.5.0": "Added 'count' and 'exists'",
+    "1.6.0": "Sort 'get_parts_listing' on any listing column",
+    "1.7.0": "Select the 'get_parts_listing' rows by a parts column",
+    "1.8.0": "Build the empty base of a projected set without a query",
+    "1.9.0": "Order a missing listing text as the empty string listed",
+    "1.10.0": "Build the empty base of a projected set on 'NO_ROWS' again",
+    "1.11.0": "A None where value matches no rows",
+    "1.12.0": "Sum only the selected parts quantities in 'get_parts_listing'",
 }
 
 
 class PartSet(ElementSet):
     """Provides set of Parts in the parts file."""
 
+    LISTING_ORDER = {
+        "record_id": "parts.record_id",
+        "part_number": "parts.part_number",
+        "description": "COALESCE(parts.description, '')",
+        "source": "COALESCE(sources.source, '')",
+        "quantity": "quantity",
+        "remarks": "COALESCE(parts.remarks, '')",
+    }
+    """
+    The sql ordering expression of each 'get_parts_listing' key.
+
+    A missing description, source or remarks is ordered as the empty
+    string it is listed as.
+    """
+
     def __init__(
         self,
         parts_file: PartsFile,
@@ -32,6 +70,7 @@ class PartSet(ElementSet):
         order_by_column: str = None,
         limit: int = None,
         offset: int = None,
+        columns: list[str] = None,
     ) -> None:
         """
         Build a set of Parts from the parts file table 'parts'.
@@ -42,22 +81,248 @@ class PartSet(ElementSet):
                 containing the key value to determine the elements being
                 retrieved. Default is all rows are retrieved.
         where_value (Mixed) The key value to retrieve. Required if
-            where_column is set.
+            where_column is set, None matches no rows.
         order_by_column (String) one or more column names separated by
             commas to order the resulting set of elements.
         limit (Integer) number of rows to retrieve, defaults to all.
         offset (Integer) row number to start retrieval, 0 based,
             defaults to row 0.
+        columns (list[str]): the columns to read, all if None. The
+            other columns hold their defaults, so the Elements are
+            for display and option lists only and must not be saved.
         """
         table_name = "parts"  # The parts file table for this element
         element_type = Part
-        super().__init__(
-            parts_file,
-            table_name,
-            element_type,
-            where_column,
-            where_value,
-            order_by_column,
-            limit,
-            offset,
+        if where_column and where_value is None:
+            # a key column without a key value matches no rows
+            where_column, where_value = NO_ROWS
+        with trusted_rows():
+            if columns:
+                # an empty set, filled with only the requested columns
+                super().__init__(parts_file, table_name, element_type, *NO_ROWS)
+                self.set_property_set(
+                    select_elements(
+                        parts_file,
+                        element_type,
+                        table_name,
+                        columns,
+                        where_column,
+                        where_value,
+                        order_by_column,
+                        limit,
+                        offset,
+                    )
+                )
+            else:
+                super().__init__(
+                    parts_file,
+                    table_name,
+                    element_type,
+                    where_column,
+                    where_value,
+                    order_by_column,
+                    limit,
+                    offset,
+                )
+
+    @staticmethod
+    def get_total_quantities(parts_file: PartsFile) -> dict[str, int]:
+        """
+        Get the total quantity used for each part number.
+
+        The 'items' table quantities are summed per part number in a
+        single query. Part numbers without any items are not included.
+
+        Parameters:
+            parts_file (PartsFile): reference to the parts file holding
+                the items.
+
+        Returns:
+            (dict[str, int]) the total quantity keyed by part number.
+        """
+        sql = (
+            "SELECT part_number, SUM(quantity) AS quantity FROM items "
+            "GROUP BY part_number"
+        )
+        result = parts_file.sql_query(sql)
+        return {
+            row["part_number"]: int(row["quantity"] or 0)
+            for row in parts_file.sql_fetchrowset(result)
+        }
+
+    @staticmethod
+    def get_parts_listing(
+        parts_file: PartsFile,
+        order_by_column: str = "part_number",
+        descending: bool = False,
+        where_column: str = None,
+        where_value: Any = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Get the Parts listing with source names and total quantities.
+
+        The 'parts' table is joined with the 'sources' table and the
+        summed 'items' quantities in one query, so no Part, Source or
+        ItemSet is built for the individual rows. With a where_column
+        only the quantities of the selected parts are summed.
+
+        Parameters:
+            parts_file (PartsFile): reference to the parts file holding
+                the parts.
+            order_by_column (str): key of the listing to set the order
+                of the listing, default is 'part_number'. The sort is
+                done by the parts file, on the part_number index for
+                'part_number' and 'record_id'.
+            descending (bool): True to sort in descending order.
+            where_column (str): column of the 'parts' table holding
+                the key value to determine the parts retrieved. If
+                None, all parts are retrieved.
+            where_value (Any): The key value to retrieve. Required if
+                where_column is set, None matches no rows.
+
+        Returns:
+            (list[dict[str, Any]]) one entry per part with the keys
+                'record_id', 'part_number', 'description', 'source'
+                (the source name), 'quantity' (the total used) and
+                'remarks'.
+        """
+        values = []
+        if where_column:
+            # only the selected parts are totaled, through the items
+            # part_number index
+            quantity = (
+                "(SELECT COALESCE(SUM(quantity), 0) FROM items "
+                "WHERE items.part_number = parts.part_number) AS quantity, "
+            )
+            totals = ""
+        else:
+            quantity = "COALESCE(totals.quantity, 0) AS quantity, "
+            totals = (
+                " LEFT JOIN (SELECT part_number, SUM(quantity) AS quantity "
+                "FROM items GROUP BY part_number) AS totals "
+                "ON totals.part_number = parts.part_number"
+            )
+        sql = (
+            "SELECT parts.record_id, parts.part_number, "
+            "COALESCE(parts.description, '') AS description, "
+            "COALESCE(sources.source, '') AS source, "
+            + quantity
+            + "COALESCE(parts.remarks, '') AS remarks "
+            "FROM parts "
+            "LEFT JOIN sources ON sources.record_id = parts.source" + totals
+        )
+        if where_column:
+            sql += " WHERE parts." + where_column + " = ?"
+            values.append(where_value)
+        sql += (
+            " ORDER BY "
+            + PartSet.LISTING_ORDER.get(order_by_column, "parts." + order_by_column)
+            + (" DESC" if descending else "")
+            + ", parts.record_id"
         )
+        result = parts_file.sql_query(sql, values)
+        return parts_file.sql_fetchrowset(result)
+
+    @staticmethod
+    def get_records(
+        parts_file: PartsFile,
+        where_column: str = None,
+        where_value: Any = None,
+        order_by_column: str = None,
+        limit: int = None,
+        offset: int = None,
+    ) -> list[PartRecord]:
+        """
+        Get the rows of the table 'parts' as read only records.
+
+        A PartRecord holds far less memory than a Part; use
+        'get_element' on a record to edit its row. The parameters
+        are the same as for building the set.
+
+        Parameters:
+            parts_file (PartsFile): the dababase instance to use.
+            where_column (str): The key column of the table containing
+                the key value to determine the rows being retrieved.
+                If None, all rows are retrieved.
+            where_value (Any): The key value to retrieve. Required if
+                where_column is set, None matches no rows.
+            order_by_column (str): column of the table to set the
+                order of the records.
+            limit (int): number of rows to retrieve, defaults to all.
+            offset (int): row number to start retrieval, 0 based,
+                defaults to row 0.
+
+        Returns:
+            (list[PartRecord]) the records read.
+        """
+        return PartRecord.select(
+            parts_file, where_column, where_value, order_by_column, limit, offset
+        )
+
+    @staticmethod
+    def stream(
+        parts_file: PartsFile,
+        where_column: str = None,
+        where_value: Any = None,
+        order_by_column: str = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[Part]:
+        """
+        Yield the Parts of the table 'parts' as the rows are read.
+
+        Rows are fetched 'batch_size' at a time and no Part is kept,
+        so a scan of the whole table runs in constant memory.
+
+        Parameters:
+            parts_file (PartsFile): the dababase instance to use.
+            where_column (str): The key column of the table containing
+                the key value to determine the rows being retrieved.
+                If None, all rows are retrieved.
+            where_value (Any): The key value to retrieve. Required if
+                where_column is set, None matches no rows.
+            order_by_column (str): column of the table to set the
+                order of the Parts.
+            batch_size (int): the number of rows fetched at a time.
+
+        Yields:
+            (Part) each Part read.
+        """
+        sql, values = build_select(
+            "parts", None, where_column, where_value, order_by_column
+        )
+        return stream_elements(parts_file, Part, sql, values, batch_size)
+
+    @staticmethod
+    def count(
+        parts_file: PartsFile, where_column: str = None, where_value: Any = None
+    ) -> int:
+        """
+        Count the rows of the table 'parts' without building the set.
+
+        Parameters:
+            parts_file (PartsFile): the dababase instance to use.
+            where_column (str): The key column of the table containing
+                the key value to determine the rows being counted. If
+                None, all rows are counted.
+            where_value (Any): The key value to count. Required if
+                where_column is set, None matches no rows.
+
+        Returns:
+            (int) the number of rows.
+        """
+        return count_rows(parts_file, "parts", where_column, where_value)
+
+    @staticmethod
+    def exists(parts_file: PartsFile, column: str, value: Any) -> bool:
+        """
+        Check if a row of the table 'parts' holds a column value.
+
+        Parameters:
+            parts_file (PartsFile): the dababase instance to use.
+            column (str): the column to search.
+            value (Any): the value to find.
+
+        Returns:
+            (bool) True if a row holds the value, False if not.
+        """
+        return row_exists(parts_file, "parts", column, value)
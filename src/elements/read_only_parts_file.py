@@ -0,0 +1,99 @@
+"""
+A read only connection to a parts file, for use on a worker thread.
+
+File:       read_only_parts_file.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file LICENSE
+Version:    1.0.0
+"""
+
+import os
+import sqlite3
+from typing import Any
+from urllib.request import pathname2url
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Moved from 'pages.file_loader' so dialogs need not load the pages",
+}
+
+
+class ReadOnlyPartsFile:
+    """
+    A read only connection to a parts file, for use on a worker thread.
+
+    Only the query methods used by the listing reads are provided.
+    """
+
+    def __init__(self, filepath: str) -> None:
+        """
+        Open the parts file read only.
+
+        Parameters:
+            filepath (str): the path to the parts file.
+        """
+        self.connection = sqlite3.connect(
+            "file:" + pathname2url(os.path.abspath(filepath)) + "?mode=ro",
+            uri=True,
+            check_same_thread=False,
+        )
+        self.connection.row_factory = sqlite3.Row
+
+    def sql_is_connected(self) -> bool:
+        """Check if the parts file is open."""
+        return self.connection is not None
+
+    def sql_query(self, sql: str, values: list[Any] = None) -> sqlite3.Cursor:
+        """
+        Run a query.
+
+        Parameters:
+            sql (str): the sql statement.
+            values (list[Any]): the values for the '?' placeholders.
+
+        Returns:
+            (sqlite3.Cursor) the cursor holding the result.
+        """
+        return self.connection.execute(sql, values or [])
+
+    def sql_fetchrow(self, cursor: sqlite3.Cursor) -> dict[str, Any]:
+        """
+        Get the next row of a query result.
+
+        Parameters:
+            cursor (sqlite3.Cursor): the query result.
+
+        Returns:
+            (dict[str, Any]) the row, empty if there are no more rows.
+        """
+        row = cursor.fetchone()
+        return dict(row) if row is not None else {}
+
+    def sql_fetchrowset(self, cursor: sqlite3.Cursor) -> list[dict[str, Any]]:
+        """
+        Get the remaining rows of a query result.
+
+        Parameters:
+            cursor (sqlite3.Cursor): the query result.
+
+        Returns:
+            (list[dict[str, Any]]) the rows.
+        """
+        return [dict(row) for row in cursor.fetchall()]
+
+    def interrupt(self) -> None:
+        """Abort the query running on another thread."""
+        connection = self.connection
+        if connection is not None:
+            try:
+                connection.interrupt()
+            except sqlite3.ProgrammingError:
+                # closed by the worker in the meantime
+                pass
+
+    def sql_close(self) -> None:
+        """Close the parts file."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,320 @@
+"""
+Compact read only records of the rows in a parts file table.
+
+A Record holds the column values of a single row in slots, without the
+property, initial value, flag and default dicts of an Element. Large
+result sets can be held as Records and a full Element built only when
+a row is opened for editing.
+
+File:       record.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.2.0
+"""
+
+import sys
+from typing import Any
+
+from lbk_library import DataFile as PartsFile
+from lbk_library import Element
+
+from .item import Item
+from .order import Order
+from .order_line import OrderLine
+from .part import Part
+from .set_query import build_select
+
+file_version = "1.2.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Edit a copy of the Element held by the identity map",
+    "1.2.0": "A None where value matches no rows",
+}
+
+
+class Record:
+    """
+    A read only row of a parts file table.
+
+    The column values are attributes named for the columns, and may
+    also be read by subscript, 'record["part_number"]'.
+    """
+
+    __slots__ = ()
+
+    TABLE: str = ""
+    """The parts file table holding the rows."""
+
+    DEFAULTS: dict[str, Any] = {}
+    """The columns of the table and the value used for an empty column."""
+
+    INTERNED: tuple[str, ...] = ()
+    """The text columns whose values repeat and are interned."""
+
+    ELEMENT_TYPE: type[Element] = None
+    """The Element built by 'get_element'."""
+
+    def __init__(self, row: dict[str, Any]) -> None:
+        """
+        Build a Record from a row read from the parts file.
+
+        Missing, None or empty values take the default.
+
+        Parameters:
+            row (dict[str, Any]): the row read from the parts file.
+        """
+        for column, default in self.DEFAULTS.items():
+            value = row.get(column)
+            if value is None or value == "":
+                value = default
+            elif column in self.INTERNED:
+                value = sys.intern(str(value))
+            object.__setattr__(self, column, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Records are read only."""
+        raise AttributeError(self.__class__.__name__ + " is read only")
+
+    def __delattr__(self, name: str) -> None:
+        """Records are read only."""
+        raise AttributeError(self.__class__.__name__ + " is read only")
+
+    def __getitem__(self, column: str) -> Any:
+        """
+        Get the value of a column.
+
+        Parameters:
+            column (str): the column name.
+
+        Returns:
+            (Any) the column value.
+        """
+        if column not in self.DEFAULTS:
+            raise KeyError(column)
+        return getattr(self, column)
+
+    def __eq__(self, other: Any) -> bool:
+        """Records of the same table are equal if their values match."""
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.get_properties() == other.get_properties()
+
+    def __hash__(self) -> int:
+        """Hash a Record by its table and record_id."""
+        return hash((self.TABLE, self.get_record_id()))
+
+    def __repr__(self) -> str:
+        """Show the Record class and its column values."""
+        return self.__class__.__name__ + "(" + repr(self.get_properties()) + ")"
+
+    def get_record_id(self) -> int:
+        """
+        Get the record_id of the row.
+
+        Returns:
+            (int) the record_id.
+        """
+        return self.record_id
+
+    def get_properties(self) -> dict[str, Any]:
+        """
+        Get the column values as a dict.
+
+        Returns:
+            (dict[str, Any]) the column values keyed by column name.
+        """
+        return {column: getattr(self, column) for column in self.DEFAULTS}
+
+    def get_element(self, parts_file: PartsFile) -> Element:
+        """
+        Get the full Element of the row, for editing.
+
+        The Element is read from the parts file, or copied from the
+        parts file identity map if it is already held.
+
+        Parameters:
+            parts_file (PartsFile): the parts file holding the row.
+
+        Returns:
+            (Element) the Element of the row.
+        """
+        return self.ELEMENT_TYPE.get_element(
+            parts_file, self.record_id, "record_id", edit=True
+        )
+
+    @classmethod
+    def select(
+        cls,
+        parts_file: PartsFile,
+        where_column: str = None,
+        where_value: Any = None,
+        order_by_column: str = None,
+        limit: int = None,
+        offset: int = None,
+    ) -> list["Record"]:
+        """
+        Read a set of Records from the parts file.
+
+        The parameters are those of the ElementSets.
+
+        Parameters:
+            parts_file (PartsFile): the parts file to read.
+            where_column (str): The column holding the key value to
+                determine the rows being retrieved. If None, all rows
+                are retrieved.
+            where_value (Any): The key value to retrieve. Required if
+                where_column is set, None matches no rows.
+            order_by_column (str): column of the table to set the order
+                of the records.
+            limit (int): number of rows to retrieve, defaults to all.
+            offset (int): row number to start retrieval, 0 based,
+                defaults to row 0.
+
+        Returns:
+            (list[Record]) the records read.
+        """
+        sql, values = build_select(
+            cls.TABLE,
+            tuple(cls.DEFAULTS),
+            where_column,
+            where_value,
+            order_by_column,
+            limit,
+            offset,
+        )
+        rows = parts_file.sql_fetchrowset(parts_file.sql_query(sql, values))
+        return [cls(row) for row in rows]
+
+
+class ItemRecord(Record):
+    """A read only row of the 'items' table."""
+
+    __slots__ = (
+        "record_id",
+        "part_number",
+        "assembly",
+        "quantity",
+        "condition",
+        "installed",
+        "box",
+        "remarks",
+    )
+
+    TABLE = "items"
+    DEFAULTS = {
+        "record_id": 0,
+        "part_number": "",
+        "assembly": "",
+        "quantity": 0,
+        "condition": 0,
+        "installed": 0,
+        "box": 0,
+        "remarks": "",
+    }
+    INTERNED = ("part_number",)
+    ELEMENT_TYPE = Item
+
+    def get_element(self, parts_file: PartsFile) -> Item:
+        """
+        Get the full Item of the row, for editing.
+
+        Parameters:
+            parts_file (PartsFile): the parts file holding the row.
+
+        Returns:
+            (Item) the Item of the row.
+        """
+        return Item.get_element(parts_file, self.record_id, edit=True)
+
+
+class OrderLineRecord(Record):
+    """A read only row of the 'order_lines' table."""
+
+    __slots__ = (
+        "record_id",
+        "order_number",
+        "line",
+        "part_number",
+        "cost_each",
+        "quantity",
+        "remarks",
+    )
+
+    TABLE = "order_lines"
+    DEFAULTS = {
+        "record_id": 0,
+        "order_number": "",
+        "line": 0,
+        "part_number": "",
+        "cost_each": 0.0,
+        "quantity": 0,
+        "remarks": "",
+    }
+    INTERNED = ("order_number", "part_number")
+    ELEMENT_TYPE = OrderLine
+
+    def get_element(self, parts_file: PartsFile) -> OrderLine:
+        """
+        Get the full OrderLine of the row, for editing.
+
+        OrderLines are not held in the identity map and are always read
+        from the parts file.
+
+        Parameters:
+            parts_file (PartsFile): the parts file holding the row.
+
+        Returns:
+            (OrderLine) the OrderLine of the row.
+        """
+        return OrderLine(parts_file, self.record_id)
+
+
+class OrderRecord(Record):
+    """A read only row of the 'orders' table."""
+
+    __slots__ = (
+        "record_id",
+        "order_number",
+        "date",
+        "source",
+        "subtotal",
+        "shipping",
+        "tax",
+        "discount",
+        "total",
+        "remarks",
+    )
+
+    TABLE = "orders"
+    DEFAULTS = {
+        "record_id": 0,
+        "order_number": "",
+        "date": "",
+        "source": 0,
+        "subtotal": 0.0,
+        "shipping": 0.0,
+        "tax": 0.0,
+        "discount": 0.0,
+        "total": 0.0,
+        "remarks": "",
+    }
+    INTERNED = ("date",)
+    ELEMENT_TYPE = Order
+
+
+class PartRecord(Record):
+    """A read only row of the 'parts' table."""
+
+    __slots__ = ("record_id", "part_number", "source", "description", "remarks")
+
+    TABLE = "parts"
+    DEFAULTS = {
+        "record_id": 0,
+        "part_number": "",
+        "source": 0,
+        "description": "",
+        "remarks": "",
+    }
+    INTERNED = ("part_number",)
+    ELEMENT_TYPE = Part
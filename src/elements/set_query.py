@@ -0,0 +1,247 @@
+"""
+Build and run the queries used by the ElementSet query helpers.
+
+File:       set_query.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.8.0
+"""
+
+from typing import Any, Iterator
+
+from lbk_library import DataFile as PartsFile
+from lbk_library import Element
+
+from .trusted_element import trusted_rows
+
+file_version = "1.8.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Added the streaming 'fetch_rows' and 'stream_elements'",
+    "1.2.0": "Added the column projection 'select_elements'",
+    "1.3.0": "Added 'count_rows' and 'row_exists'",
+    "1.4.0": "Stream 'fetch_rows' through the query cursor",
+    "1.5.0": "Replaced 'NO_ROWS' with the query free 'no_rows'",
+    "1.6.0": "Select the NULL rows for a where column without a value",
+    "1.7.0": "Restored 'NO_ROWS', dropping 'no_rows'",
+    "1.8.0": "A None where value matches no rows",
+}
+
+DEFAULT_BATCH_SIZE = 500
+"""The number of rows pulled from the cursor at a time when streaming."""
+
+NO_ROWS = ("record_id", -1)
+"""A where column and value matching no row, for building an empty set."""
+
+
+def build_select(
+    table: str,
+    columns: list[str] | tuple[str, ...] = None,
+    where_column: str = None,
+    where_value: Any = None,
+    order_by_column: str = None,
+    limit: int = None,
+    offset: int = None,
+) -> tuple[str, list[Any]]:
+    """
+    Build a SELECT statement on a single parts file table.
+
+    Parameters:
+        table (str): the parts file table.
+        columns (list[str]): the columns to select, all if None.
+        where_column (str): The column holding the key value to
+            determine the rows being retrieved. If None, all rows are
+            retrieved.
+        where_value (Any): The key value to retrieve. Required if
+            where_column is set, None matches no rows.
+        order_by_column (str): one or more column names separated by
+            commas to order the rows.
+        limit (int): number of rows to retrieve, defaults to all.
+        offset (int): row number to start retrieval, 0 based, defaults
+            to row 0.
+
+    Returns:
+        (tuple[str, list[Any]]) the sql statement and the values for
+            its placeholders.
+    """
+    values = []
+    column_list = "*"
+    if columns:
+        column_list = ", ".join(columns)
+    sql = "SELECT " + column_list + " FROM " + table
+    if where_column:
+        # a None key value compares to no row, so it matches no rows
+        sql += " WHERE " + where_column + " = ?"
+        values.append(where_value)
+    if order_by_column:
+        sql += " ORDER BY " + order_by_column
+    if limit is not None:
+        sql += " LIMIT ?"
+        values.append(int(limit))
+        if offset is not None:
+            sql += " OFFSET ?"
+            values.append(int(offset))
+    return (sql, values)
+
+
+def fetch_rows(
+    parts_file: PartsFile,
+    sql: str,
+    values: list[Any] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """
+    Run a query and yield its rows a batch at a time.
+
+    Only 'batch_size' rows are held at once, however large the result.
+
+    Parameters:
+        parts_file (PartsFile): the parts file to query.
+        sql (str): the SELECT statement.
+        values (list[Any]): the values for the statement placeholders.
+        batch_size (int): the number of rows fetched from the cursor at
+            a time.
+
+    Yields:
+        (dict[str, Any]) each row, keyed by column name.
+    """
+    # Each query of the parts file returns a cursor of its own, which is
+    # passed back to 'sql_fetchrow', so the loop body may query while
+    # rows remain on this one.
+    cursor = parts_file.sql_query(sql, values or [])
+    if cursor is None:
+        return
+    columns = [description[0] for description in cursor.description]
+    batch = cursor.fetchmany(max(1, batch_size))
+    while batch:
+        for row in batch:
+            yield dict(zip(columns, row))
+        batch = cursor.fetchmany(max(1, batch_size))
+
+
+def stream_elements(
+    parts_file: PartsFile,
+    element_type: type[Element],
+    sql: str,
+    values: list[Any] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[Element]:
+    """
+    Run a query and yield an Element for each row as it is fetched.
+
+    Each Element is built from the trusted row. Nothing is kept after
+    it is yielded, so a scan of a whole table runs in constant memory.
+
+    Parameters:
+        parts_file (PartsFile): the parts file to query.
+        element_type (type[Element]): the Element built from each row.
+        sql (str): the SELECT statement.
+        values (list[Any]): the values for the statement placeholders.
+        batch_size (int): the number of rows fetched from the cursor at
+            a time.
+
+    Yields:
+        (Element) the Element of each row.
+    """
+    for row in fetch_rows(parts_file, sql, values, batch_size):
+        # only the construction is trusted, not the caller's loop body
+        with trusted_rows():
+            element = element_type(parts_file, row)
+        yield element
+
+
+def select_elements(
+    parts_file: PartsFile,
+    element_type: type[Element],
+    table: str,
+    columns: list[str] | tuple[str, ...],
+    where_column: str = None,
+    where_value: Any = None,
+    order_by_column: str = None,
+    limit: int = None,
+    offset: int = None,
+) -> list[Element]:
+    """
+    Read a set of Elements holding only the requested columns.
+
+    The 'record_id' is always read. The other columns of each Element
+    hold their default values, so the Elements are for display and
+    option lists only and must not be saved.
+
+    Parameters:
+        parts_file (PartsFile): the parts file to query.
+        element_type (type[Element]): the Element built from each row.
+        table (str): the parts file table.
+        columns (list[str]): the columns to read.
+        where_column (str): The column holding the key value to
+            determine the rows being retrieved. If None, all rows are
+            retrieved.
+        where_value (Any): The key value to retrieve. Required if
+            where_column is set, None matches no rows.
+        order_by_column (str): one or more column names separated by
+            commas to order the rows.
+        limit (int): number of rows to retrieve, defaults to all.
+        offset (int): row number to start retrieval, 0 based, defaults
+            to row 0.
+
+    Returns:
+        (list[Element]) the Elements read.
+    """
+    if "record_id" not in columns:
+        columns = ("record_id",) + tuple(columns)
+    sql, values = build_select(
+        table, columns, where_column, where_value, order_by_column, limit, offset
+    )
+    rows = parts_file.sql_fetchrowset(parts_file.sql_query(sql, values))
+    with trusted_rows():
+        return [element_type(parts_file, row) for row in rows]
+
+
+def count_rows(
+    parts_file: PartsFile,
+    table: str,
+    where_column: str = None,
+    where_value: Any = None,
+) -> int:
+    """
+    Count the rows of a table without reading them.
+
+    Parameters:
+        parts_file (PartsFile): the parts file to query.
+        table (str): the parts file table.
+        where_column (str): The column holding the key value to
+            determine the rows being counted. If None, all rows are
+            counted.
+        where_value (Any): The key value to count. Required if
+            where_column is set, None matches no rows.
+
+    Returns:
+        (int) the number of rows.
+    """
+    sql, values = build_select(
+        table, ["COUNT(*) AS number_rows"], where_column, where_value
+    )
+    row = parts_file.sql_fetchrow(parts_file.sql_query(sql, values))
+    if not row:
+        return 0
+    return int(row["number_rows"])
+
+
+def row_exists(parts_file: PartsFile, table: str, column: str, value: Any) -> bool:
+    """
+    Check if a table holds a row with a column value.
+
+    The search stops at the first row found.
+
+    Parameters:
+        parts_file (PartsFile): the parts file to query.
+        table (str): the parts file table.
+        column (str): the column to search.
+        value (Any): the value to find.
+
+    Returns:
+        (bool) True if a row holds the value, False if not.
+    """
+    sql, values = build_select(table, ["1 AS found"], column, value, None, 1)
+    return bool(parts_file.sql_fetchrow(parts_file.sql_query(sql, values)))
@@ -5,7 +5,7 @@ File:       source.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023, 2024 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.0
+Version:    1.3.0
 """
 
 from copy import deepcopy
@@ -14,13 +14,18 @@ from typing import Any
 from lbk_library import DataFile as PartsFile
 from lbk_library import Element
 
-file_version = "1.0.0"
+from .change_bus import PublishingElement
+
+file_version = "1.3.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Invalidate the lookup cache when the table is written",
+    "1.2.0": "Publish the writes on the change bus, invalidating the lookup cache",
+    "1.3.0": "Keep a copy of the values read as the initial values",
 }
 
 
-class Source(Element):
+class Source(PublishingElement, Element):
     """
     Implement a single Source in the parts file.
 
@@ -75,7 +80,7 @@ class Source(Element):
             source_key = deepcopy(self._defaults)
 
         self.set_properties(source_key)
-        self.set_initial_values(self.get_properties())
+        self.set_initial_values(deepcopy(self.get_properties()))
         self.clear_value_changed_flags()
 
     def set_properties(self, properties: dict[str, Any]) -> None:
@@ -0,0 +1,143 @@
+"""
+Build Elements directly from rows read from the parts file.
+
+File:       trusted_element.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.0.0
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Initial release",
+}
+
+_trusted = threading.local()
+"""The per thread nesting depth of 'trusted_rows'."""
+
+
+@contextmanager
+def trusted_rows() -> Iterator[None]:
+    """
+    Mark the dict keys of Elements built in this block as trusted.
+
+    Used by the ElementSets around the construction of their Elements,
+    where each dict holds a row just read from the parts file.
+    """
+    depth = getattr(_trusted, "depth", 0)
+    _trusted.depth = depth + 1
+    try:
+        yield
+    finally:
+        _trusted.depth = depth
+
+
+def rows_are_trusted() -> bool:
+    """
+    Check if Elements are being built from trusted rows.
+
+    Returns:
+        (bool) True inside a 'trusted_rows' block, False otherwise.
+    """
+    return getattr(_trusted, "depth", 0) > 0
+
+
+class TrustedElement:
+    """
+    Provide the trusted construction path for an Element.
+
+    A row read from the parts file was validated when it was saved, so
+    the values are copied into the Element after only a type check
+    against the defaults. The valid and changed flags are not set until
+    the flags are first used, usually when a field is modified.
+
+    This is a mixin listed ahead of lbk_library.Element.
+    """
+
+    _flags_pending: bool = False
+    """True while the flags of a trusted Element have not been set."""
+
+    def set_trusted_properties(
+        self, row: dict[str, Any], defaults: dict[str, Any]
+    ) -> bool:
+        """
+        Set the properties from a trusted parts file row.
+
+        Each value is converted to the type of its default; missing,
+        None or empty values take the default. Keys not in the defaults
+        are discarded.
+
+        Parameters:
+            row (dict[str, Any]): the row read from the parts file.
+            defaults (dict[str, Any]): the default values of the Element.
+
+        Returns:
+            (bool) True if the properties were set, False if a value
+                could not be converted and the row must be validated.
+        """
+        properties = {}
+        try:
+            for key, default in defaults.items():
+                value = row.get(key)
+                if value is None or value == "":
+                    value = default
+                elif isinstance(default, bool):
+                    value = bool(value)
+                elif isinstance(default, int):
+                    value = int(value)
+                elif isinstance(default, float):
+                    value = float(value)
+                else:
+                    value = str(value)
+                properties[key] = value
+        except (TypeError, ValueError):
+            return False
+
+        for key, value in properties.items():
+            self._set_property(key, value)
+        self.set_initial_values(properties)
+        self._flags_pending = True
+        return True
+
+    def _settle_flags(self) -> None:
+        """Set the deferred flags of a trusted Element."""
+        if self._flags_pending:
+            self._flags_pending = False
+            for key in self.get_properties():
+                self.set_value_valid_flag(key, True)
+            self.clear_value_changed_flags()
+
+    def update_property_flags(self, *args: Any, **kwargs: Any) -> Any:
+        """Set the deferred flags, then update the flags of a property."""
+        self._settle_flags()
+        return super().update_property_flags(*args, **kwargs)
+
+    def set_value_valid_flag(self, *args: Any, **kwargs: Any) -> Any:
+        """Set the deferred flags, then set a single valid flag."""
+        self._settle_flags()
+        return super().set_value_valid_flag(*args, **kwargs)
+
+    def clear_value_valid_flags(self, *args: Any, **kwargs: Any) -> Any:
+        """Set the deferred flags, then clear the valid flags."""
+        self._settle_flags()
+        return super().clear_value_valid_flags(*args, **kwargs)
+
+    def clear_value_changed_flags(self, *args: Any, **kwargs: Any) -> Any:
+        """Set the deferred flags, then clear the changed flags."""
+        self._settle_flags()
+        return super().clear_value_changed_flags(*args, **kwargs)
+
+    def is_element_valid(self, *args: Any, **kwargs: Any) -> Any:
+        """Set the deferred flags, then check the Element is valid."""
+        self._settle_flags()
+        return super().is_element_valid(*args, **kwargs)
+
+    def have_values_changed(self, *args: Any, **kwargs: Any) -> Any:
+        """Set the deferred flags, then check for changed values."""
+        self._settle_flags()
+        return super().have_values_changed(*args, **kwargs)
@@ -0,0 +1,47 @@
+"""
+The PartsTracker Forms Collection.
+
+The Qt Designer '.ui' files in this directory are compiled to Python
+modules once, and the compiled modules are cached by a hash of the
+form, so they are not parsed again each time a window opens. A form
+class is compiled or loaded from the cache when first imported:
+    Ui_ItemDialog - the Item editing dialog
+    Ui_MainWindow - the main window
+    Ui_OrderForm - the Order editing dialog
+    Ui_PartForm - the Part editing dialog
+    Ui_SaveAssemblyListForm - the assembly listing dialog
+    Ui_TableDialog - the Conditions and Sources editing dialogs
+
+Run 'python -m forms.form_compiler' from the 'src' directory to compile
+every form ahead of time, as at build or install time.
+
+File       __init__.py
+Author     Lorn B Kerr
+Copyright  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.0.0
+"""
+
+from .form_compiler import FORMS, compile_forms, load_form
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Initial release",
+}
+
+
+def __getattr__(name: str) -> type:
+    """
+    Get a form class on first use, compiling its form if needed.
+
+    Parameters:
+        name (str): the form class.
+
+    Returns:
+        (type) the form class.
+    """
+    if name not in FORMS:
+        raise AttributeError("module 'forms' has no attribute " + repr(name))
+    form_class = load_form(name)
+    globals()[name] = form_class
+    return form_class
@@ -0,0 +1,248 @@
+"""
+Compile the Qt Designer forms to Python modules, once.
+
+File:       form_compiler.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.1.0
+"""
+
+import hashlib
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from types import ModuleType
+
+from qt_compat import BINDING
+
+file_version = "1.1.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Compile every form for the single binding of 'qt_compat'",
+}
+
+FORMS_DIR = os.path.dirname(os.path.abspath(__file__))
+"""The directory holding the '.ui' files, whatever the working directory."""
+
+CACHE_ENVIRONMENT = "PARTS_TRACKER_FORMS_CACHE"
+"""The environment variable naming another directory for the compiled forms."""
+
+COMPILER_VERSION = "1"
+"""Part of each cache key; change it to compile every form again."""
+
+FORMS = {
+    "Ui_ItemDialog": "item.ui",
+    "Ui_MainWindow": "main_window.ui",
+    "Ui_OrderForm": "order.ui",
+    "Ui_PartForm": "part.ui",
+    "Ui_SaveAssemblyListForm": "assembly_list_dialog.ui",
+    "Ui_TableDialog": "simple_tableview.ui",
+}
+"""The '.ui' file of each form class."""
+
+
+def get_cache_dir() -> str:
+    """
+    Get the directory holding the compiled forms.
+
+    The directory named by PARTS_TRACKER_FORMS_CACHE is used if set,
+    otherwise '__formcache__' beside the '.ui' files if it can be
+    written, otherwise a directory in the user's cache.
+
+    Returns:
+        (str) the cache directory, created if needed.
+    """
+    cache_dir = os.environ.get(CACHE_ENVIRONMENT)
+    if not cache_dir:
+        cache_dir = os.path.join(FORMS_DIR, "__formcache__")
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError:
+            cache_dir = ""
+        if not cache_dir or not os.access(cache_dir, os.W_OK):
+            cache_dir = os.path.join(
+                os.path.expanduser("~"), ".cache", "parts_tracker", "forms"
+            )
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def get_cache_key(ui_path: str) -> str:
+    """
+    Get the key of a compiled form.
+
+    Parameters:
+        ui_path (str): the path of the '.ui' file.
+
+    Returns:
+        (str) a hash of the form contents, the Qt binding and the
+            compiler version.
+    """
+    digest = hashlib.sha256()
+    with open(ui_path, "rb") as ui_file:
+        digest.update(ui_file.read())
+    digest.update(("\0" + BINDING + "\0" + COMPILER_VERSION).encode())
+    return digest.hexdigest()[:20]
+
+
+def get_module_path(ui_name: str, cache_dir: str = None) -> str:
+    """
+    Get the path the compiled module of a form is cached at.
+
+    Parameters:
+        ui_name (str): the '.ui' file name in the forms directory.
+        cache_dir (str): the cache directory, default from
+            'get_cache_dir'.
+
+    Returns:
+        (str) the module path; the file exists only once compiled.
+    """
+    if cache_dir is None:
+        cache_dir = get_cache_dir()
+    stem = os.path.splitext(ui_name)[0]
+    key = get_cache_key(os.path.join(FORMS_DIR, ui_name))
+    return os.path.join(cache_dir, "ui_" + stem + "_" + key + ".py")
+
+
+def run_compiler(ui_path: str, py_path: str) -> None:
+    """
+    Compile a '.ui' file with the PySide6 form compiler.
+
+    Parameters:
+        ui_path (str): the '.ui' file.
+        py_path (str): the Python module to write.
+
+    Raises:
+        (RuntimeError) if the compiler fails.
+    """
+    command = shutil.which("pyside6-uic")
+    if command:
+        command = [command]
+    else:
+        command = [
+            sys.executable,
+            "-c",
+            "from PySide6.scripts.pyside_tool import uic; uic()",
+        ]
+    result = subprocess.run(
+        command + [ui_path, "-o", py_path], capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            "pyside6-uic failed on " + os.path.basename(ui_path) + ": " + result.stderr
+        )
+
+
+def compile_form(ui_name: str, cache_dir: str = None) -> str:
+    """
+    Compile a form into the cache unless its current version is there.
+
+    The module is written beside its final name and moved into place,
+    so a form is never read half written; the modules of earlier
+    versions of the form are removed.
+
+    Parameters:
+        ui_name (str): the '.ui' file name in the forms directory.
+        cache_dir (str): the cache directory, default from
+            'get_cache_dir'.
+
+    Returns:
+        (str) the path of the compiled module.
+    """
+    if cache_dir is None:
+        cache_dir = get_cache_dir()
+    py_path = get_module_path(ui_name, cache_dir)
+    if os.path.exists(py_path):
+        return py_path
+
+    handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+    os.close(handle)
+    try:
+        run_compiler(os.path.join(FORMS_DIR, ui_name), temp_path)
+        os.replace(temp_path, py_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    # earlier versions differ from this one only in the key
+    module_name = os.path.basename(py_path)
+    prefix = "ui_" + os.path.splitext(ui_name)[0] + "_"
+    for name in os.listdir(cache_dir):
+        if (
+            name != module_name
+            and name.startswith(prefix)
+            and len(name) == len(module_name)
+            and name.endswith(".py")
+        ):
+            os.remove(os.path.join(cache_dir, name))
+    return py_path
+
+
+def load_form(class_name: str, cache_dir: str = None) -> type:
+    """
+    Get a form class, compiling its form on first use.
+
+    Parameters:
+        class_name (str): the form class, a key of FORMS.
+        cache_dir (str): the cache directory, default from
+            'get_cache_dir'.
+
+    Returns:
+        (type) the form class, with its 'setupUi' method.
+
+    Raises:
+        (AttributeError) if there is no such form class.
+    """
+    if class_name not in FORMS:
+        raise AttributeError("No form class " + class_name)
+    py_path = compile_form(FORMS[class_name], cache_dir)
+    module_name = "forms." + os.path.splitext(os.path.basename(py_path))[0]
+    module = sys.modules.get(module_name)
+    if module is None:
+        module = _import_path(module_name, py_path)
+    return getattr(module, class_name)
+
+
+def _import_path(module_name: str, py_path: str) -> ModuleType:
+    """
+    Import a module from a file outside the package path.
+
+    Parameters:
+        module_name (str): the name to register the module under.
+        py_path (str): the module file.
+
+    Returns:
+        (ModuleType) the module.
+    """
+    spec = importlib.util.spec_from_file_location(module_name, py_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
+
+
+def compile_forms(cache_dir: str = None) -> list[str]:
+    """
+    Compile every form, as done at build or install time.
+
+    Parameters:
+        cache_dir (str): the cache directory, default from
+            'get_cache_dir'.
+
+    Returns:
+        (list[str]) the paths of the compiled modules.
+    """
+    return [compile_form(ui_name, cache_dir) for ui_name in FORMS.values()]
+
+
+if __name__ == "__main__":
+    for path in compile_forms():
+        print(path)
@@ -5,8 +5,20 @@ This module contains the following classes:
     MainWindow (QMainWindow): The Core window into the program.
     AssemblyTreePage (QWidget): Displays the Items in a Tree listing
         format.
+    AssemblyTreeModel (QAbstractItemModel): The lazily loaded Items
+        of the Assembly Tree.
     PartsListPaage (QObject): Displays the Parts in a Table listing.
+    PartsListModel (QAbstractTableModel): The Parts listing, sorted by
+        the parts file.
     OrderListPage (OQject): Displays the Orders in a Table Listing.
+    OrdersListModel (QAbstractTableModel): The Orders listing, read a
+        page at a time.
+    FileLoader (QObject): Reads the page contents of an opened parts
+        file on a worker thread.
+    RefreshScheduler (QObject): Merges the refresh requests of the
+        pages into one refresh per page.
+    DialogPool (QObject): Keeps the element dialogs of the main window
+        to be opened again.
 
 Also included is:
     table_definition (List[str]): A list of sql definitions for the
@@ -18,8 +30,14 @@ Copyright  (c) 2023, 2024 Lorn B Kerr
 License:    MIT, see file License
 """
 
+from .assembly_tree_model import AssemblyTreeModel
 from .assembly_tree_page import AssemblyTreePage
+from .dialog_pool import DialogPool
+from .file_loader import FileLoader
 from .main_window import MainWindow
+from .orders_list_model import OrdersListModel
 from .orders_list_page import OrdersListPage
 from .parts_file_definition import table_definition
+from .parts_list_model import PartsListModel
 from .parts_list_page import PartsListPage
+from .refresh_scheduler import RefreshScheduler
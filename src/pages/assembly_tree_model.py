@@ -0,0 +1,533 @@
+"""
+The lazily loaded model of the Items in assembly tree order.
+
+File:       assembly_tree_model.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file LICENSE
+Version:    1.6.0
+"""
+
+from typing import Any, Callable
+
+from lbk_library import DataFile as PartsFile
+
+from elements import ItemView
+from qt_compat.QtCore import QAbstractItemModel, QModelIndex, QObject, Qt
+
+file_version = "1.6.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Split 'load' into 'read_root' and 'set_root'",
+    "1.2.0": "Added 'find_nodes' and 'set_node_values' to patch nodes",
+    "1.3.0": "Index the nodes read and patch the tree structure in place",
+    "1.4.0": "Changed library 'PyQt6' to 'PySide6' through 'qt_compat'",
+    "1.5.0": "Refresh a level with row inserts and removals, not a layout change",
+    "1.6.0": "Slice the refreshed rows without flake8 E203",
+}
+
+
+class AssemblyNode:
+    """An Item in the assembly tree, holding its display values."""
+
+    __slots__ = ("parent", "row", "record_id", "assembly", "values", "children")
+
+    def __init__(
+        self,
+        parent: "AssemblyNode",
+        row: int,
+        record_id: int,
+        assembly: str,
+        values: list[str],
+        has_children: bool,
+    ) -> None:
+        """
+        Build a tree node.
+
+        Parameters:
+            parent (AssemblyNode): the parent node, None for the root.
+            row (int): the row of the node under its parent.
+            record_id (int): the record_id of the Item.
+            assembly (str): the assembly of the Item.
+            values (list[str]): the display value of each column.
+            has_children (bool): True if assemblies are below this one.
+        """
+        self.parent = parent
+        self.row = row
+        self.record_id = record_id
+        self.assembly = assembly
+        self.values = values
+        self.children: list[AssemblyNode] | None = [] if not has_children else None
+        """The child nodes, None until they are fetched."""
+
+
+class AssemblyTreeModel(QAbstractItemModel):
+    """
+    Provide the Items of a parts file in assembly tree order.
+
+    Only the top level assemblies are read when the model is loaded.
+    The assemblies below a node are read when the view first asks for
+    them, usually when the node is expanded, so the memory used grows
+    only with the part of the tree that has been shown.
+
+    The nodes read are indexed by record_id, so an Item written is
+    found without a search. An Item added, deleted or moved changes
+    only the level of the tree it is shown at, which is read again
+    keeping the nodes still there, with their expansion in the view,
+    and inserting and removing the others row by row.
+    """
+
+    CENTERED_COLUMNS = (4, 5, 6)
+    """The qty used, condition and installed columns, shown centered."""
+
+    def __init__(
+        self,
+        parts_file: PartsFile,
+        column_names: list[str],
+        format_row: Callable[[dict[str, Any]], list[str]],
+        parent: QObject = None,
+    ) -> None:
+        """
+        Initialize the model, empty until loaded.
+
+        Parameters:
+            parts_file (PartsFile): the parts file holding the items.
+            column_names (list[str]): the header name of each column.
+            format_row (Callable): converts an ItemView row to the list
+                of column display values.
+            parent (QObject): the owner of the model.
+        """
+        super().__init__(parent)
+        self.parts_file = parts_file
+        self.column_names = column_names
+        self.format_row = format_row
+        self.root = AssemblyNode(None, 0, 0, None, [], False)
+        self.nodes: dict[int, AssemblyNode] = {}
+        """The nodes read, by record_id."""
+
+    def load(self) -> None:
+        """Discard the tree and read the top level assemblies."""
+        self.set_root(self.read_root())
+
+    def clear(self) -> None:
+        """Discard the tree, leaving the model empty."""
+        self.set_root(AssemblyNode(None, 0, 0, None, [], False))
+
+    def read_root(self, parts_file: PartsFile = None) -> AssemblyNode:
+        """
+        Read the top level assemblies into a new root node.
+
+        The model is not changed, so the root may be read on a worker
+        thread and handed to 'set_root'.
+
+        Parameters:
+            parts_file (PartsFile): the parts file to read, default is
+                the parts file of the model.
+
+        Returns:
+            (AssemblyNode) the root node holding the top level nodes.
+        """
+        root = AssemblyNode(None, 0, 0, None, [], True)
+        root.children = self.read_children(root, parts_file)
+        return root
+
+    def set_root(self, root: AssemblyNode) -> None:
+        """
+        Replace the tree.
+
+        Parameters:
+            root (AssemblyNode): the root node from 'read_root'.
+        """
+        self.beginResetModel()
+        self.root = root
+        self.nodes = {}
+        self.add_nodes(root.children or [])
+        self.endResetModel()
+
+    def read_children(
+        self, node: AssemblyNode, parts_file: PartsFile = None
+    ) -> list[AssemblyNode]:
+        """
+        Read the nodes below a node from the parts file.
+
+        Parameters:
+            node (AssemblyNode): the parent node.
+            parts_file (PartsFile): the parts file to read, default is
+                the parts file of the model.
+
+        Returns:
+            (list[AssemblyNode]) the child nodes in assembly order.
+        """
+        rows = ItemView.get_assembly_children(
+            parts_file if parts_file is not None else self.parts_file, node.assembly
+        )
+        children = []
+        for row_number, row in enumerate(rows):
+            # Items sharing an assembly are siblings; the assemblies
+            # below are shown under the last of them
+            has_children = bool(row["has_children"]) and (
+                row_number + 1 == len(rows)
+                or rows[row_number + 1]["assembly"] != row["assembly"]
+            )
+            children.append(
+                AssemblyNode(
+                    node,
+                    row_number,
+                    row["record_id"],
+                    row["assembly"],
+                    self.format_row(row),
+                    has_children,
+                )
+            )
+        return children
+
+    def get_node(self, index: QModelIndex) -> AssemblyNode:
+        """
+        Get the node of an index.
+
+        Parameters:
+            index (QModelIndex): the model index, invalid for the root.
+
+        Returns:
+            (AssemblyNode) the node.
+        """
+        if index.isValid():
+            return index.internalPointer()
+        return self.root
+
+    def get_record_id(self, index: QModelIndex) -> int:
+        """
+        Get the record_id of the Item at an index.
+
+        Parameters:
+            index (QModelIndex): the model index.
+
+        Returns:
+            (int) the record_id, 0 if the index is invalid.
+        """
+        return self.get_node(index).record_id
+
+    def add_nodes(self, nodes: list[AssemblyNode]) -> None:
+        """
+        Index nodes attached to the tree.
+
+        Parameters:
+            nodes (list[AssemblyNode]): the nodes.
+        """
+        for node in nodes:
+            self.nodes[node.record_id] = node
+
+    def drop_nodes(self, nodes: list[AssemblyNode]) -> None:
+        """
+        Remove detached nodes, and the nodes read below them, from the
+        index.
+
+        Parameters:
+            nodes (list[AssemblyNode]): the nodes.
+        """
+        pending = list(nodes)
+        while pending:
+            node = pending.pop()
+            if self.nodes.get(node.record_id) is node:
+                del self.nodes[node.record_id]
+            if node.children:
+                pending.extend(node.children)
+
+    def find_node(self, record_id: int) -> AssemblyNode | None:
+        """
+        Get the node of an Item, if it has been read.
+
+        Parameters:
+            record_id (int): the record_id of the Item.
+
+        Returns:
+            (AssemblyNode | None) the node, None if not read.
+        """
+        return self.nodes.get(record_id)
+
+    def find_nodes(
+        self, predicate: Callable[[AssemblyNode], bool]
+    ) -> list[AssemblyNode]:
+        """
+        Find the nodes read that match a test.
+
+        Parameters:
+            predicate (Callable[[AssemblyNode], bool]): the test.
+
+        Returns:
+            (list[AssemblyNode]) the matching nodes.
+        """
+        return [node for node in self.nodes.values() if predicate(node)]
+
+    def find_parent_node(self, assembly: str) -> AssemblyNode | None:
+        """
+        Find the node an assembly is shown under, if it is read.
+
+        Parameters:
+            assembly (str): the assembly.
+
+        Returns:
+            (AssemblyNode | None) the parent node, the root for a top
+                level assembly, or None if the level the assembly is
+                shown at has not been read.
+        """
+        node = self.root
+        while node.children is not None:
+            holder = None
+            for child in node.children:
+                # the last of the siblings sharing an assembly holds
+                # the assemblies below it
+                if (
+                    child.assembly
+                    and child.assembly != assembly
+                    and assembly.startswith(child.assembly)
+                ):
+                    holder = child
+            if holder is None:
+                return node
+            node = holder
+        return None
+
+    def refresh_children(self, node: AssemblyNode) -> None:
+        """
+        Read the nodes below a node again, keeping those unchanged.
+
+        A child still there keeps its node, with the nodes read below
+        it, so the view keeps it expanded, selected and scrolled to.
+        The other children are removed and the new ones inserted, with
+        the row signals of each, so the view moves only the rows below
+        them.
+
+        Parameters:
+            node (AssemblyNode): the node whose children have been read.
+        """
+        parent = self.get_index(node)
+        old_children = node.children or []
+        old_rows = {id(child): row for row, child in enumerate(old_children)}
+        fresh_children = self.read_children(node)
+
+        # the children kept, in the order of both the old and the new
+        # children; any other is replaced by its fresh node
+        kept = {}
+        last_row = -1
+        for fresh in fresh_children:
+            child = self.nodes.get(fresh.record_id)
+            if (
+                child is not None
+                and old_rows.get(id(child), -1) > last_row
+                and child.assembly == fresh.assembly
+            ):
+                kept[id(fresh)] = child
+                last_row = old_rows[id(child)]
+        kept_ids = {id(child) for child in kept.values()}
+
+        row = len(old_children)
+        while row > 0:
+            row -= 1
+            if id(old_children[row]) in kept_ids:
+                continue
+            last = row
+            while row > 0 and id(old_children[row - 1]) not in kept_ids:
+                row -= 1
+            self.beginRemoveRows(parent, row, last)
+            removed = slice(row, last + 1)
+            self.drop_nodes(old_children[removed])
+            del old_children[removed]
+            self.number_rows(old_children, row)
+            self.endRemoveRows()
+
+        if node.children is None:
+            node.children = old_children
+        row = 0
+        while row < len(fresh_children):
+            fresh = fresh_children[row]
+            child = kept.get(id(fresh))
+            if child is not None:
+                self.update_child(child, fresh)
+                row += 1
+                continue
+            last = row
+            while (
+                last + 1 < len(fresh_children)
+                and id(fresh_children[last + 1]) not in kept
+            ):
+                last += 1
+            added = fresh_children[slice(row, last + 1)]
+            for fresh in added:
+                fresh.parent = node
+            self.beginInsertRows(parent, row, last)
+            node.children[row:row] = added
+            self.number_rows(node.children, row)
+            self.add_nodes(added)
+            self.endInsertRows()
+            row = last + 1
+
+    def update_child(self, child: AssemblyNode, fresh: AssemblyNode) -> None:
+        """
+        Bring a node kept by 'refresh_children' up to date.
+
+        Parameters:
+            child (AssemblyNode): the node kept.
+            fresh (AssemblyNode): the node just read for the same Item.
+        """
+        if fresh.children is not None and child.children:
+            # no assemblies below it now
+            self.beginRemoveRows(self.get_index(child), 0, len(child.children) - 1)
+            self.drop_nodes(child.children)
+            child.children = []
+            self.endRemoveRows()
+        elif fresh.children is None and child.children == []:
+            # assemblies below it now, read when it is expanded
+            child.children = None
+        elif child.values == fresh.values:
+            return
+        self.set_node_values(child, fresh.values)
+
+    @staticmethod
+    def number_rows(children: list[AssemblyNode], start: int) -> None:
+        """
+        Set the row of each node from a row on.
+
+        Parameters:
+            children (list[AssemblyNode]): the children of a node.
+            start (int): the first row moved by an insert or removal.
+        """
+        for row in range(start, len(children)):
+            children[row].row = row
+
+    def get_index(self, node: AssemblyNode) -> QModelIndex:
+        """
+        Get the index of a node.
+
+        Parameters:
+            node (AssemblyNode): the node.
+
+        Returns:
+            (QModelIndex) the index of the first column, invalid for
+                the root.
+        """
+        if node is self.root or node.parent is None:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def refresh_assemblies(self, assemblies: list[str]) -> None:
+        """
+        Bring the levels showing assemblies up to date.
+
+        Used after Items with the assemblies are added, deleted or
+        moved; only the level of the tree holding each assembly is
+        read, if it has been read before.
+
+        Parameters:
+            assemblies (list[str]): the assemblies written.
+        """
+        refreshed = []
+        for assembly in assemblies:
+            node = self.find_parent_node(assembly)
+            if node is not None and not any(node is done for done in refreshed):
+                self.refresh_children(node)
+                refreshed.append(node)
+
+    def set_node_values(self, node: AssemblyNode, values: list[str]) -> None:
+        """
+        Change the display values of a node in place.
+
+        Parameters:
+            node (AssemblyNode): the node to change.
+            values (list[str]): the new display value of each column.
+        """
+        node.values = values
+        self.dataChanged.emit(
+            self.createIndex(node.row, 0, node),
+            self.createIndex(node.row, len(self.column_names) - 1, node),
+        )
+
+    def index(
+        self, row: int, column: int, parent: QModelIndex = QModelIndex()
+    ) -> QModelIndex:
+        """Get the index of a row and column under a parent."""
+        children = self.get_node(parent).children
+        if not children or not 0 <= row < len(children):
+            return QModelIndex()
+        if not 0 <= column < len(self.column_names):
+            return QModelIndex()
+        return self.createIndex(row, column, children[row])
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        """Get the parent index of an index."""
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self.root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Get the number of child rows already read under a parent."""
+        if parent.column() > 0:
+            return 0
+        children = self.get_node(parent).children
+        return len(children) if children else 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Get the number of columns."""
+        return len(self.column_names)
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """Check if a node has children, read or not."""
+        if parent.column() > 0:
+            return False
+        children = self.get_node(parent).children
+        return children is None or len(children) > 0
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        """Check if the children of a node have not been read."""
+        return self.get_node(parent).children is None
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        """Read the children of a node."""
+        node = self.get_node(parent)
+        if node.children is not None:
+            return
+        children = self.read_children(node)
+        if not children:
+            node.children = []
+            return
+        self.beginInsertRows(parent, 0, len(children) - 1)
+        node.children = children
+        self.add_nodes(children)
+        self.endInsertRows()
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        """Get the display value or alignment of a cell."""
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return index.internalPointer().values[index.column()]
+        if (
+            role == Qt.ItemDataRole.TextAlignmentRole
+            and index.column() in self.CENTERED_COLUMNS
+        ):
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        """Get the column names."""
+        if (
+            orientation == Qt.Orientation.Horizontal
+            and role == Qt.ItemDataRole.DisplayRole
+            and 0 <= section < len(self.column_names)
+        ):
+            return self.column_names[section]
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        """Tree entries are selectable but not editable."""
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
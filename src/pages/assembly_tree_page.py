@@ -5,22 +5,39 @@ File:       assembly_tree_page.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.0.0
+Version:    1.11.0
 """
 
-from typing import Any
+from typing import Any, Callable
 
 from lbk_library import DataFile as PartsFile
 from lbk_library.gui import Dialog
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QTreeWidget, QTreeWidgetItem
 
-from dialogs import ItemDialog
-from elements import Condition, Item, ItemSet, Part
+from elements import (
+    UPDATED,
+    ChangeEvent,
+    ItemView,
+    get_change_bus,
+)
+from qt_compat.QtCore import QModelIndex, Qt
+from qt_compat.QtWidgets import QTreeView
 
-file_version = "1.0.0"
+from .assembly_tree_model import AssemblyNode, AssemblyTreeModel
+
+file_version = "1.11.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Changed to a lazily loaded tree model and view",
+    "1.2.0": "Added 'set_tree' for background loading",
+    "1.3.0": "Read the tree only when it is shown",
+    "1.4.0": "Refresh through the refresh scheduler",
+    "1.5.0": "Patch the nodes from the change bus",
+    "1.6.0": "Patch added, deleted and moved Items in place",
+    "1.7.0": "Import the ItemDialog when first clicked",
+    "1.8.0": "Changed library 'PyQt6' to 'PySide6' through 'qt_compat'",
+    "1.9.0": "Open the ItemDialog through the dialog pool",
+    "1.10.0": "Removed the unused 'set_condition_description'",
+    "1.11.0": "Removed the unused 'set_part_description'",
 }
 
 
@@ -39,100 +56,166 @@ class AssemblyTreePage:
     ]
     """ Names of the tree columns."""
 
-    def __init__(self, tree: QTreeWidget, parts_file: PartsFile) -> None:
+    def __init__(self, tree: QTreeView, parts_file: PartsFile) -> None:
         """
-        Initialize the assembly tree widget.
+        Initialize the assembly tree view.
 
         Parameters:
-            tree (QTreeWidget): the tree to be filled with info
+            tree (QTreeView): the tree to be filled with info
             parts_file (PartsFile):  database reference for the parts file.
         """
         super().__init__()
 
         self.parts_file: PartsFile = parts_file
         self.tree = tree
-        self.resize_columns()
+        self.model = AssemblyTreeModel(
+            self.parts_file, AssemblyTreePage.COL_NAMES, self.format_row, self.tree
+        )
+        self.tree.setModel(self.model)
+        self.tree.setUniformRowHeights(True)
         self.set_tree_headers()
+        self.stale = True
+        """True if the tree must be read before it is shown."""
+        self.refresh_scheduler = None
+        """The scheduler merging refresh requests, set when registered."""
+        self.dialog_pool = None
+        """The pool opening the dialogs, set when registered."""
+
+        # writes to the items and the names they show patch the tree
+        get_change_bus(self.parts_file).subscribe(
+            self.parts_file_changed, ("items", "parts", "conditions")
+        )
 
-        if self.parts_file.sql_is_connected():
-            self.update_tree()
-
-        self.tree.itemClicked.connect(self.action_item_clicked)
+        self.tree.clicked.connect(self.action_item_clicked)
 
-    def update_tree(self) -> None:
+    def update_tree(self) -> AssemblyTreeModel:
         """
         Update the listing after changes to the underlying data.
 
+        Only the top level assemblies are read; the assemblies below
+        are read as the tree is expanded.
+
         Returns:
-            dict[str, QTreeWidgetItem] The revised set of items in the tree.
+            (AssemblyTreeModel) The reloaded tree model.
         """
-        self.tree.clear()  # clear the existing tree
+        self.model.load()
+        self.stale = False
+        self.resize_columns()
+        return self.model
+
+    def mark_stale(self) -> None:
+        """Note the items have changed; the tree is read when next shown."""
+        self.stale = True
 
-        # display the revised item set
-        item_set = ItemSet(self.parts_file, None, None, "assembly")
+    def refresh_if_stale(self) -> None:
+        """Read the tree if it is out of date and a parts file is open."""
+        if self.stale and self.parts_file.sql_is_connected():
+            self.update_tree()
 
-        return self.fill_tree_widget(item_set)
+    def request_refresh(self) -> None:
+        """
+        Refresh the tree after a change.
 
-    def fill_tree_widget(self, item_set: ItemSet) -> dict[str, list[Item]]:
+        With a refresh scheduler the refresh is merged with the other
+        requests of the same burst of changes, otherwise it is done now.
         """
-        Insert the item_set into the Assembly Tree display.
+        if self.refresh_scheduler is not None:
+            self.refresh_scheduler.invalidate(self)
+        else:
+            self.mark_stale()
+            self.refresh_if_stale()
 
-        The item set is expected to be sorted in assembly order.
+    def parts_file_changed(self, event: ChangeEvent) -> None:
+        """
+        Bring the tree up to date after a write to the parts file.
 
-        Each member of the item set has the part description included,
-        the parent assembly deteremined, and is inserted into the tree
-        with appropriate text alignment.
+        An Item edited in place, and the Items showing a Part or
+        Condition written, have their nodes read again. An Item added,
+        deleted or given a new assembly has the levels of the tree
+        holding its old and new assembly read again, keeping the rest
+        of the tree as the user left it. Nothing is done while the tree
+        is stale, as it is read in full when next shown.
 
         Parameters:
-            item_set (ItemSet): the set of items to display in assembly
-                order.
-        Returns:
-            dict[str, QTreeWidgetItem] The set of items in the tree.
+            event (ChangeEvent): the write published on the change bus.
         """
-        tree_items = {}  # the set of tree widget items
-        for item in item_set:
-            item_properties = self.set_condition_description(item.get_properties())
-            item_properties = self.set_part_description(item.get_properties())
-            item_properties = self.set_installed_entry(item_properties)
-            item_values = self.set_item_values(item_properties)
-            parent = self.find_parent_assy(item_properties["assembly"], tree_items)
-            tree_items = self.add_item_to_tree(
-                item_properties["assembly"], item_values, parent, tree_items
-            )
-        self.resize_columns()
-        return tree_items
+        if self.stale or not self.parts_file.sql_is_connected():
+            return
+        if event.table == "items":
+            if event.action == UPDATED and "assembly" not in event.columns:
+                self.refresh_node(self.model.find_node(event.record_id))
+            else:
+                assemblies = [
+                    assembly
+                    for assembly in (
+                        event.old_values.get("assembly"),
+                        event.values.get("assembly"),
+                    )
+                    if assembly is not None
+                ]
+                self.model.refresh_assemblies(assemblies)
+        elif event.table == "parts":
+            if event.action != UPDATED or {"part_number", "description"} & set(
+                event.columns
+            ):
+                part_numbers = {
+                    event.values.get("part_number"),
+                    event.old_values.get("part_number"),
+                }
+                self.refresh_nodes(lambda node: node.values[2] in part_numbers)
+        elif event.action != UPDATED or "condition" in event.columns:
+            conditions = {
+                event.values.get("condition"),
+                event.old_values.get("condition"),
+            }
+            self.refresh_nodes(lambda node: node.values[5] in conditions)
+
+    def refresh_nodes(self, predicate: Callable[[AssemblyNode], bool]) -> None:
+        """
+        Read the Items of the nodes read that match a test again.
+
+        Parameters:
+            predicate (Callable[[AssemblyNode], bool]): the test.
+        """
+        for node in self.model.find_nodes(predicate):
+            self.refresh_node(node)
 
-    def set_condition_description(
-        self, item_properties: dict[str, Any]
-    ) -> dict[str, Any]:
+    def refresh_node(self, node: AssemblyNode | None) -> None:
         """
-        Add the condition description to the item_properties.
+        Read the Item of a node again.
 
         Parameters:
-            item_properties: dict[str, Any]: the set of properties to
-                display for the current item entry.
+            node (AssemblyNode | None): the node, None if the Item has
+                not been read.
+        """
+        if node is None:
+            return
+        for row in ItemView(self.parts_file, "record_id", node.record_id):
+            self.model.set_node_values(node, self.format_row(row))
 
-        Returns:
-            The updated set of properties.
+    def set_tree(self, root: AssemblyNode) -> None:
         """
-        condition = Condition(self.parts_file, item_properties["condition"])
-        item_properties["condition"] = condition.get_condition()
-        return item_properties
+        Show a tree read in the background.
 
-    def set_part_description(self, item_properties: dict[str, Any]) -> dict[str, Any]:
+        Parameters:
+            root (AssemblyNode): the root node read by the model's
+                'read_root'.
+        """
+        self.model.set_root(root)
+        self.stale = False
+        self.resize_columns()
+
+    def format_row(self, row: dict[str, Any]) -> list[str]:
         """
-        Add the part description to the item_properties.
+        Convert an ItemView row to the tree column values.
 
         Parameters:
-            item_properties: dict[str, Any]: the set of properties to
-                display for the current item entry.
+            row (dict[str, Any]): the ItemView row of the item.
 
         Returns:
-            The updated set of properties.
+            list[str]: The column values as strings.
         """
-        part = Part(self.parts_file, item_properties["part_number"], "part_number")
-        item_properties["description"] = part.get_description()
-        return item_properties
+        return self.set_item_values(self.set_installed_entry(dict(row)))
 
     def set_installed_entry(self, item_properties: dict[str, Any]) -> dict[str, Any]:
         """
@@ -174,90 +257,18 @@ class AssemblyTreePage:
         ]
         return values
 
-    def find_parent_assy(
-        self, assembly: str, tree_items: dict[str, QTreeWidgetItem]
-    ) -> str | None:
-        """
-         Find the parent assembly of the current assembly.
-
-        The tree is keyed on the item assembly. The top level tree items
-         normally have a single character assembly value. Second, third,
-         forth, ... levels have the corresponding number of characters in
-         the assembly. The parent of the current assembly is the
-         corresponding next level up, so the parent of assembly AC will
-         be A, for ACRGE, parent will be ACRG. If the corresponding upper
-         level does not exist, move up through the levels until a
-         corresponding level is found. If no parent is found, assign the
-         assembly as a top level. (Generally, this means there is an
-         error in the assignment of the assembly.)
-
-         Parameters:
-             assembly (str): the current assembly.
-             tree_items (dict[str, QTreeWidgetItem]): the set of tree
-                 widget items.
-         Returns:
-             (str) the parent assembly of the current assembly.
-        """
-        if len(assembly) == 1:
-            parent = None
-        else:
-            parent = assembly[:-1]
-            finished = False
-            i = 0
-            while not finished:
-                i += 1
-                if i >= len(assembly):
-                    parent = None
-                    break
-                if parent in tree_items.keys():
-                    finished = True
-                else:
-                    parent = parent[:-1]
-        return parent
-
-    def add_item_to_tree(
-        self,
-        assembly,
-        item_values: list[str],
-        parent: str,
-        tree_items: dict[str, QTreeWidgetItem],
-    ) -> dict[str, QTreeWidgetItem]:
-        """
-        Add the current item to the tree.
-
-        Parameters:
-            assembly (str): the current assembly.
-            item_values (list[str]): item values in column order to
-                be added.
-            parent (str) the parent assembly of the current assembly.
-            tree_items (dict[str, QTreeWidgetItem]): the set of tree
-                widget items.
-
-        Returns:
-            tree_items (dict[str, QTreeWidgetItem]): the updated set of
-                tree widget items.
-        """
-        if parent is None:
-            tree_items[assembly] = QTreeWidgetItem(self.tree, item_values)
-        else:
-            tree_items[assembly] = QTreeWidgetItem(tree_items[parent], item_values)
-
-        # set center alignment for qty used, condition and installed cols
-        tree_items[assembly].setTextAlignment(4, Qt.AlignmentFlag.AlignCenter)
-        tree_items[assembly].setTextAlignment(5, Qt.AlignmentFlag.AlignCenter)
-        tree_items[assembly].setTextAlignment(6, Qt.AlignmentFlag.AlignCenter)
-        return tree_items
-
     def clear_tree(self):
         """Clear the assembly listing tree display."""
-        self.tree.clear()
+        self.model.clear()
+        self.stale = True
 
     def resize_columns(self) -> None:
         """
         Resize the columns to match the size of the entries.
 
         The last (remarks) column is skipped as it is set to
-        automatically stretch or shrink to fill remaining space.
+        automatically stretch or shrink to fill remaining space. Only
+        the rows already read are measured.
         """
         i = 0
         while i < len(AssemblyTreePage.COL_NAMES) - 2:
@@ -268,37 +279,31 @@ class AssemblyTreePage:
         """
         Set the tree headers.
 
-        The header names are set, aligned to center of column, and
-        initial column widths are set.
+        The header names are provided by the model, aligned to center
+        of column, and initial column widths are set.
         """
-        self.tree.setColumnCount(len(AssemblyTreePage.COL_NAMES))
-        self.tree.setHeaderLabels(AssemblyTreePage.COL_NAMES)
-        i = 0
-        while i < len(AssemblyTreePage.COL_NAMES):
-            self.tree.header().setDefaultAlignment(Qt.AlignmentFlag.AlignHCenter)
-            i += 1
+        self.tree.header().setDefaultAlignment(Qt.AlignmentFlag.AlignHCenter)
         self.resize_columns()
 
-    def action_item_clicked(self, tree_item: QTreeWidgetItem, column: int) -> str:
+    def action_item_clicked(self, index: QModelIndex) -> str:
         """
         Display the Item Editing Dialog.
 
         Parameters:
-            tree_item (QTreeWidgetItem): the Item clicked
-            column (int): the column clicked
+            index (QModelIndex): the model index of the Item clicked
 
         Returns:
             (str): the type of dialog executed (primarily for testing).
         """
-        item_number_column = 1
-        dialog = ItemDialog(
-            self.tree,
-            self.parts_file,
-            tree_item.text(item_number_column),
-            Dialog.EDIT_ELEMENT,
-        )
+        record_id = str(self.model.get_record_id(index))
+        if self.dialog_pool is not None:
+            return self.dialog_pool.open_dialog(
+                "ItemDialog", record_id, Dialog.EDIT_ELEMENT
+            )
+        from dialogs import ItemDialog
+
+        dialog = ItemDialog(self.tree, self.parts_file, record_id, Dialog.EDIT_ELEMENT)
         dialog.open()
-        self.update_tree()
         return dialog
 
     def get_parts_file(self):
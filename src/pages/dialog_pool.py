@@ -0,0 +1,124 @@
+"""
+Reuse the element editing dialogs of the main window.
+
+File:       dialog_pool.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file LICENSE
+Version:    1.0.0
+"""
+
+from importlib import import_module
+from typing import Any
+
+from lbk_library import DataFile as PartsFile
+from lbk_library.gui import Dialog
+
+from qt_compat.QtCore import QObject, Qt
+from qt_compat.QtWidgets import QMainWindow
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Initial release",
+}
+
+
+class DialogPool(QObject):
+    """
+    Keep one dialog of each kind for the main window to open again.
+
+    The first request for a dialog builds it; the following requests
+    rebind the same dialog to the element asked for, so opening a
+    dialog again costs only the filling of its fields, not the
+    building of its widgets. A dialog still open when another of its
+    kind is requested is left alone and a separate dialog, deleted
+    when closed, is opened instead.
+
+    The dialog classes are named, not imported, so a dialog module is
+    still loaded only when its dialog is first opened.
+    """
+
+    def __init__(self, parts_file: PartsFile, parent: QMainWindow) -> None:
+        """
+        Initialize an empty pool.
+
+        Parameters:
+            parts_file (PartsFile): reference to the parts file edited.
+            parent (QMainWindow): the main window, owner of the pool and
+                parent of the dialogs.
+        """
+        super().__init__(parent)
+        self.parts_file: PartsFile = parts_file
+        self.dialogs: dict[str, Dialog] = {}
+        """The dialog kept of each dialog class name."""
+
+    def register(self, page: Any) -> None:
+        """
+        Have a page open its dialogs through the pool.
+
+        Parameters:
+            page (Any): a page with a 'dialog_pool' attribute.
+        """
+        page.dialog_pool = self
+
+    def open_dialog(self, name: str, record_id: Any, operation: int) -> Dialog:
+        """
+        Open a dialog on an element.
+
+        Parameters:
+            name (str): the dialog class, one of the 'dialogs' package.
+            record_id (Any): the key of the element to show, as taken by
+                the dialog.
+            operation (int): Dialog.ADD_ELEMENT or Dialog.EDIT_ELEMENT.
+
+        Returns:
+            (Dialog) the dialog opened.
+        """
+        dialog = self.dialogs.get(name)
+        try:
+            busy = dialog is not None and dialog.isVisible()
+        except RuntimeError:
+            # the dialog has been deleted
+            dialog = None
+            busy = False
+        if dialog is None:
+            dialog = self.build_dialog(name, record_id, operation)
+            self.dialogs[name] = dialog
+        elif busy:
+            dialog = self.build_dialog(name, record_id, operation)
+            dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        else:
+            dialog.rebind(record_id, operation)
+        dialog.open()
+        return dialog
+
+    def build_dialog(self, name: str, record_id: Any, operation: int) -> Dialog:
+        """
+        Build a dialog, importing its module on first use.
+
+        Parameters:
+            name (str): the dialog class.
+            record_id (Any): the key of the element to show.
+            operation (int): Dialog.ADD_ELEMENT or Dialog.EDIT_ELEMENT.
+
+        Returns:
+            (Dialog) the dialog built.
+        """
+        dialog_class = getattr(import_module("dialogs"), name)
+        return dialog_class(self.parent(), self.parts_file, record_id, operation)
+
+    def clear(self) -> None:
+        """
+        Drop the dialogs kept, as when the parts file is changed.
+
+        A dialog still open is deleted when it is closed.
+        """
+        for dialog in self.dialogs.values():
+            try:
+                if dialog.isVisible():
+                    dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+                else:
+                    dialog.deleteLater()
+            except RuntimeError:
+                pass
+        self.dialogs = {}
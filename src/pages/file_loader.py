@@ -0,0 +1,182 @@
+"""
+Read the page contents of a newly opened parts file in the background.
+
+File:       file_loader.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file LICENSE
+Version:    1.4.0
+"""
+
+import threading
+
+from elements import ReadOnlyPartsFile
+from qt_compat.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from .assembly_tree_model import AssemblyTreeModel
+from .orders_list_model import OrdersListModel
+from .parts_list_model import PartsListModel
+
+file_version = "1.4.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Read only the pages given a model",
+    "1.2.0": "Changed library 'PyQt6' to 'PySide6' through 'qt_compat'",
+    "1.3.0": "Report any error of a read through 'failed'",
+    "1.4.0": "Moved 'ReadOnlyPartsFile' to 'elements'",
+}
+
+
+class FileLoadTask(QRunnable):
+    """Run a FileLoader on a thread pool thread."""
+
+    def __init__(self, loader: "FileLoader") -> None:
+        """
+        Build the task.
+
+        Parameters:
+            loader (FileLoader): the loader to run.
+        """
+        super().__init__()
+        self.loader = loader
+
+    def run(self) -> None:
+        """Read the page contents."""
+        self.loader.run()
+
+
+class FileLoader(QObject):
+    """
+    Read the contents of the pages of a parts file on a worker thread.
+
+    The top level assemblies, the parts listing and the first page of
+    orders, for each page given a model, are read in that order through
+    a read only connection of the loader's own. Each is handed over by
+    a signal as soon as it is read, so the pages fill in while the
+    window stays responsive.
+    Cancelling aborts the query running at the time.
+    """
+
+    tree_loaded = Signal(object)
+    """The root AssemblyNode of the assembly tree has been read."""
+
+    parts_loaded = Signal(list)
+    """The parts listing rows have been read."""
+
+    orders_loaded = Signal(int, list)
+    """The number of orders and the first page of orders have been read."""
+
+    progress = Signal(int)
+    """The number of reads done."""
+
+    finished = Signal()
+    """All reads are done."""
+
+    canceled = Signal()
+    """The reads were stopped by 'cancel'."""
+
+    failed = Signal(str)
+    """The reads were stopped by an error, with its message."""
+
+    def __init__(
+        self,
+        filepath: str,
+        tree_model: AssemblyTreeModel = None,
+        parts_model: PartsListModel = None,
+        orders_model: OrdersListModel = None,
+        parent: QObject = None,
+    ) -> None:
+        """
+        Set up the loader.
+
+        The models are used only to read the rows in their current
+        order; they are changed by the receivers of the signals. A page
+        without a model is not read.
+
+        Parameters:
+            filepath (str): the path to the parts file.
+            tree_model (AssemblyTreeModel): the assembly tree model.
+            parts_model (PartsListModel): the parts listing model.
+            orders_model (OrdersListModel): the orders listing model.
+            parent (QObject): the owner of the loader.
+        """
+        super().__init__(parent)
+        self.filepath = filepath
+        self.steps = []
+        """The read and the result handler of each page read."""
+        if tree_model is not None:
+            self.steps.append((tree_model.read_root, self.tree_loaded.emit))
+        if parts_model is not None:
+            self.steps.append((parts_model.read_rows, self.parts_loaded.emit))
+        if orders_model is not None:
+            self.steps.append(
+                (
+                    orders_model.read_first_page,
+                    lambda page: self.orders_loaded.emit(*page),
+                )
+            )
+        self.parts_file: ReadOnlyPartsFile = None
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+
+    def number_steps(self) -> int:
+        """
+        Get the number of reads, for the progress indicator.
+
+        Returns:
+            (int) the number of pages read.
+        """
+        return len(self.steps)
+
+    def start(self, thread_pool: QThreadPool = None) -> None:
+        """
+        Start the reads on a thread pool.
+
+        Parameters:
+            thread_pool (QThreadPool): the pool to run on, default is
+                the global pool.
+        """
+        if thread_pool is None:
+            thread_pool = QThreadPool.globalInstance()
+        thread_pool.start(FileLoadTask(self))
+
+    def cancel(self) -> None:
+        """Stop the reads, aborting the query running."""
+        self.cancel_event.set()
+        parts_file = self.parts_file
+        if parts_file is not None:
+            parts_file.interrupt()
+
+    def is_canceled(self) -> bool:
+        """Check if the reads have been cancelled."""
+        return self.cancel_event.is_set()
+
+    def is_running(self) -> bool:
+        """Check if the reads are still going on."""
+        return not self.done_event.is_set()
+
+    def run(self) -> None:
+        """Read the page contents, on the worker thread."""
+        try:
+            self.parts_file = ReadOnlyPartsFile(self.filepath)
+            for step, (read, emit) in enumerate(self.steps, 1):
+                if self.is_canceled():
+                    break
+                result = read(self.parts_file)
+                if self.is_canceled():
+                    break
+                emit(result)
+                self.progress.emit(step)
+        except Exception as error:
+            # a worker thread has no caller to raise to
+            if not self.is_canceled():
+                self.failed.emit(str(error))
+                return
+        finally:
+            if self.parts_file is not None:
+                self.parts_file.sql_close()
+            self.done_event.set()
+        if self.is_canceled():
+            self.canceled.emit()
+        else:
+            self.finished.emit()
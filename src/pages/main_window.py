@@ -5,46 +5,53 @@ File:       main_window.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2022 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.0.0
+Version:    1.9.0
 """
 
 import os
 from pathlib import Path
+from typing import Any
 
 from lbk_library import DataFile as PartsFile
 from lbk_library.gui import Dialog
-from PyQt6 import uic
-from PyQt6.QtCore import QSettings  # QPoint,
-from PyQt6.QtGui import QMoveEvent, QResizeEvent
-from PyQt6.QtWidgets import (
+
+from elements import get_identity_map, get_lookup_cache, get_option_lists
+from forms import Ui_MainWindow
+from qt_compat.QtCore import QSettings  # QPoint,
+from qt_compat.QtGui import QMoveEvent, QResizeEvent
+from qt_compat.QtWidgets import (
     QFileDialog,
     QMainWindow,
-    QTableWidget,
+    QProgressDialog,
+    QTableView,
     QTabWidget,
-    QTreeWidget,
-)
-
-from dialogs import (  # ChangePartNumberDialog,; EditStructureDialog,
-    AssemblyListDialog,
-    EditConditionsDialog,
-    EditSourcesDialog,
-    ItemDialog,
-    OrderDialog,
-    PartDialog,
+    QTreeView,
 )
 
 from .assembly_tree_page import AssemblyTreePage
+from .dialog_pool import DialogPool
+from .file_loader import FileLoader
 from .orders_list_page import OrdersListPage
 from .parts_file_definition import table_definition
 from .parts_list_page import PartsListPage
+from .refresh_scheduler import RefreshScheduler
 
-file_version = "1.0.0"
+file_version = "1.9.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Read the pages of an opened file in the background",
+    "1.2.0": "Read each page only when its tab is shown",
+    "1.3.0": "Merge page refreshes through the refresh scheduler",
+    "1.4.0": "The pages follow the dialog writes on the change bus",
+    "1.5.0": "Build the window from the compiled form",
+    "1.6.0": "Import each dialog when its action is first used",
+    "1.7.0": "Changed library 'PyQt6' to 'PySide6' through 'qt_compat'",
+    "1.8.0": "Discard the option lists with the parts file",
+    "1.9.0": "Reuse the element dialogs through a dialog pool",
 }
 
 
-class MainWindow(QMainWindow):
+class MainWindow(QMainWindow, Ui_MainWindow):
     """Build the Main Window for the Parts Tracker Program."""
 
     def __init__(self) -> None:
@@ -56,12 +63,19 @@ class MainWindow(QMainWindow):
         """The parts file of the set of parts information."""
         self.__number_recent_files = 4
         """ The number of recent files listed in the recent Files menu."""
-
-        self.form = uic.loadUi("src/forms/main_window.ui", self)
+        self.file_loader: FileLoader = None
+        """The background reader of the opened file, None when idle."""
+        self.load_progress: QProgressDialog = None
+        """The progress indicator of the background reader."""
+        self.loading_page = None
+        """The page being read by the background reader."""
+
+        self.setupUi(self)
+        self.form = self
         self.tab_widget: QTabWidget
-        self.assembly_tree_widget: QTreeWidget = QTreeWidget()
-        self.orders_list_widget: QTableWidget = QTableWidget()
-        self.parts_list_widget: QTableWidget = QTableWidget()
+        self.assembly_tree_widget: QTreeView = QTreeView()
+        self.orders_list_widget: QTableView = QTableView()
+        self.parts_list_widget: QTableView = QTableView()
 
         # set configuration
         if not len(self.config.allKeys()):
@@ -189,6 +203,7 @@ class MainWindow(QMainWindow):
         if not self.config.value("recent_files/file1") == "":
             # use first filename to open the parts file
             self.parts_file.sql_connect(self.config.value("recent_files/file1"))
+            get_lookup_cache(self.parts_file).load()
             self.set_menus_enabled(True)
         else:
             self.set_menus_enabled(False)
@@ -223,7 +238,21 @@ class MainWindow(QMainWindow):
         )
         self.part_list = PartsListPage(self.parts_list_widget, self.parts_file)
         self.order_list = OrdersListPage(self.orders_list_widget, self.parts_file)
+        self.pages = [self.assembly_tree, self.part_list, self.order_list]
+        """The page of each tab, in tab order."""
+        self.refresh_scheduler = RefreshScheduler(self.is_page_shown, self)
+        """Merges the page refreshes of a burst of changes."""
+        for page in self.pages:
+            self.refresh_scheduler.register(page)
+        self.dialog_pool = DialogPool(self.parts_file, self)
+        """Keeps the Item, Part and Order dialogs to open again."""
+        for page in self.pages:
+            self.dialog_pool.register(page)
+
+        # only the page shown is read
+        self.tab_widget.currentChanged.connect(self.tab_changed_action)
         self.tab_widget.setCurrentIndex(0)
+        self.show_current_page()
 
     def set_recent_files_menu(self) -> None:
         """
@@ -319,16 +348,181 @@ class MainWindow(QMainWindow):
         if self.parts_file.sql_is_connected():  # if open, close it
             self.parts_file.sql_close()
 
+        get_identity_map(self.parts_file).clear()
+        get_option_lists(self.parts_file).invalidate()
+        self.dialog_pool.clear()
         self.parts_file.sql_connect(filepath)
+        get_lookup_cache(self.parts_file).load()
 
-        # update the window
+        # update the window; the assembly page is filled in the
+        # background, the others when their tabs are shown
         if self.parts_file.sql_is_connected():
             self.set_menus_enabled(True)
-            self.assembly_tree.update_tree()
-            self.part_list.update_table()
-            self.order_list.update_table()
+            self.start_file_loader(filepath, self.assembly_tree)
             self.form.tab_widget.setCurrentIndex(0)
 
+    def start_file_loader(self, filepath: str, page: Any) -> None:
+        """
+        Read a page of an opened file in the background.
+
+        All pages are emptied and marked stale; the page given is filled
+        when its read arrives, so the window stays responsive while a
+        large file is read. A progress dialog, shown only if the read
+        takes a while, allows opening the file to be cancelled.
+
+        Parameters:
+            filepath (str): the path to the opened parts file.
+            page (Any): the page to read, one of 'self.pages'.
+        """
+        self.stop_file_loader()
+        self.refresh_scheduler.discard()
+        self.assembly_tree.clear_tree()
+        self.part_list.clear_table()
+        self.order_list.clear_table()
+
+        loader = FileLoader(
+            filepath,
+            self.assembly_tree.model if page is self.assembly_tree else None,
+            self.part_list.model if page is self.part_list else None,
+            self.order_list.model if page is self.order_list else None,
+        )
+        loader.tree_loaded.connect(self.file_tree_loaded)
+        loader.parts_loaded.connect(self.file_parts_loaded)
+        loader.orders_loaded.connect(self.file_orders_loaded)
+        loader.finished.connect(self.file_load_finished)
+        loader.failed.connect(self.file_load_failed)
+
+        progress = QProgressDialog(
+            "Reading " + os.path.basename(filepath),
+            "Cancel",
+            0,
+            loader.number_steps(),
+            self,
+        )
+        progress.setWindowTitle("Opening Parts File")
+        progress.setMinimumDuration(500)
+        progress.setValue(0)
+        progress.canceled.connect(self.file_load_cancel_action)
+        loader.progress.connect(progress.setValue)
+
+        self.file_loader = loader
+        self.loading_page = page
+        self.load_progress = progress
+        loader.start()
+
+    def stop_file_loader(self) -> None:
+        """Cancel the background reads, if any are running."""
+        if self.file_loader is not None:
+            self.file_loader.cancel()
+            self.end_file_loader()
+
+    def end_file_loader(self) -> None:
+        """Forget the background reader and remove its progress dialog."""
+        self.file_loader = None
+        self.loading_page = None
+        if self.load_progress is not None:
+            # closing the dialog would signal 'canceled'
+            self.load_progress.canceled.disconnect(self.file_load_cancel_action)
+            self.load_progress.reset()
+            self.load_progress.deleteLater()
+            self.load_progress = None
+
+    def is_file_loading(self) -> bool:
+        """
+        Check if the pages are being read in the background.
+
+        Returns:
+            (bool) True if the background reads are running.
+        """
+        return self.file_loader is not None
+
+    def file_tree_loaded(self, root) -> None:
+        """Show the assembly tree read in the background."""
+        if self.sender() is self.file_loader:
+            self.assembly_tree.set_tree(root)
+
+    def file_parts_loaded(self, rows: list[tuple]) -> None:
+        """Show the parts listing read in the background."""
+        if self.sender() is self.file_loader:
+            self.part_list.set_rows(rows)
+
+    def file_orders_loaded(self, total_rows: int, summaries: list) -> None:
+        """Show the first page of orders read in the background."""
+        if self.sender() is self.file_loader:
+            self.order_list.set_first_page(total_rows, summaries)
+
+    def file_load_finished(self) -> None:
+        """Finish the background reads."""
+        if self.sender() is self.file_loader:
+            self.end_file_loader()
+
+    def file_load_failed(self, message: str) -> None:
+        """
+        Read the pages on the gui thread if the background reads fail.
+
+        Parameters:
+            message (str): the error stopping the background reads.
+        """
+        if self.sender() is self.file_loader:
+            page = self.loading_page
+            self.end_file_loader()
+            page.refresh_if_stale()
+
+    def get_current_page(self) -> Any:
+        """
+        Get the page of the tab shown.
+
+        Returns:
+            (Any) the page, one of 'self.pages'.
+        """
+        return self.pages[self.tab_widget.currentIndex()]
+
+    def is_page_shown(self, page: Any) -> bool:
+        """
+        Check if a page is on screen and may be read.
+
+        Parameters:
+            page (Any): one of 'self.pages'.
+
+        Returns:
+            (bool) True if the page's tab is shown and the page is not
+                being read in the background.
+        """
+        return page is self.get_current_page() and page is not self.loading_page
+
+    def show_current_page(self) -> None:
+        """Read the page of the tab shown if it is stale."""
+        page = self.get_current_page()
+        if self.is_page_shown(page):
+            page.refresh_if_stale()
+
+    def refresh_pages(self, *pages: Any) -> None:
+        """
+        Report a change to the parts file affecting pages.
+
+        The pages are marked stale at once; the page shown is read once
+        control returns to the event loop, however many changes are
+        reported before then, the others when they are next shown.
+
+        Parameters:
+            pages (Any): the pages affected by the change.
+        """
+        self.refresh_scheduler.invalidate(*pages)
+
+    def tab_changed_action(self, index: int) -> None:
+        """
+        Read the page of a newly shown tab if it is stale.
+
+        Parameters:
+            index (int): the tab shown.
+        """
+        self.show_current_page()
+
+    def file_load_cancel_action(self) -> None:
+        """Stop opening a file, leaving no file open."""
+        self.stop_file_loader()
+        self.file_close_action()
+
     def file_open_action(self) -> None:
         """
         Open a Parts file.
@@ -341,9 +535,15 @@ class MainWindow(QMainWindow):
 
     def file_close_action(self) -> None:
         """Close the current parts file file."""
+        self.stop_file_loader()
+        self.refresh_scheduler.discard()
         # if a file is open, then close it
         if self.parts_file.sql_is_connected():
             self.parts_file.sql_close()
+        get_lookup_cache(self.parts_file).invalidate()
+        get_option_lists(self.parts_file).invalidate()
+        get_identity_map(self.parts_file).clear()
+        self.dialog_pool.clear()
         self.set_menus_enabled(False)
 
         # update the display
@@ -410,10 +610,7 @@ class MainWindow(QMainWindow):
         """
         if record_id == "":  # handle blank entry index (record_id)
             record_id = -1
-        dialog = ItemDialog(self, self.parts_file, record_id, add_item)
-        dialog.open()
-        self.assembly_tree.update_tree()
-        return dialog
+        return self.dialog_pool.open_dialog("ItemDialog", record_id, add_item)
 
     def edit_conditions_action(self) -> None:
         """
@@ -422,6 +619,8 @@ class MainWindow(QMainWindow):
         Returns:
             (dialog) the opened EditConditionDialog object
         """
+        from dialogs import EditConditionsDialog
+
         dialog = EditConditionsDialog(self, self.parts_file)
         dialog.open()
         return dialog
@@ -448,9 +647,11 @@ class MainWindow(QMainWindow):
         Returns:
             (dialog) the opened AssemblyListDialog object
         """
+        from dialogs import AssemblyListDialog
+
         dialog = AssemblyListDialog(self, self.parts_file, self.config)
         dialog.open()
-        self.assembly_tree.update_tree()
+        # writing the listing file changes nothing shown
         return dialog
 
     def update_assembly_tree_action(self) -> None:
@@ -458,10 +659,10 @@ class MainWindow(QMainWindow):
         Update the assembly tree display, showing collapsed view.
 
         returns:
-            dict[str, str] the set of items for the tree.
+            (AssemblyTreeModel) the reloaded tree model.
         """
-        tree_items = self.assembly_tree.update_tree()
-        return tree_items
+        tree_model = self.assembly_tree.update_tree()
+        return tree_model
 
     def part_dialog_action(self, record_id: int, add_part: int) -> None:
         """
@@ -479,10 +680,7 @@ class MainWindow(QMainWindow):
         """
         if record_id == "":  # handle blank entry index (record_id)
             record_id = -1
-        dialog = PartDialog(self, self.parts_file, record_id, add_part)
-        dialog.open()
-        self.part_list.update_table()
-        return dialog
+        return self.dialog_pool.open_dialog("PartDialog", record_id, add_part)
 
     def update_sources_action(self):
         """
@@ -491,6 +689,8 @@ class MainWindow(QMainWindow):
         Returns:
             (dialog) the opened EditSourceDialog object
         """
+        from dialogs import EditSourcesDialog
+
         dialog = EditSourcesDialog(self, self.parts_file)
         dialog.open()
         return dialog
@@ -520,10 +720,7 @@ class MainWindow(QMainWindow):
                 order is to be aded, Dialog.EDIT_ELEMENT for editing
                 an existing order.
         """
-        dialog = OrderDialog(self, self.parts_file, record_id, add_order)
-        dialog.open()
-        self.order_list.update_table()
-        return dialog
+        return self.dialog_pool.open_dialog("OrderDialog", record_id, add_order)
 
     def moveEvent(self, move_event: QMoveEvent) -> None:
         """Update the window location when the main window is moved."""
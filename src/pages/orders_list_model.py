@@ -0,0 +1,500 @@
+"""
+The paged table model of the Orders listing.
+
+File:       orders_list_model.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file LICENSE
+Version:    1.4.0
+"""
+
+import sys
+from array import array
+from typing import Any
+
+from lbk_library import DataFile as PartsFile
+
+from elements import OrderSet
+from qt_compat.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt
+
+file_version = "1.4.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Split 'load' into 'read_first_page' and 'set_first_page'",
+    "1.2.0": "Sorting an unread listing does not read it",
+    "1.3.0": "Refresh added and moved orders in their sorted place",
+    "1.4.0": "Changed library 'PyQt6' to 'PySide6' through 'qt_compat'",
+}
+
+
+class OrdersListModel(QAbstractTableModel):
+    """
+    Provide the Orders listing to a table view, a page at a time.
+
+    The first page of orders is read when the model is loaded; the
+    view asks for the next page as it is scrolled to the last row read.
+    The numeric columns are held in typed arrays, one entry per row,
+    and the text columns in lists, so a row costs no Python object of
+    its own. After an order is written only its row is read again.
+    """
+
+    KEYS = ("record_id", "order_number", "date", "source", "number_lines", "remarks")
+    """The 'OrderSet.get_order_summaries' key of each column."""
+
+    CENTERED_COLUMNS = (0, 4)
+    """The order id and number of lines columns, shown centered."""
+
+    PAGE_SIZE = 200
+    """The number of orders read at a time."""
+
+    def __init__(
+        self, parts_file: PartsFile, column_names: list[str], parent: QObject = None
+    ) -> None:
+        """
+        Initialize the model, empty until loaded.
+
+        Parameters:
+            parts_file (PartsFile): the parts file holding the orders.
+            column_names (list[str]): the header name of each column.
+            parent (QObject): the owner of the model.
+        """
+        super().__init__(parent)
+        self.parts_file = parts_file
+        self.column_names = column_names
+        self.sort_column = 1
+        """The column the listing is ordered by, default order number."""
+        self.sort_order = Qt.SortOrder.AscendingOrder
+        self.loaded = False
+        """True if the listing has been read."""
+        self.total_rows = 0
+        """The number of orders in the parts file, read or not."""
+        self.reset_rows()
+
+    def reset_rows(self) -> None:
+        """Empty the row storage."""
+        self.record_ids = array("q")
+        self.number_lines = array("l")
+        self.totals = array("d")
+        self.lines_costs = array("d")
+        self.order_numbers: list[str] = []
+        self.dates: list[str] = []
+        self.sources: list[str] = []
+        self.remarks: list[str] = []
+
+    def load(self) -> None:
+        """Discard the rows read and read the first page."""
+        total_rows, summaries = 0, []
+        if self.parts_file.sql_is_connected():
+            total_rows, summaries = self.read_first_page()
+        self.set_first_page(total_rows, summaries)
+
+    def clear(self) -> None:
+        """Discard the listing, leaving the model empty."""
+        self.set_first_page(0, [])
+        self.loaded = False
+
+    def read_first_page(
+        self, parts_file: PartsFile = None
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """
+        Read the number of orders and the first page of summaries.
+
+        The model is not changed, so the page may be read on a worker
+        thread and handed to 'set_first_page'.
+
+        Parameters:
+            parts_file (PartsFile): the parts file to read, default is
+                the parts file of the model.
+
+        Returns:
+            (tuple[int, list[dict[str, Any]]]) the number of orders and
+                the summaries of the first page.
+        """
+        if parts_file is None:
+            parts_file = self.parts_file
+        return (OrderSet.count(parts_file), self.read_page(0, parts_file))
+
+    def set_first_page(self, total_rows: int, summaries: list[dict[str, Any]]) -> None:
+        """
+        Replace the rows read with a first page.
+
+        Parameters:
+            total_rows (int): the number of orders in the parts file.
+            summaries (list[dict[str, Any]]): the first page of order
+                summaries.
+        """
+        self.beginResetModel()
+        self.reset_rows()
+        self.total_rows = total_rows
+        for summary in summaries:
+            self.append_summary(summary)
+        self.loaded = True
+        self.endResetModel()
+
+    def read_page(
+        self, offset: int, parts_file: PartsFile = None
+    ) -> list[dict[str, Any]]:
+        """
+        Read a page of order summaries in the current order.
+
+        Parameters:
+            offset (int): the row of the first summary to read.
+            parts_file (PartsFile): the parts file to read, default is
+                the parts file of the model.
+
+        Returns:
+            (list[dict[str, Any]]) the summaries read.
+        """
+        return OrderSet.get_order_summaries(
+            parts_file if parts_file is not None else self.parts_file,
+            self.KEYS[self.sort_column],
+            self.sort_order == Qt.SortOrder.DescendingOrder,
+            self.PAGE_SIZE,
+            offset,
+        )
+
+    def append_summary(self, summary: dict[str, Any]) -> None:
+        """
+        Add an order summary as the last row.
+
+        Parameters:
+            summary (dict[str, Any]): the summary to add.
+        """
+        self.record_ids.append(int(summary["record_id"]))
+        self.number_lines.append(int(summary["number_lines"]))
+        self.totals.append(float(summary["total"]))
+        self.lines_costs.append(float(summary["lines_cost"]))
+        self.order_numbers.append(summary["order_number"])
+        self.dates.append(summary["date"])
+        self.sources.append(sys.intern(summary["source"]))
+        self.remarks.append(summary["remarks"])
+
+    def replace_summary(self, row: int, summary: dict[str, Any]) -> None:
+        """
+        Replace the values of a row with an order summary.
+
+        Parameters:
+            row (int): the row to replace.
+            summary (dict[str, Any]): the new values.
+        """
+        self.record_ids[row] = int(summary["record_id"])
+        self.number_lines[row] = int(summary["number_lines"])
+        self.totals[row] = float(summary["total"])
+        self.lines_costs[row] = float(summary["lines_cost"])
+        self.order_numbers[row] = summary["order_number"]
+        self.dates[row] = summary["date"]
+        self.sources[row] = sys.intern(summary["source"])
+        self.remarks[row] = summary["remarks"]
+
+    def insert_summary(self, row: int, summary: dict[str, Any]) -> None:
+        """
+        Add an order summary ahead of a row.
+
+        Parameters:
+            row (int): the row to insert at.
+            summary (dict[str, Any]): the summary to add.
+        """
+        self.record_ids.insert(row, int(summary["record_id"]))
+        self.number_lines.insert(row, int(summary["number_lines"]))
+        self.totals.insert(row, float(summary["total"]))
+        self.lines_costs.insert(row, float(summary["lines_cost"]))
+        self.order_numbers.insert(row, summary["order_number"])
+        self.dates.insert(row, summary["date"])
+        self.sources.insert(row, sys.intern(summary["source"]))
+        self.remarks.insert(row, summary["remarks"])
+
+    def remove_summary(self, row: int) -> None:
+        """
+        Remove the values of a row.
+
+        Parameters:
+            row (int): the row to remove.
+        """
+        for column in (
+            self.record_ids,
+            self.number_lines,
+            self.totals,
+            self.lines_costs,
+            self.order_numbers,
+            self.dates,
+            self.sources,
+            self.remarks,
+        ):
+            del column[row]
+
+    def get_record_id(self, row: int) -> int:
+        """
+        Get the record_id of the Order in a row.
+
+        Parameters:
+            row (int): the table row.
+
+        Returns:
+            (int) the record_id, 0 if there is no such row.
+        """
+        if 0 <= row < len(self.record_ids):
+            return self.record_ids[row]
+        return 0
+
+    def get_order_number(self, row: int) -> str:
+        """
+        Get the order number of the Order in a row.
+
+        Parameters:
+            row (int): the table row.
+
+        Returns:
+            (str) the order number, "" if there is no such row.
+        """
+        if 0 <= row < len(self.order_numbers):
+            return self.order_numbers[row]
+        return ""
+
+    def get_order_record_ids(self, order_number: str) -> list[int]:
+        """
+        Get the record_ids of the Orders read with an order number.
+
+        Parameters:
+            order_number (str): the order number.
+
+        Returns:
+            (list[int]) the record_ids, empty if none has been read.
+        """
+        return [
+            record_id
+            for record_id, number in zip(self.record_ids, self.order_numbers)
+            if number == order_number
+        ]
+
+    def get_row(self, record_id: int) -> int:
+        """
+        Find the row holding an Order, if it has been read.
+
+        Parameters:
+            record_id (int): the record_id of the Order.
+
+        Returns:
+            (int) the row, -1 if the order has not been read.
+        """
+        try:
+            return self.record_ids.index(record_id)
+        except ValueError:
+            return -1
+
+    def get_sort_key(self, row: int) -> tuple[Any, int]:
+        """
+        Get the sort column value and record_id of a row.
+
+        Parameters:
+            row (int): the table row.
+
+        Returns:
+            (tuple[Any, int]) the values the parts file orders the row by.
+        """
+        column = (
+            self.record_ids,
+            self.order_numbers,
+            self.dates,
+            self.sources,
+            self.number_lines,
+            self.remarks,
+        )[self.sort_column]
+        return (column[row], self.record_ids[row])
+
+    def get_summary_key(self, summary: dict[str, Any]) -> tuple[Any, int]:
+        """
+        Get the sort column value and record_id of an order summary.
+
+        Parameters:
+            summary (dict[str, Any]): the order summary.
+
+        Returns:
+            (tuple[Any, int]) the values the parts file orders it by.
+        """
+        value = summary[self.KEYS[self.sort_column]]
+        if self.sort_column in (0, 4):
+            value = int(value)
+        return (value, int(summary["record_id"]))
+
+    def sorts_before(self, first: tuple[Any, int], second: tuple[Any, int]) -> bool:
+        """
+        Check if a sort key comes before another in the current order.
+
+        The parts file orders by the sort column, then by ascending
+        record_id whichever the direction.
+
+        Parameters:
+            first (tuple[Any, int]): the key expected first.
+            second (tuple[Any, int]): the key expected second.
+
+        Returns:
+            (bool) True if 'first' is listed ahead of 'second'.
+        """
+        if first[0] != second[0]:
+            if self.sort_order == Qt.SortOrder.DescendingOrder:
+                return first[0] > second[0]
+            return first[0] < second[0]
+        return first[1] < second[1]
+
+    def find_sorted_row(self, key: tuple[Any, int]) -> int:
+        """
+        Find the row read that an order belongs at.
+
+        Parameters:
+            key (tuple[Any, int]): the sort key of the order.
+
+        Returns:
+            (int) the row to insert it at; the number of rows read if
+                it sorts after all of them.
+        """
+        low, high = 0, len(self.record_ids)
+        while low < high:
+            middle = (low + high) // 2
+            if self.sorts_before(self.get_sort_key(middle), key):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def refresh_order(self, record_id: int) -> None:
+        """
+        Read one Order again after it has been added, edited or deleted.
+
+        Only the row of the order changes; the other rows read stay as
+        they are. An edited order keeps its row while it is still in
+        order, otherwise it is moved. An order sorting after the rows
+        read is only counted, to be read with its page.
+
+        Parameters:
+            record_id (int): the record_id of the Order.
+        """
+        if not self.loaded:
+            return
+        row = self.get_row(record_id)
+        summaries = OrderSet.get_order_summaries(
+            self.parts_file, where_column="record_id", where_value=record_id
+        )
+        key = self.get_summary_key(summaries[0]) if summaries else None
+        if row >= 0:
+            in_order = key is not None
+            if in_order and row > 0:
+                in_order = self.sorts_before(self.get_sort_key(row - 1), key)
+            if in_order and row < len(self.record_ids) - 1:
+                in_order = self.sorts_before(key, self.get_sort_key(row + 1))
+            if in_order:
+                self.replace_summary(row, summaries[0])
+                self.dataChanged.emit(
+                    self.index(row, 0), self.index(row, len(self.column_names) - 1)
+                )
+                return
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self.remove_summary(row)
+            self.endRemoveRows()
+        # the order may have been counted already, read or not
+        self.total_rows = OrderSet.count(self.parts_file)
+        if key is None:
+            return
+        row = self.find_sorted_row(key)
+        if row == len(self.record_ids) and row < self.total_rows - 1:
+            # sorts after the rows read, so it is read with its page
+            return
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.insert_summary(row, summaries[0])
+        self.endInsertRows()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Get the number of rows read."""
+        if parent.isValid():
+            return 0
+        return len(self.record_ids)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Get the number of columns."""
+        if parent.isValid():
+            return 0
+        return len(self.column_names)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        """Check if orders remain to be read."""
+        if parent.isValid():
+            return False
+        return len(self.record_ids) < self.total_rows
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        """Read the next page of orders."""
+        if parent.isValid():
+            return
+        first = len(self.record_ids)
+        summaries = self.read_page(first)
+        if len(summaries) < self.PAGE_SIZE:
+            # the parts file holds fewer orders than counted
+            self.total_rows = first + len(summaries)
+        if not summaries:
+            return
+        self.beginInsertRows(QModelIndex(), first, first + len(summaries) - 1)
+        for summary in summaries:
+            self.append_summary(summary)
+        self.endInsertRows()
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        """Get the display value or alignment of a cell."""
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            row = index.row()
+            column = index.column()
+            if column == 0:
+                return str(self.record_ids[row])
+            if column == 1:
+                return self.order_numbers[row]
+            if column == 2:
+                return self.dates[row]
+            if column == 3:
+                return self.sources[row]
+            if column == 4:
+                return str(self.number_lines[row])
+            return self.remarks[row]
+        if (
+            role == Qt.ItemDataRole.TextAlignmentRole
+            and index.column() in self.CENTERED_COLUMNS
+        ):
+            return Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        """Get the column names."""
+        if (
+            orientation == Qt.Orientation.Horizontal
+            and role == Qt.ItemDataRole.DisplayRole
+            and 0 <= section < len(self.column_names)
+        ):
+            return self.column_names[section]
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        """Listing entries are selectable but not editable."""
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def sort(
+        self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder
+    ) -> None:
+        """
+        Reorder the listing by a column, reading its first page again.
+
+        Parameters:
+            column (int): the column to sort on.
+            order (Qt.SortOrder): ascending or descending.
+        """
+        if not 0 <= column < len(self.KEYS):
+            return
+        self.sort_column = column
+        self.sort_order = order
+        if self.loaded:
+            self.load()
@@ -5,20 +5,31 @@ File:       orders_list_page.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.0.0
+Version:    1.8.0
 """
 
+from typing import Any
+
 from lbk_library import DataFile as PartsFile
-from lbk_library.gui import Dialog, TableWidgetIntItem
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QHeaderView, QTableWidget, QTableWidgetItem
+from lbk_library.gui import Dialog
+
+from elements import ADDED, UPDATED, ChangeEvent, OrderLineSet, get_change_bus
+from qt_compat.QtCore import QModelIndex
+from qt_compat.QtWidgets import QHeaderView, QTableView
 
-from dialogs import OrderDialog
-from elements import OrderLineSet, OrderSet, Source
+from .orders_list_model import OrdersListModel
 
-file_version = "1.0.0"
+file_version = "1.8.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Changed to a paged table model refreshed by row",
+    "1.2.0": "Added 'set_first_page' for background loading",
+    "1.3.0": "Read the listing only when it is shown",
+    "1.4.0": "Refresh through the refresh scheduler",
+    "1.5.0": "Patch the rows from the change bus",
+    "1.6.0": "Import the OrderDialog when first clicked",
+    "1.7.0": "Changed library 'PyQt6' to 'PySide6' through 'qt_compat'",
+    "1.8.0": "Open the OrderDialog through the dialog pool",
 }
 
 
@@ -34,87 +45,133 @@ class OrdersListPage:
         "Order Remarks",
     ]
 
-    def __init__(self, table: QTableWidget, parts_file: PartsFile) -> None:
+    def __init__(self, table: QTableView, parts_file: PartsFile) -> None:
         """
         Initialize and display the Order List.
 
         Parameters:
-            main_window (QMainWindow): the parent window.
+            table (QTableView): the view showing the listing.
             parts_file (PartsFile): reference to the parts file.
         """
         self.parts_file: PartsFile = parts_file
         self.table = table
+        self.model = OrdersListModel(self.parts_file, self.COLUMN_NAMES, self.table)
+        self.table.setModel(self.model)
 
-        # # set up the Orders Listing Table
+        # # set up the Orders Listing Table, read when first shown
         self.set_table_headers()
+        self.stale = True
+        """True if the listing must be read before it is shown."""
+        self.refresh_scheduler = None
+        """The scheduler merging refresh requests, set when registered."""
+        self.dialog_pool = None
+        """The pool opening the dialogs, set when registered."""
+
+        # header clicks sort the listing through the model
+        self.table.horizontalHeader().setSortIndicator(
+            self.model.sort_column, self.model.sort_order
+        )
+        self.table.setSortingEnabled(True)
 
-        # load the table
-        if self.parts_file.sql_is_connected():
-            self.update_table()
+        # writes to the orders, their lines and sources patch the rows
+        get_change_bus(self.parts_file).subscribe(
+            self.parts_file_changed, ("orders", "order_lines", "sources")
+        )
 
-        # connect the order list table signal for 'item clicked'
-        self.table.itemClicked.connect(self.action_order_clicked)
+        # connect the order list table signal for 'order clicked'
+        self.table.clicked.connect(self.action_order_clicked)
 
     def update_table(self) -> None:
-        """Read database order table and update the display table."""
-        self.table.setSortingEnabled(False)
-        order_list = OrderSet(self.parts_file, "order_number", None, "order_number")
-        # clear the current contents and set the new row count
-        self.table.clearContents()
-        self.table.setRowCount(order_list.get_number_elements())
-
-        # fill each of the rows
-        row = 0
-        for order in order_list:
-            col = 0
-            record_id = order.get_record_id()
-            record_id_sortable = TableWidgetIntItem(record_id)
-            record_id_sortable.setTextAlignment(
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter
-            )
-            self.table.setItem(row, col, record_id_sortable)
+        """
+        Read database order table and update the display table.
 
-            col += 1
-            self.table.setItem(row, col, QTableWidgetItem(order.get_order_number()))
+        The first page of orders, their source names and the number of
+        order lines are read with a single parts file query; the rest
+        are read as the table is scrolled.
+        """
+        self.model.load()
+        self.stale = False
 
-            col += 1
-            self.table.setItem(row, col, QTableWidgetItem(order.get_date()))
+    def mark_stale(self) -> None:
+        """Mark the orders out of date, to be read when the page is next shown."""
+        self.stale = True
 
-            col += 1
-            source = Source(self.parts_file, order.get_source()).get_source()
-            self.table.setItem(row, col, QTableWidgetItem(source))
+    def refresh_if_stale(self) -> None:
+        """Read the first page of orders if the listing is stale."""
+        if self.stale and self.parts_file.sql_is_connected():
+            self.update_table()
 
-            col += 1
-            num_lines = self.get_number_lines(order.get_order_number())
-            number_lines = TableWidgetIntItem(num_lines)
-            number_lines.setTextAlignment(
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter
-            )
-            self.table.setItem(row, col, number_lines)
+    def request_refresh(self) -> None:
+        """
+        Refresh the listing after a change.
 
-            col += 1
-            self.table.setItem(row, col, QTableWidgetItem(order.get_remarks()))
-            row += 1
+        With a refresh scheduler the refresh is merged with the other
+        requests of the same burst of changes, otherwise it is done now.
+        """
+        if self.refresh_scheduler is not None:
+            self.refresh_scheduler.invalidate(self)
+        else:
+            self.mark_stale()
+            self.refresh_if_stale()
 
-        self.table.setSortingEnabled(True)
+    def parts_file_changed(self, event: ChangeEvent) -> None:
+        """
+        Bring the listing up to date after a write to the parts file.
+
+        An Order written has only its row read again, as has an Order
+        read whose lines are written. A renamed or deleted Source may
+        be shown on any row, so the listing is refreshed. A stale
+        listing is left to be read when next shown.
+
+        Parameters:
+            event (ChangeEvent): the write published on the change bus.
+        """
+        if self.stale or not self.parts_file.sql_is_connected():
+            return
+        if event.table == "orders":
+            self.model.refresh_order(event.record_id)
+        elif event.table == "order_lines":
+            if event.action != UPDATED or {
+                "order_number",
+                "quantity",
+                "cost_each",
+            } & set(event.columns):
+                order_numbers = {
+                    event.values.get("order_number"),
+                    event.old_values.get("order_number"),
+                }
+                for order_number in order_numbers - {None}:
+                    for record_id in self.model.get_order_record_ids(order_number):
+                        self.model.refresh_order(record_id)
+        elif event.action != ADDED:
+            self.request_refresh()
+
+    def set_first_page(self, total_rows: int, summaries: list[dict[str, Any]]) -> None:
+        """
+        Show the first page of orders read in the background.
+
+        Parameters:
+            total_rows (int): the number of orders in the parts file.
+            summaries (list[dict[str, Any]]): the first page read by the
+                model's 'read_first_page'.
+        """
+        self.model.set_first_page(total_rows, summaries)
+        self.stale = False
 
     def clear_table(self) -> None:
-        """Clear the Order Line table."""
-        self.table.clearContents()
-        self.table.setRowCount(0)
+        """Clear the Order table."""
+        self.model.clear()
+        self.stale = True
 
     def set_table_headers(self):
         """
         Set the table headers.
 
-        Set the header names and set the column widths to match the size
-        of the entries.
+        The header names are provided by the model and the column widths
+        to match the size of the entries are set.
         """
         self.table.verticalHeader().setVisible(False)
         header = self.table.horizontalHeader()
-        self.table.setColumnCount(len(self.COLUMN_NAMES))
-        self.table.setHorizontalHeaderLabels(self.COLUMN_NAMES)
-
         self.table.setColumnWidth(0, 70)
         self.table.setColumnWidth(1, 120)
         self.table.setColumnWidth(2, 120)
@@ -127,8 +184,8 @@ class OrdersListPage:
         """
          Get the total number of lines for this order number.
 
-        The order_lines table is searched for the lines using this order
-        number.
+        The order_lines for this order number are counted by the parts
+        file without being read.
 
         Parameters:
             order_number (str): Order being searched for.
@@ -136,19 +193,24 @@ class OrdersListPage:
         Returns:
             (int) the total number of order lines found.
         """
-        order_line_set = OrderLineSet(self.parts_file, "order_number", order_number)
-        return order_line_set.get_number_elements()
+        return OrderLineSet.count(self.parts_file, "order_number", order_number)
 
-    def action_order_clicked(self, table_item: QTableWidgetItem) -> None:
+    def action_order_clicked(self, index: QModelIndex) -> None:
         """
         Show the Order Editing dialog for the specified order.
 
+        The rows of the orders written are read again as they are saved.
+
         Parameters:
-            table_item (QTableWidgetItem): The clicked item.
+            index (QModelIndex): The model index of the order clicked.
         """
-        row = table_item.row()
-        column = table_item.column()
-        order_number = self.table.item(row, 1).text()
+        order_number = self.model.get_order_number(index.row())
+        if self.dialog_pool is not None:
+            return self.dialog_pool.open_dialog(
+                "OrderDialog", order_number, Dialog.EDIT_ELEMENT
+            )
+        from dialogs import OrderDialog
+
         dialog = OrderDialog(
             self.table,
             self.parts_file,
@@ -156,7 +218,6 @@ class OrdersListPage:
             Dialog.EDIT_ELEMENT,
         )
         result = dialog.open()
-        self.update_table()
         return dialog
 
     def get_parts_file(self) -> PartsFile:
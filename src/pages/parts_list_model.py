@@ -0,0 +1,375 @@
+"""
+The table model of the Parts listing.
+
+File:       parts_list_model.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file LICENSE
+Version:    1.5.0
+"""
+
+import sys
+from typing import Any
+
+from lbk_library import DataFile as PartsFile
+
+from elements import PartSet
+from qt_compat.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt
+
+file_version = "1.5.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Split 'load' into 'read_rows' and 'set_rows' for background loading",
+    "1.2.0": "Sorting an unread listing does not read it",
+    "1.3.0": "Refresh a single Part in its sorted place",
+    "1.4.0": "Changed library 'PyQt6' to 'PySide6' through 'qt_compat'",
+    "1.5.0": "Find the rows of a record_id or part number by dict",
+}
+
+
+class PartsListModel(QAbstractTableModel):
+    """
+    Provide the Parts listing to a table view.
+
+    Each row is held as a tuple of its column values; the view asks for
+    the text of the visible cells only. Sorting is done by the parts
+    file with an ORDER BY on the column clicked; a Part written after
+    the listing is read is moved to its place by a binary search.
+    """
+
+    KEYS = ("record_id", "part_number", "description", "source", "quantity", "remarks")
+    """The 'PartSet.get_parts_listing' key of each column."""
+
+    CENTERED_COLUMNS = (0, 4)
+    """The part id and qty used columns, shown centered."""
+
+    def __init__(
+        self, parts_file: PartsFile, column_names: list[str], parent: QObject = None
+    ) -> None:
+        """
+        Initialize the model, empty until loaded.
+
+        Parameters:
+            parts_file (PartsFile): the parts file holding the parts.
+            column_names (list[str]): the header name of each column.
+            parent (QObject): the owner of the model.
+        """
+        super().__init__(parent)
+        self.parts_file = parts_file
+        self.column_names = column_names
+        self.rows: list[tuple] = []
+        self.record_rows: dict[int, int] = {}
+        """The row of each record_id listed."""
+        self.part_records: dict[str, int] = {}
+        """The record_id of each part number listed."""
+        self.sort_column = 1
+        """The column the listing is ordered by, default part number."""
+        self.sort_order = Qt.SortOrder.AscendingOrder
+        self.loaded = False
+        """True if the listing has been read."""
+
+    def load(self) -> None:
+        """Read the listing from the parts file in the current order."""
+        rows = []
+        if self.parts_file.sql_is_connected():
+            rows = self.read_rows()
+        self.set_rows(rows)
+
+    def read_rows(self, parts_file: PartsFile = None) -> list[tuple]:
+        """
+        Read the listing rows in the current order.
+
+        The model is not changed, so the rows may be read on a worker
+        thread and handed to 'set_rows'.
+
+        Parameters:
+            parts_file (PartsFile): the parts file to read, default is
+                the parts file of the model.
+
+        Returns:
+            (list[tuple]) the column values of each row.
+        """
+        listing = PartSet.get_parts_listing(
+            parts_file if parts_file is not None else self.parts_file,
+            self.KEYS[self.sort_column],
+            self.sort_order == Qt.SortOrder.DescendingOrder,
+        )
+        return [self.make_row(part) for part in listing]
+
+    def read_row(self, record_id: int) -> tuple | None:
+        """
+        Read the listing row of one Part.
+
+        Parameters:
+            record_id (int): the record_id of the Part.
+
+        Returns:
+            (tuple | None) the column values, None if there is no such
+                Part.
+        """
+        listing = PartSet.get_parts_listing(
+            self.parts_file, where_column="record_id", where_value=record_id
+        )
+        if listing:
+            return self.make_row(listing[0])
+        return None
+
+    @staticmethod
+    def make_row(part: dict[str, Any]) -> tuple:
+        """
+        Convert a parts listing entry to a row.
+
+        Parameters:
+            part (dict[str, Any]): the 'PartSet.get_parts_listing' entry.
+
+        Returns:
+            (tuple) the column values.
+        """
+        return (
+            int(part["record_id"]),
+            sys.intern(part["part_number"]),
+            part["description"],
+            sys.intern(part["source"]),
+            int(part["quantity"]),
+            part["remarks"],
+        )
+
+    def set_rows(self, rows: list[tuple]) -> None:
+        """
+        Replace the listing.
+
+        Parameters:
+            rows (list[tuple]): the rows from 'read_rows'.
+        """
+        self.beginResetModel()
+        self.rows = rows
+        self.part_records = {values[1]: values[0] for values in rows}
+        self.record_rows = {}
+        self.index_rows(0)
+        self.loaded = True
+        self.endResetModel()
+
+    def index_rows(self, start: int) -> None:
+        """
+        Record the row of each record_id from a row on.
+
+        Parameters:
+            start (int): the first row moved by an insert or removal.
+        """
+        for row in range(start, len(self.rows)):
+            self.record_rows[self.rows[row][0]] = row
+
+    def clear(self) -> None:
+        """Discard the listing, leaving the model empty."""
+        self.beginResetModel()
+        self.rows = []
+        self.record_rows = {}
+        self.part_records = {}
+        self.loaded = False
+        self.endResetModel()
+
+    def get_record_id(self, row: int) -> int:
+        """
+        Get the record_id of the Part in a row.
+
+        Parameters:
+            row (int): the table row.
+
+        Returns:
+            (int) the record_id, 0 if there is no such row.
+        """
+        if 0 <= row < len(self.rows):
+            return self.rows[row][0]
+        return 0
+
+    def get_row(self, part_number: str) -> int:
+        """
+        Find the row holding a part number.
+
+        Parameters:
+            part_number (str): the part number to find.
+
+        Returns:
+            (int) the row, -1 if the part number is not listed.
+        """
+        record_id = self.part_records.get(part_number)
+        if record_id is None:
+            return -1
+        return self.find_record(record_id)
+
+    def find_record(self, record_id: int) -> int:
+        """
+        Find the row holding a Part.
+
+        Parameters:
+            record_id (int): the record_id of the Part.
+
+        Returns:
+            (int) the row, -1 if the Part is not listed.
+        """
+        return self.record_rows.get(record_id, -1)
+
+    def sorts_before(self, first: tuple, second: tuple) -> bool:
+        """
+        Check if a row comes before another in the current order.
+
+        The rows are ordered as the parts file orders the listing: by
+        the sort column, then by ascending record_id. A missing
+        description, source or remarks is listed, and ordered, as an
+        empty string on both sides.
+
+        Parameters:
+            first (tuple): the row expected first.
+            second (tuple): the row expected second.
+
+        Returns:
+            (bool) True if 'first' is listed ahead of 'second'.
+        """
+        first_value = first[self.sort_column]
+        second_value = second[self.sort_column]
+        if first_value != second_value:
+            if self.sort_order == Qt.SortOrder.DescendingOrder:
+                return first_value > second_value
+            return first_value < second_value
+        return first[0] < second[0]
+
+    def find_sorted_row(self, values: tuple) -> int:
+        """
+        Find the row a new listing row belongs at.
+
+        Parameters:
+            values (tuple): the row to place.
+
+        Returns:
+            (int) the row to insert it at.
+        """
+        low, high = 0, len(self.rows)
+        while low < high:
+            middle = (low + high) // 2
+            if self.sorts_before(self.rows[middle], values):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def refresh_part(self, record_id: int) -> None:
+        """
+        Read one Part again after it has been added, edited or deleted.
+
+        An edited Part keeps its row if it is still in order, otherwise
+        it is moved; the other rows are not read. Nothing is done until
+        the listing has been read.
+
+        Parameters:
+            record_id (int): the record_id of the Part.
+        """
+        if not self.loaded:
+            return
+        row = self.find_record(record_id)
+        values = self.read_row(record_id)
+        if row >= 0:
+            if (
+                values is not None
+                and (row == 0 or self.sorts_before(self.rows[row - 1], values))
+                and (
+                    row == len(self.rows) - 1
+                    or self.sorts_before(values, self.rows[row + 1])
+                )
+            ):
+                del self.part_records[self.rows[row][1]]
+                self.part_records[values[1]] = record_id
+                self.rows[row] = values
+                self.dataChanged.emit(
+                    self.index(row, 0), self.index(row, len(self.column_names) - 1)
+                )
+                return
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.part_records[self.rows[row][1]]
+            del self.record_rows[record_id]
+            del self.rows[row]
+            self.index_rows(row)
+            self.endRemoveRows()
+        if values is None:
+            return
+        row = self.find_sorted_row(values)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows.insert(row, values)
+        self.part_records[values[1]] = record_id
+        self.index_rows(row)
+        self.endInsertRows()
+
+    def refresh_part_number(self, part_number: str) -> None:
+        """
+        Read the Part listed under a part number again.
+
+        Used when the Items using the part change its quantity used.
+
+        Parameters:
+            part_number (str): the part number of the Part.
+        """
+        row = self.get_row(part_number)
+        if row >= 0:
+            self.refresh_part(self.rows[row][0])
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Get the number of rows."""
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Get the number of columns."""
+        if parent.isValid():
+            return 0
+        return len(self.column_names)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        """Get the display value or alignment of a cell."""
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(self.rows[index.row()][index.column()])
+        if (
+            role == Qt.ItemDataRole.TextAlignmentRole
+            and index.column() in self.CENTERED_COLUMNS
+        ):
+            return Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        """Get the column names."""
+        if (
+            orientation == Qt.Orientation.Horizontal
+            and role == Qt.ItemDataRole.DisplayRole
+            and 0 <= section < len(self.column_names)
+        ):
+            return self.column_names[section]
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        """Listing entries are selectable but not editable."""
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def sort(
+        self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder
+    ) -> None:
+        """
+        Reorder the listing by a column, if it has been read.
+
+        Parameters:
+            column (int): the column to sort on.
+            order (Qt.SortOrder): ascending or descending.
+        """
+        if not 0 <= column < len(self.KEYS):
+            return
+        self.sort_column = column
+        self.sort_order = order
+        if self.loaded:
+            self.load()
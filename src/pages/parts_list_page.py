@@ -5,20 +5,29 @@ File:       parts_list_page.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.0.0
+Version:    1.8.0
 """
 
 from lbk_library import DataFile as PartsFile
-from lbk_library.gui import Dialog, TableWidgetIntItem
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QHeaderView, QTableWidget, QTableWidgetItem
+from lbk_library.gui import Dialog
 
-from dialogs import PartDialog
-from elements import PartSet, Source
+from elements import ADDED, UPDATED, ChangeEvent, get_change_bus
+from qt_compat.QtCore import QModelIndex
+from qt_compat.QtWidgets import QHeaderView, QTableView
 
-file_version = "1.0.0"
+from .parts_list_model import PartsListModel
+
+file_version = "1.8.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Changed to a table model sorted by the parts file",
+    "1.2.0": "Added 'set_rows' for background loading",
+    "1.3.0": "Read the listing only when it is shown",
+    "1.4.0": "Refresh through the refresh scheduler",
+    "1.5.0": "Patch the rows from the change bus",
+    "1.6.0": "Import the PartDialog when first clicked",
+    "1.7.0": "Changed library 'PyQt6' to 'PySide6' through 'qt_compat'",
+    "1.8.0": "Open the PartDialog through the dialog pool",
 }
 
 
@@ -34,88 +43,129 @@ class PartsListPage:
         "Part Remarks",
     ]
 
-    def __init__(self, table: QTableWidget, parts_file: PartsFile) -> None:
+    def __init__(self, table: QTableView, parts_file: PartsFile) -> None:
         """
         Initialize and display the Part List.
 
         Parameters
-            main_window (QMainWindow): the parent window
+            table (QTableView): the view showing the listing.
             parts_file (PartsFile): reference to theparts file.
         """
         #        self.main_window: QMainWindow = main_window
         self.parts_file: PartsFile = parts_file
         self.table = table
+        self.model = PartsListModel(self.parts_file, self.COLUMN_NAMES, self.table)
+        self.table.setModel(self.model)
 
-        # set the table headers and load the table
+        # set the table headers; the table is read when first shown
         self.set_table_headers()
+        self.stale = True
+        """True if the listing must be read before it is shown."""
+        self.refresh_scheduler = None
+        """The scheduler merging refresh requests, set when registered."""
+        self.dialog_pool = None
+        """The pool opening the dialogs, set when registered."""
+
+        # header clicks sort the listing through the model
+        self.table.horizontalHeader().setSortIndicator(
+            self.model.sort_column, self.model.sort_order
+        )
+        self.table.setSortingEnabled(True)
 
-        if self.parts_file.sql_is_connected():
-            self.update_table()
+        # writes to the parts, their quantities and sources patch the rows
+        get_change_bus(self.parts_file).subscribe(
+            self.parts_file_changed, ("parts", "items", "sources")
+        )
 
         # connect the table signal for 'part clicked'
-        self.table.itemClicked.connect(self.action_part_clicked)
+        self.table.clicked.connect(self.action_part_clicked)
 
     def update_table(self) -> None:
-        """Update the display table from database."""
-        self.table.setSortingEnabled(False)
-        part_list = PartSet(self.parts_file, "part_number", None, "part_number")
-
-        # clear the current contents and set the new row count
-        self.table.clearContents()
-        self.table.setRowCount(part_list.get_number_elements())
-
-        # fill each of the rows
-        row = 0
-        for part in part_list:
-            col = 0
-            record_id = part.get_record_id()
-            record_id_sortable = TableWidgetIntItem(record_id)
-            record_id_sortable.setTextAlignment(
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter
-            )
-            self.table.setItem(row, col, record_id_sortable)
+        """
+        Update the display table from database.
 
-            col += 1
-            part_number = QTableWidgetItem(part.get_part_number())
-            self.table.setItem(row, col, part_number)
+        The listing, including the source names and the total quantity
+        used for each part, is read with a single parts file query in
+        the current sort order.
+        """
+        self.model.load()
+        self.stale = False
 
-            col += 1
-            self.table.setItem(row, col, QTableWidgetItem(part.get_description()))
+    def mark_stale(self) -> None:
+        """Mark the listing out of date, to be read when next shown."""
+        self.stale = True
 
-            col += 1
-            source = Source(self.parts_file, part.get_source()).get_source()
-            self.table.setItem(row, col, QTableWidgetItem(source))
+    def refresh_if_stale(self) -> None:
+        """Read the listing if it is stale."""
+        if self.stale and self.parts_file.sql_is_connected():
+            self.update_table()
 
-            col += 1
-            quantity = part.get_total_quantity()
-            qty_item = TableWidgetIntItem(quantity)
-            qty_item.setTextAlignment(
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter
-            )
-            self.table.setItem(row, col, qty_item)
+    def request_refresh(self) -> None:
+        """
+        Refresh the listing after a change.
 
-            col += 1
-            self.table.setItem(row, col, QTableWidgetItem(part.get_remarks()))
+        With a refresh scheduler the refresh is merged with the other
+        requests of the same burst of changes, otherwise it is done now.
+        """
+        if self.refresh_scheduler is not None:
+            self.refresh_scheduler.invalidate(self)
+        else:
+            self.mark_stale()
+            self.refresh_if_stale()
 
-            row += 1
-        self.table.setSortingEnabled(True)
+    def parts_file_changed(self, event: ChangeEvent) -> None:
+        """
+        Bring the listing up to date after a write to the parts file.
+
+        A Part written, or a Part whose quantity used is changed by an
+        Item write, has only its row read again. A renamed or deleted
+        Source may be shown on any row, so the listing is refreshed.
+        A stale listing is left to be read when next shown.
+
+        Parameters:
+            event (ChangeEvent): the write published on the change bus.
+        """
+        if self.stale or not self.parts_file.sql_is_connected():
+            return
+        if event.table == "parts":
+            self.model.refresh_part(event.record_id)
+        elif event.table == "items":
+            if event.action != UPDATED or {"part_number", "quantity"} & set(
+                event.columns
+            ):
+                part_numbers = {
+                    event.values.get("part_number"),
+                    event.old_values.get("part_number"),
+                }
+                for part_number in part_numbers - {None}:
+                    self.model.refresh_part_number(part_number)
+        elif event.action != ADDED:
+            self.request_refresh()
+
+    def set_rows(self, rows: list[tuple]) -> None:
+        """
+        Show a listing read in the background.
+
+        Parameters:
+            rows (list[tuple]): the rows read by the model's 'read_rows'.
+        """
+        self.model.set_rows(rows)
+        self.stale = False
 
     def clear_table(self):
         """Clear the contents of the Parts Table."""
-        self.table.clearContents()
-        self.table.setRowCount(0)
+        self.model.clear()
+        self.stale = True
 
     def set_table_headers(self) -> None:
         """
         Set the table headers.
 
-        The header names are set and the column widths to match the size
-        of the entries are set.
+        The header names are provided by the model and the column widths
+        to match the size of the entries are set.
         """
         self.table.verticalHeader().setVisible(False)
         header = self.table.horizontalHeader()
-        self.table.setColumnCount(len(self.COLUMN_NAMES))
-        self.table.setHorizontalHeaderLabels(self.COLUMN_NAMES)
         self.table.setColumnWidth(0, 50)
         self.table.setColumnWidth(1, 120)
         self.table.setColumnWidth(2, 400)
@@ -124,24 +174,22 @@ class PartsListPage:
         header.setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)
         self.table.setColumnHidden(0, True)
 
-    def action_part_clicked(self, table_item: QTableWidgetItem) -> None:
+    def action_part_clicked(self, index: QModelIndex) -> None:
         """
         Display the Part Editing dialog for the indicated part number.
 
         Parameters:
-            table_item (QTableWidgetItem); The requested part number.
-        """
-        row = table_item.row()
-        column = table_item.column()
-        part_index = self.table.item(row, 0)
-        dialog = PartDialog(
-            self.table,
-            self.parts_file,
-            part_index.text(),
-            Dialog.EDIT_ELEMENT,
-        )
+            index (QModelIndex); The model index of the part clicked.
+        """
+        record_id = str(self.model.get_record_id(index.row()))
+        if self.dialog_pool is not None:
+            return self.dialog_pool.open_dialog(
+                "PartDialog", record_id, Dialog.EDIT_ELEMENT
+            )
+        from dialogs import PartDialog
+
+        dialog = PartDialog(self.table, self.parts_file, record_id, Dialog.EDIT_ELEMENT)
         result = dialog.open()
-        self.update_table()
         return dialog
 
     def get_parts_file(self):
@@ -0,0 +1,104 @@
+"""
+Merge the refresh requests of the pages into one refresh per page.
+
+File:       refresh_scheduler.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file LICENSE
+Version:    1.1.0
+"""
+
+from typing import Any, Callable
+
+from qt_compat.QtCore import QObject, QTimer
+
+file_version = "1.1.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Changed library 'PyQt6' to 'PySide6' through 'qt_compat'",
+}
+
+
+class RefreshScheduler(QObject):
+    """
+    Refresh the pages once after a burst of changes.
+
+    A page registered with the scheduler is marked stale as soon as a
+    change to it is reported, but is read only when control returns
+    to the event loop. However many times a page is reported during
+    the burst it is read at most once, and only if it is shown; the
+    other pages are read when their tabs are next shown.
+    """
+
+    def __init__(self, is_shown: Callable[[Any], bool], parent: QObject = None) -> None:
+        """
+        Initialize the scheduler.
+
+        Parameters:
+            is_shown (Callable[[Any], bool]): check if a page is on
+                screen and may be read.
+            parent (QObject): the owner of the scheduler.
+        """
+        super().__init__(parent)
+        self.is_shown = is_shown
+        self.pages: list[Any] = []
+        """The pages registered."""
+        self.pending: list[Any] = []
+        """The pages reported since the last refresh, in report order."""
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.flush)
+
+    def register(self, page: Any) -> None:
+        """
+        Add a page to the scheduler.
+
+        The page must provide 'mark_stale' and 'refresh_if_stale'; its
+        own refresh requests are then sent through the scheduler.
+
+        Parameters:
+            page (Any): the page to add.
+        """
+        if page not in self.pages:
+            self.pages.append(page)
+        page.refresh_scheduler = self
+
+    def invalidate(self, *pages: Any) -> None:
+        """
+        Report a change to pages, to be refreshed on the next pass of
+        the event loop.
+
+        Parameters:
+            pages (Any): the registered pages affected by the change.
+        """
+        for page in pages:
+            if page not in self.pages:
+                continue
+            page.mark_stale()
+            if page not in self.pending:
+                self.pending.append(page)
+        if self.pending and not self.timer.isActive():
+            self.timer.start()
+
+    def has_pending(self) -> bool:
+        """
+        Check if a refresh is waiting.
+
+        Returns:
+            (bool) True if pages have been reported but not refreshed.
+        """
+        return len(self.pending) > 0
+
+    def flush(self) -> None:
+        """Refresh the reported pages that are shown, each once."""
+        self.timer.stop()
+        pending, self.pending = self.pending, []
+        for page in pending:
+            if self.is_shown(page):
+                page.refresh_if_stale()
+
+    def discard(self) -> None:
+        """Forget the reported pages without refreshing them."""
+        self.timer.stop()
+        self.pending = []
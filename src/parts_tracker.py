@@ -5,18 +5,18 @@ File:       PartsTracker.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2022, 2023 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.0
+Version:    1.1.0
 """
 
 import sys
 
-from PyQt6.QtWidgets import QApplication
-
 from pages import MainWindow
+from qt_compat.QtWidgets import QApplication
 
-file_version = "1.0.0"
+file_version = "1.1.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Changed library 'PyQt6' to 'PySide6' through 'qt_compat'",
 }
 
 if __name__ == "__main__":
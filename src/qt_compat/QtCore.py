@@ -0,0 +1,16 @@
+"""
+The QtCore classes of the Qt binding.
+
+File:       QtCore.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.0.0
+"""
+
+from PySide6.QtCore import *  # noqa: F401, F403
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Initial release",
+}
@@ -0,0 +1,26 @@
+"""
+The single Qt binding used by the PartsTracker program.
+
+The pages, the dialogs and the compiled forms all import their Qt
+classes through this package, so one binding is loaded and every
+window shares the same widget classes. The binding is PySide6, as
+used by lbk_library.gui. The modules re-export the binding modules
+of the same names:
+    QtCore - core classes, with the 'Signal' and 'Slot' names
+    QtGui - painting, colour and event classes
+    QtWidgets - the widget classes
+
+File       __init__.py
+Author     Lorn B Kerr
+Copyright  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.0.0
+"""
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Initial release",
+}
+
+BINDING = "PySide6"
+"""The name of the Qt binding package in use."""
@@ -145,3 +145,24 @@ def test_006_06_selected_rows_limit_offset(tmp_path):
     assert limit == len(item_set.get_property_set())
     assert item_set.get_property_set()[0].get_record_id() == 3
     datafile_close(parts_file)
+
+
+def test_006_07_stream(tmp_path):
+    """
+    'stream' yields the same Items as the set, a batch at a time, even
+    when the parts file is queried while the rows are being read.
+    """
+    item_set, parts_file = base_setup(tmp_path)
+    load_datafile_table(parts_file, "items", item_columns, item_value_set)
+    item_set = ItemSet(parts_file, None, None, "record_id")
+    streamed = []
+    for item in ItemSet.stream(parts_file, None, None, "record_id", 3):
+        parts_file.sql_query("SELECT * FROM parts")
+        streamed.append(item.get_properties())
+    assert streamed == [item.get_properties() for item in item_set]
+
+    part_number = item_value_set[0][1]
+    item_set = ItemSet(parts_file, "part_number", part_number)
+    streamed = list(ItemSet.stream(parts_file, "part_number", part_number))
+    assert len(streamed) == item_set.get_number_elements()
+    datafile_close(parts_file)
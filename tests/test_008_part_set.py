@@ -5,7 +5,7 @@ File:       test_008_part_set.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2022, 2023 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.1
+Version:    1.3.0
 """
 
 import os
@@ -22,15 +22,25 @@ from lbk_library.testing_support import (
     filesystem,
     load_datafile_table,
 )
-from test_data import part_columns, part_value_set
+from test_data import (
+    item_columns,
+    item_value_set,
+    part_columns,
+    part_value_set,
+    source_columns,
+    source_value_set,
+)
 
-from elements import PartSet
+from elements import Part, PartSet, Source
 from pages import table_definition
 
-file_version = "1.0.1"
+file_version = "1.3.0"
 changes = {
     "1.0.0": "Initial release",
     "1.0.1": "Changed all test funtions to have 'tmp_path' as parameter instead of 'filesystem' and as parameter to filesystem in the body.",
+    "1.1.0": "Added the selected parts listing test",
+    "1.2.0": "Added the NULL where value test",
+    "1.3.0": "A None where value matches no rows",
 }
 
 parts_filename = "parts_test.parts"
@@ -121,3 +131,114 @@ def test_008_05_selected_rows_limit_offset(tmp_path):
     assert limit == len(part_set.get_property_set())
     assert part_set.get_property_set()[0].get_record_id() == part_value_set[2][0]
     datafile_close(parts_file)
+
+
+def test_008_06_get_total_quantities(tmp_path):
+    """
+    The total quantities are the summed item quantities per part number.
+    """
+    part_set, parts_file = base_setup(tmp_path)
+    load_datafile_table(parts_file, "items", item_columns, item_value_set)
+    totals = PartSet.get_total_quantities(parts_file)
+    expected = {}
+    for item in item_value_set:
+        expected[item[1]] = expected.get(item[1], 0) + item[3]
+    assert totals == expected
+    datafile_close(parts_file)
+
+
+def test_008_07_get_parts_listing(tmp_path):
+    """
+    The parts listing holds every Part with its source name and total
+    quantity used, ordered by part number.
+    """
+    part_set, parts_file = base_setup(tmp_path)
+    load_datafile_table(parts_file, "parts", part_columns, part_value_set)
+    load_datafile_table(parts_file, "items", item_columns, item_value_set)
+    load_datafile_table(parts_file, "sources", source_columns, source_value_set)
+    listing = PartSet.get_parts_listing(parts_file)
+    assert len(listing) == len(part_value_set)
+    for counter in range(0, len(listing) - 1):
+        assert listing[counter]["part_number"] <= listing[counter + 1]["part_number"]
+    for row in listing:
+        part = Part(parts_file, row["record_id"])
+        assert row["part_number"] == part.get_part_number()
+        assert row["description"] == part.get_description()
+        assert row["source"] == Source(parts_file, part.get_source()).get_source()
+        assert row["quantity"] == part.get_total_quantity()
+    datafile_close(parts_file)
+
+
+def test_008_08_columns(tmp_path):
+    """
+    A projected set reads only the requested columns and the record_id;
+    the other properties hold their defaults.
+    """
+    part_set, parts_file = base_setup(tmp_path)
+    load_datafile_table(parts_file, "parts", part_columns, part_value_set)
+    full_set = PartSet(parts_file, None, None, "part_number")
+    part_set = PartSet(parts_file, None, None, "part_number", columns=["part_number"])
+    assert part_set.get_table() == "parts"
+    assert part_set.get_datafile() == parts_file
+    assert part_set.get_number_elements() == full_set.get_number_elements()
+    assert part_set.build_option_list("part_number") == full_set.build_option_list(
+        "part_number"
+    )
+    for part, full_part in zip(part_set, full_set):
+        assert part.get_record_id() == full_part.get_record_id()
+        assert part.get_description() == ""
+        assert part.get_remarks() == ""
+
+    source = part_value_set[0][2]
+    part_set = PartSet(parts_file, "source", source, None, 2, None, ["part_number"])
+    assert part_set.get_number_elements() == min(
+        2, len([part for part in part_value_set if part[2] == source])
+    )
+    datafile_close(parts_file)
+
+
+def test_008_09_get_parts_listing_where(tmp_path):
+    """A listing selected by a parts column holds only the matching rows."""
+    part_set, parts_file = base_setup(tmp_path)
+    load_datafile_table(parts_file, "parts", part_columns, part_value_set)
+    load_datafile_table(parts_file, "items", item_columns, item_value_set)
+    load_datafile_table(parts_file, "sources", source_columns, source_value_set)
+    listing = PartSet.get_parts_listing(parts_file)
+    row = listing[1]
+    assert PartSet.get_parts_listing(
+        parts_file, where_column="record_id", where_value=row["record_id"]
+    ) == [row]
+    assert PartSet.get_parts_listing(
+        parts_file, where_column="part_number", where_value=row["part_number"]
+    ) == [row]
+    assert (
+        PartSet.get_parts_listing(
+            parts_file, where_column="part_number", where_value="no such part"
+        )
+        == []
+    )
+    datafile_close(parts_file)
+
+
+def test_008_10_null_value_no_rows(tmp_path):
+    """A where column without a value matches no rows."""
+    part_set, parts_file = base_setup(tmp_path)
+    load_datafile_table(parts_file, "parts", part_columns, part_value_set)
+    parts_file.sql_query(
+        "INSERT INTO parts (part_number, source, description, remarks) "
+        "VALUES (?, ?, ?, NULL)",
+        ["NULL-REMARKS", 1, "No remarks"],
+    )
+    assert PartSet.count(parts_file, "remarks", None) == 0
+    assert not PartSet.exists(parts_file, "remarks", None)
+    assert PartSet(parts_file, "remarks", None).get_number_elements() == 0
+    assert (
+        PartSet(
+            parts_file, "remarks", None, columns=["part_number"]
+        ).get_number_elements()
+        == 0
+    )
+    assert PartSet.get_parts_listing(parts_file, "remarks", None) == []
+    assert list(PartSet.stream(parts_file, "remarks", None)) == []
+    assert PartSet.count(parts_file) == len(part_value_set) + 1
+    datafile_close(parts_file)
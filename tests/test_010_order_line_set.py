@@ -137,3 +137,27 @@ def test_008_05_selected_rows_limit_offset(tmp_path):
         == order_line_value_set[2][0]
     )
     datafile_close(parts_file)
+
+
+def test_010_06_count_exists(tmp_path):
+    """
+    'count' and 'exists' match the rows of the set without building it.
+    """
+    order_line_set, parts_file = base_setup(tmp_path)
+    assert OrderLineSet.count(parts_file) == 0
+    assert not OrderLineSet.exists(parts_file, "order_number", "06-015")
+    load_datafile_table(
+        parts_file, "order_lines", order_line_columns, order_line_value_set
+    )
+    assert OrderLineSet.count(parts_file) == len(order_line_value_set)
+    order_number = order_line_value_set[0][1]
+    order_line_set = OrderLineSet(parts_file, "order_number", order_number)
+    assert (
+        OrderLineSet.count(parts_file, "order_number", order_number)
+        == order_line_set.get_number_elements()
+    )
+    assert OrderLineSet.exists(parts_file, "order_number", order_number)
+    assert OrderLineSet.exists(parts_file, "part_number", order_line_value_set[0][3])
+    assert not OrderLineSet.exists(parts_file, "order_number", "no such order")
+    assert OrderLineSet.count(parts_file, "order_number", "no such order") == 0
+    datafile_close(parts_file)
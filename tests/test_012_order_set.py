@@ -22,9 +22,16 @@ from lbk_library.testing_support import (
     filesystem,
     load_datafile_table,
 )
-from test_data import order_columns, order_value_set
+from test_data import (
+    order_columns,
+    order_line_columns,
+    order_line_value_set,
+    order_value_set,
+    source_columns,
+    source_value_set,
+)
 
-from elements import OrderSet
+from elements import Order, OrderLineSet, OrderSet, Source
 from pages import table_definition
 
 file_version = "1.0.0"
@@ -121,3 +128,56 @@ def test_012_05_selected_rows_limit_offset(tmp_path):
     assert limit == len(order_set.get_property_set())
     assert order_set.get_property_set()[0].get_record_id() == order_value_set[2][0]
     datafile_close(parts_file)
+
+
+def test_012_06_get_order_summaries(tmp_path):
+    """
+    The order summaries hold every Order with its source name, number
+    of order lines and the summed order line cost.
+    """
+    order_set, parts_file = base_setup(tmp_path)
+    load_datafile_table(parts_file, "orders", order_columns, order_value_set)
+    load_datafile_table(
+        parts_file, "order_lines", order_line_columns, order_line_value_set
+    )
+    load_datafile_table(parts_file, "sources", source_columns, source_value_set)
+    summaries = OrderSet.get_order_summaries(parts_file)
+    assert len(summaries) == len(order_value_set)
+    for summary in summaries:
+        order = Order(parts_file, summary["record_id"], "record_id")
+        order_lines = OrderLineSet(parts_file, "order_number", order.get_order_number())
+        lines_cost = 0.0
+        for order_line in order_lines:
+            lines_cost += order_line.get_line_cost()
+        assert summary["order_number"] == order.get_order_number()
+        assert summary["source"] == Source(parts_file, order.get_source()).get_source()
+        assert summary["number_lines"] == order_lines.get_number_elements()
+        assert round(summary["lines_cost"], 2) == round(lines_cost, 2)
+    datafile_close(parts_file)
+
+
+def test_012_07_get_order_summaries_paged(tmp_path):
+    """
+    The order summaries can be read a page at a time, in any summary
+    order, or for a single Order.
+    """
+    order_set, parts_file = base_setup(tmp_path)
+    load_datafile_table(parts_file, "orders", order_columns, order_value_set)
+    load_datafile_table(
+        parts_file, "order_lines", order_line_columns, order_line_value_set
+    )
+    load_datafile_table(parts_file, "sources", source_columns, source_value_set)
+    summaries = OrderSet.get_order_summaries(parts_file)
+    page = OrderSet.get_order_summaries(parts_file, "order_number", False, 3, 2)
+    assert page == summaries[2:5]
+    descending = OrderSet.get_order_summaries(parts_file, "order_number", True)
+    assert descending == list(reversed(summaries))
+    by_lines = OrderSet.get_order_summaries(parts_file, "number_lines")
+    assert [summary["number_lines"] for summary in by_lines] == sorted(
+        summary["number_lines"] for summary in summaries
+    )
+    single = OrderSet.get_order_summaries(
+        parts_file, where_column="record_id", where_value=summaries[1]["record_id"]
+    )
+    assert single == [summaries[1]]
+    datafile_close(parts_file)
@@ -0,0 +1,96 @@
+"""
+Test the ItemView class.
+
+File:       test_013_item_view.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.0.0
+"""
+
+import os
+import sys
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from lbk_library.testing_support import datafile_close, datafile_create, filesystem
+from test_setup import item_value_set, load_all_datafile_tables
+
+from elements import Condition, Item, ItemView, Part
+from pages import table_definition
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Initial release",
+}
+
+parts_filename = "parts_test.parts"
+
+
+def base_setup(tmp_path):
+    base_directory = filesystem(tmp_path)
+    filename = base_directory + "/" + parts_filename
+    parts_file = datafile_create(filename, table_definition)
+    return parts_file
+
+
+def test_013_01_constr(tmp_path):
+    """
+    An ItemView on an empty parts file has no rows.
+    """
+    parts_file = base_setup(tmp_path)
+    item_view = ItemView(parts_file)
+    assert isinstance(item_view, ItemView)
+    assert item_view.get_datafile() == parts_file
+    assert item_view.get_number_elements() == 0
+    assert len(item_view.get_property_set()) == 0
+    datafile_close(parts_file)
+
+
+def test_013_02_all_rows_in_assembly_order(tmp_path):
+    """
+    The view holds every Item, ordered by assembly.
+    """
+    parts_file = base_setup(tmp_path)
+    load_all_datafile_tables(parts_file)
+    item_view = ItemView(parts_file)
+    assert len(item_view) == len(item_value_set)
+    rows = item_view.get_property_set()
+    for counter in range(0, len(rows) - 1):
+        assert rows[counter]["assembly"] <= rows[counter + 1]["assembly"]
+    for row in rows:
+        assert sorted(row.keys()) == sorted(ItemView.COLUMNS)
+    datafile_close(parts_file)
+
+
+def test_013_03_joined_values(tmp_path):
+    """
+    Each row carries the condition name and part description.
+    """
+    parts_file = base_setup(tmp_path)
+    load_all_datafile_tables(parts_file)
+    for row in ItemView(parts_file):
+        item = Item(parts_file, row["record_id"])
+        part = Part(parts_file, item.get_part_number(), "part_number")
+        condition = Condition(parts_file, item.get_condition())
+        assert row["part_number"] == item.get_part_number()
+        assert row["quantity"] == item.get_quantity()
+        assert row["description"] == part.get_description()
+        assert row["condition"] == condition.get_condition()
+    datafile_close(parts_file)
+
+
+def test_013_04_selected_rows(tmp_path):
+    """
+    The view can be restricted to a single column value.
+    """
+    parts_file = base_setup(tmp_path)
+    load_all_datafile_tables(parts_file)
+    item_view = ItemView(parts_file, "part_number", "17005")
+    expected = [item for item in item_value_set if item[1] == "17005"]
+    assert len(item_view) == len(expected)
+    for row in item_view:
+        assert row["part_number"] == "17005"
+    datafile_close(parts_file)
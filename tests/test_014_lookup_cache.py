@@ -0,0 +1,114 @@
+"""
+Test the LookupCache class.
+
+File:       test_014_lookup_cache.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.0.0
+"""
+
+import os
+import sys
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from lbk_library.testing_support import (
+    datafile_close,
+    datafile_create,
+    filesystem,
+    load_datafile_table,
+)
+from test_data import (
+    condition_columns,
+    condition_value_set,
+    source_columns,
+    source_value_set,
+)
+
+from elements import Condition, LookupCache, Source, get_lookup_cache
+from pages import table_definition
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Initial release",
+}
+
+parts_filename = "parts_test.parts"
+
+
+def base_setup(tmp_path):
+    base_directory = filesystem(tmp_path)
+    filename = base_directory + "/" + parts_filename
+    parts_file = datafile_create(filename, table_definition)
+    load_datafile_table(parts_file, "sources", source_columns, source_value_set)
+    load_datafile_table(
+        parts_file, "conditions", condition_columns, condition_value_set
+    )
+    return parts_file
+
+
+def test_014_01_get_lookup_cache(tmp_path):
+    """
+    Each parts file has a single lookup cache.
+    """
+    parts_file = base_setup(tmp_path)
+    cache = get_lookup_cache(parts_file)
+    assert isinstance(cache, LookupCache)
+    assert get_lookup_cache(parts_file) is cache
+    datafile_close(parts_file)
+
+
+def test_014_02_get_names(tmp_path):
+    """
+    The cached names match the parts file tables.
+    """
+    parts_file = base_setup(tmp_path)
+    cache = get_lookup_cache(parts_file)
+    cache.load()
+    for source in source_value_set:
+        assert cache.get_source(source[0]) == source[1]
+        assert cache.get_source(str(source[0])) == source[1]
+    for condition in condition_value_set:
+        assert cache.get_condition(condition[0]) == condition[1]
+    assert cache.get_source(9999) == ""
+    assert cache.get_condition(None) == ""
+    datafile_close(parts_file)
+
+
+def test_014_03_no_query_after_load(tmp_path, mocker):
+    """
+    Names are served from memory once the tables are loaded.
+    """
+    parts_file = base_setup(tmp_path)
+    cache = get_lookup_cache(parts_file)
+    cache.load()
+    spy = mocker.spy(parts_file, "sql_query")
+    for source in source_value_set:
+        cache.get_source(source[0])
+    for condition in condition_value_set:
+        cache.get_condition(condition[0])
+    assert spy.call_count == 0
+    datafile_close(parts_file)
+
+
+def test_014_04_invalidated_on_write(tmp_path):
+    """
+    Adding or updating a Source or Condition refreshes the names.
+    """
+    parts_file = base_setup(tmp_path)
+    cache = get_lookup_cache(parts_file)
+    cache.load()
+
+    source = Source(parts_file, source_value_set[0][0])
+    source.set_source("Revised Source")
+    source.update()
+    assert cache.get_source(source_value_set[0][0]) == "Revised Source"
+
+    condition = Condition(parts_file)
+    condition.set_condition("Rusted")
+    condition.add()
+    assert "Rusted" in cache.get_lookup("conditions").values()
+    datafile_close(parts_file)
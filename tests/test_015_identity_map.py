@@ -0,0 +1,172 @@
+"""
+Test the IdentityMap class and the Element 'get_element' lookups.
+
+File:       test_015_identity_map.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.2.0
+"""
+
+import os
+import sys
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from lbk_library.testing_support import datafile_close, datafile_create, filesystem
+from test_setup import (
+    item_value_set,
+    load_all_datafile_tables,
+    order_value_set,
+    part_value_set,
+)
+
+from elements import IdentityMap, Item, Order, Part, get_identity_map
+from pages import table_definition
+
+file_version = "1.2.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Added the writes by another instance test",
+    "1.2.0": "Added the edit copy test",
+}
+
+parts_filename = "parts_test.parts"
+
+
+def base_setup(tmp_path):
+    base_directory = filesystem(tmp_path)
+    filename = base_directory + "/" + parts_filename
+    parts_file = datafile_create(filename, table_definition)
+    load_all_datafile_tables(parts_file)
+    return parts_file
+
+
+def test_015_01_get_identity_map(tmp_path):
+    """
+    Each parts file has a single identity map.
+    """
+    parts_file = base_setup(tmp_path)
+    identity_map = get_identity_map(parts_file)
+    assert isinstance(identity_map, IdentityMap)
+    assert get_identity_map(parts_file) is identity_map
+    datafile_close(parts_file)
+
+
+def test_015_02_same_instance(tmp_path):
+    """
+    Repeated lookups return the same instance.
+    """
+    parts_file = base_setup(tmp_path)
+    item = Item.get_element(parts_file, item_value_set[0][0])
+    assert item.get_record_id() == item_value_set[0][0]
+    assert Item.get_element(parts_file, item_value_set[0][0]) is item
+    assert Item.get_element(parts_file, str(item_value_set[0][0])) is item
+
+    part = Part.get_element(parts_file, part_value_set[0][1], "part_number")
+    assert Part.get_element(parts_file, part.get_record_id()) is part
+
+    order = Order.get_element(parts_file, order_value_set[0][1])
+    assert Order.get_element(parts_file, order.get_record_id(), "record_id") is order
+    datafile_close(parts_file)
+
+
+def test_015_03_no_query_when_held(tmp_path, mocker):
+    """
+    A held Element is returned without reading the parts file.
+    """
+    parts_file = base_setup(tmp_path)
+    item = Item.get_element(parts_file, item_value_set[0][0])
+    spy = mocker.spy(parts_file, "sql_query")
+    Item.get_element(parts_file, item_value_set[0][0])
+    assert spy.call_count == 0
+    datafile_close(parts_file)
+
+
+def test_015_04_changed_element_not_returned(tmp_path):
+    """
+    An Element with unsaved changes is replaced by a fresh copy.
+    """
+    parts_file = base_setup(tmp_path)
+    item = Item.get_element(parts_file, item_value_set[0][0])
+    item.set_quantity(item.get_quantity() + 1)
+    fresh = Item.get_element(parts_file, item_value_set[0][0])
+    assert fresh is not item
+    assert fresh.get_quantity() == item_value_set[0][3]
+    datafile_close(parts_file)
+
+
+def test_015_05_update_and_delete(tmp_path):
+    """
+    Updates remap the changed keys and deletes drop the Element.
+    """
+    parts_file = base_setup(tmp_path)
+    part = Part.get_element(parts_file, part_value_set[0][1], "part_number")
+    part.set_part_number("NEW-PART")
+    assert part.update()
+    assert Part.get_element(parts_file, "NEW-PART", "part_number") is part
+    assert Part.get_element(parts_file, part_value_set[0][1], "part_number") is not part
+
+    item = Item.get_element(parts_file, item_value_set[0][0])
+    item.delete()
+    assert Item.get_element(parts_file, item_value_set[0][0]) is not item
+    datafile_close(parts_file)
+
+
+def test_015_06_lru_eviction(tmp_path):
+    """
+    Only 'capacity' Elements are kept alive by the map.
+    """
+    parts_file = base_setup(tmp_path)
+    identity_map = IdentityMap(2)
+    for item in item_value_set[:3]:
+        identity_map.put(Item(parts_file, item[0]))
+    assert identity_map.get("items", "record_id", item_value_set[0][0]) is None
+    assert identity_map.get("items", "record_id", item_value_set[2][0]) is not None
+    datafile_close(parts_file)
+
+
+def test_015_07_written_by_another_instance(tmp_path):
+    """
+    A write through any instance evicts the row held.
+    """
+    parts_file = base_setup(tmp_path)
+    part = Part.get_element(parts_file, part_value_set[0][1], "part_number")
+    other = Part(parts_file, part_value_set[0][1], "part_number")
+    assert other is not part
+    other.set_part_number("RENAMED")
+    assert other.update()
+    assert Part.get_element(parts_file, part_value_set[0][1], "part_number") is not part
+    assert (
+        Part.get_element(parts_file, part_value_set[0][0]).get_part_number()
+        == "RENAMED"
+    )
+
+    item = Item.get_element(parts_file, item_value_set[0][0])
+    Item(parts_file, item_value_set[0][0]).delete()
+    assert Item.get_element(parts_file, item_value_set[0][0]) is not item
+    datafile_close(parts_file)
+
+
+def test_015_08_edit_copy(tmp_path, mocker):
+    """
+    An Element opened for editing is a copy of its own, leaving the one
+    held unchanged.
+    """
+    parts_file = base_setup(tmp_path)
+    item = Item.get_element(parts_file, item_value_set[0][0])
+    spy = mocker.spy(parts_file, "sql_query")
+    first = Item.get_element(parts_file, item_value_set[0][0], edit=True)
+    second = Item.get_element(parts_file, item_value_set[0][0], edit=True)
+    assert spy.call_count == 0
+    assert first is not item and second is not item and first is not second
+    assert first.get_properties() == item.get_properties()
+    first.set_quantity(item.get_quantity() + 1)
+    assert second.get_quantity() == item.get_quantity()
+    assert not item.have_values_changed()
+
+    part = Part.get_element(parts_file, part_value_set[1][1], "part_number", True)
+    assert Part.get_element(parts_file, part_value_set[1][1], "part_number") is not part
+    datafile_close(parts_file)
@@ -0,0 +1,100 @@
+"""
+Test the trusted construction of Elements read by the ElementSets.
+
+File:       test_016_trusted_element.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.0.0
+"""
+
+import os
+import sys
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from lbk_library.testing_support import datafile_close, datafile_create, filesystem
+from test_setup import load_all_datafile_tables
+
+from elements import (
+    Item,
+    ItemSet,
+    Order,
+    OrderLine,
+    OrderLineSet,
+    OrderSet,
+    Part,
+    PartSet,
+    trusted_rows,
+)
+from elements.trusted_element import rows_are_trusted
+from pages import table_definition
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Initial release",
+}
+
+parts_filename = "parts_test.parts"
+
+
+def base_setup(tmp_path):
+    base_directory = filesystem(tmp_path)
+    filename = base_directory + "/" + parts_filename
+    parts_file = datafile_create(filename, table_definition)
+    load_all_datafile_tables(parts_file)
+    return parts_file
+
+
+def test_016_01_trusted_rows(tmp_path):
+    """
+    Rows are trusted only inside a 'trusted_rows' block.
+    """
+    assert not rows_are_trusted()
+    with trusted_rows():
+        assert rows_are_trusted()
+        with trusted_rows():
+            assert rows_are_trusted()
+        assert rows_are_trusted()
+    assert not rows_are_trusted()
+
+
+def test_016_02_same_properties(tmp_path):
+    """
+    Elements from the sets match the validated Elements.
+    """
+    parts_file = base_setup(tmp_path)
+    for element_set, element_type in (
+        (ItemSet(parts_file), Item),
+        (PartSet(parts_file), Part),
+        (OrderSet(parts_file), Order),
+        (OrderLineSet(parts_file), OrderLine),
+    ):
+        for element in element_set:
+            if element_type in (Part, Order):
+                validated = element_type(
+                    parts_file, element.get_record_id(), "record_id"
+                )
+            else:
+                validated = element_type(parts_file, element.get_record_id())
+            assert element.get_properties() == validated.get_properties()
+            assert element.is_element_valid() == validated.is_element_valid()
+            assert not element.have_values_changed()
+    datafile_close(parts_file)
+
+
+def test_016_03_flags_after_change(tmp_path):
+    """
+    Modifying a trusted Element sets the flags as usual.
+    """
+    parts_file = base_setup(tmp_path)
+    item = ItemSet(parts_file, None, None, "record_id").get(0)
+    assert not item.have_values_changed()
+    item.set_quantity(item.get_quantity() + 1)
+    assert item.have_values_changed()
+    assert item.is_element_valid()
+    item.set_assembly("")
+    assert not item.is_element_valid()
+    datafile_close(parts_file)
@@ -0,0 +1,138 @@
+"""
+Test the read only Records and the 'get_records' mode of the sets.
+
+File:       test_017_record.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.1.0
+"""
+
+import os
+import sys
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from lbk_library.testing_support import datafile_close, datafile_create, filesystem
+from test_setup import item_value_set, load_all_datafile_tables
+
+from elements import (
+    Item,
+    ItemRecord,
+    ItemSet,
+    OrderLineSet,
+    OrderRecord,
+    OrderSet,
+    PartRecord,
+    PartSet,
+)
+from pages import table_definition
+
+file_version = "1.1.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "A record opens a copy of the Element held",
+}
+
+parts_filename = "parts_test.parts"
+
+
+def base_setup(tmp_path):
+    base_directory = filesystem(tmp_path)
+    filename = base_directory + "/" + parts_filename
+    parts_file = datafile_create(filename, table_definition)
+    load_all_datafile_tables(parts_file)
+    return parts_file
+
+
+def test_017_01_records_match_elements(tmp_path):
+    """
+    The records hold the same values as the Elements of the sets.
+    """
+    parts_file = base_setup(tmp_path)
+    for element_set in (
+        ItemSet(parts_file, None, None, "record_id"),
+        PartSet(parts_file, None, None, "record_id"),
+        OrderSet(parts_file, None, None, "record_id"),
+        OrderLineSet(parts_file, None, None, "record_id"),
+    ):
+        records = element_set.get_records(parts_file, None, None, "record_id")
+        assert len(records) == element_set.get_number_elements()
+        for record, element in zip(records, element_set):
+            assert record.get_properties() == element.get_properties()
+    datafile_close(parts_file)
+
+
+def test_017_02_selection(tmp_path):
+    """
+    The where, order, limit and offset parameters select the rows.
+    """
+    parts_file = base_setup(tmp_path)
+    part_number = item_value_set[0][1]
+    records = ItemSet.get_records(parts_file, "part_number", part_number, "assembly")
+    items = ItemSet(parts_file, "part_number", part_number, "assembly")
+    assert [record.record_id for record in records] == [
+        item.get_record_id() for item in items
+    ]
+    assert all(isinstance(record, ItemRecord) for record in records)
+
+    records = ItemSet.get_records(parts_file, None, None, "record_id", 2, 1)
+    record_ids = sorted(item[0] for item in item_value_set)
+    assert [record.record_id for record in records] == record_ids[1:3]
+    datafile_close(parts_file)
+
+
+def test_017_03_read_only(tmp_path):
+    """
+    Record values can be read but not changed.
+    """
+    parts_file = base_setup(tmp_path)
+    record = PartSet.get_records(parts_file)[0]
+    assert isinstance(record, PartRecord)
+    assert record["part_number"] == record.part_number
+    with pytest.raises(AttributeError):
+        record.part_number = "new"
+    with pytest.raises(AttributeError):
+        record.extra = 1
+    with pytest.raises(KeyError):
+        record["extra"]
+    assert not hasattr(record, "__dict__")
+    datafile_close(parts_file)
+
+
+def test_017_04_interned(tmp_path):
+    """
+    Repeated values of the interned columns share one string.
+    """
+    parts_file = base_setup(tmp_path)
+    records = ItemSet.get_records(parts_file)
+    by_part_number = {}
+    for record in records:
+        first = by_part_number.setdefault(record.part_number, record.part_number)
+        assert first is record.part_number
+    datafile_close(parts_file)
+
+
+def test_017_05_get_element(tmp_path):
+    """
+    A record opens the full Element of its row.
+    """
+    parts_file = base_setup(tmp_path)
+    record = ItemSet.get_records(parts_file)[0]
+    item = record.get_element(parts_file)
+    assert isinstance(item, Item)
+    assert item.get_properties() == record.get_properties()
+    # each edit session has an Item of its own
+    assert record.get_element(parts_file) is not item
+
+    record = OrderSet.get_records(parts_file)[0]
+    assert isinstance(record, OrderRecord)
+    assert record.get_element(parts_file).get_record_id() == record.record_id
+
+    record = OrderLineSet.get_records(parts_file)[0]
+    assert record.get_element(parts_file).get_record_id() == record.record_id
+    datafile_close(parts_file)
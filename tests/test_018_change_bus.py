@@ -0,0 +1,223 @@
+"""
+Test the ChangeBus class and the events published by the Elements.
+
+File:       test_018_change_bus.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.1.0
+"""
+
+import gc
+import os
+import sys
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from lbk_library.testing_support import (
+    datafile_close,
+    datafile_create,
+    filesystem,
+    load_datafile_table,
+)
+from test_data import (
+    condition_columns,
+    condition_value_set,
+    item_columns,
+    item_value_set,
+)
+
+from elements import (
+    ADDED,
+    DELETED,
+    UPDATED,
+    ChangeBus,
+    ChangeEvent,
+    Condition,
+    Item,
+    get_change_bus,
+    get_lookup_cache,
+)
+from pages import table_definition
+
+file_version = "1.1.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Added the repeated update test",
+}
+
+parts_filename = "parts_test.parts"
+
+
+def base_setup(tmp_path):
+    base_directory = filesystem(tmp_path)
+    filename = base_directory + "/" + parts_filename
+    parts_file = datafile_create(filename, table_definition)
+    load_datafile_table(parts_file, "items", item_columns, item_value_set)
+    load_datafile_table(
+        parts_file, "conditions", condition_columns, condition_value_set
+    )
+    return parts_file
+
+
+class Listener:
+    """A subscriber held only by the test."""
+
+    def __init__(self):
+        self.events = []
+
+    def changed(self, event):
+        self.events.append(event)
+
+
+def test_018_01_get_change_bus(tmp_path):
+    """
+    Each parts file has a single change bus.
+    """
+    parts_file = base_setup(tmp_path)
+    bus = get_change_bus(parts_file)
+    assert isinstance(bus, ChangeBus)
+    assert get_change_bus(parts_file) is bus
+    datafile_close(parts_file)
+
+
+def test_018_02_subscribe(tmp_path):
+    """
+    Subscribers get the events of their tables, in subscription order.
+    """
+    bus = ChangeBus()
+    received = []
+    first = lambda event: received.append(("first", event.table))  # noqa: E731
+    second = lambda event: received.append(("second", event.table))  # noqa: E731
+    everything = lambda event: received.append(("all", event.table))  # noqa: E731
+    bus.subscribe(second, ["items"])
+    bus.subscribe(everything)
+    bus.subscribe(first, ["items", "parts"], first=True)
+    assert bus.has_subscribers("items")
+    assert bus.has_subscribers("orders")
+
+    bus.publish(ChangeEvent("items", 1, UPDATED, ("remarks",), {}, {}))
+    assert received == [("first", "items"), ("second", "items"), ("all", "items")]
+    received.clear()
+    bus.publish(ChangeEvent("parts", 1, ADDED, (), {}, {}))
+    assert received == [("first", "parts"), ("all", "parts")]
+
+    received.clear()
+    bus.unsubscribe(everything)
+    bus.unsubscribe(first)
+    assert not bus.has_subscribers("parts")
+    bus.publish(ChangeEvent("parts", 1, ADDED, (), {}, {}))
+    assert received == []
+
+
+def test_018_03_weak_subscriber(tmp_path):
+    """
+    A bound method subscribed does not keep its object alive.
+    """
+    bus = ChangeBus()
+    listener = Listener()
+    bus.subscribe(listener.changed, ["items"])
+    bus.publish(ChangeEvent("items", 1, DELETED, (), {}, {}))
+    assert len(listener.events) == 1
+    del listener
+    gc.collect()
+    assert not bus.has_subscribers("items")
+    bus.publish(ChangeEvent("items", 1, DELETED, (), {}, {}))
+
+
+def test_018_04_item_events(tmp_path):
+    """
+    Item writes publish the row and the columns changed.
+    """
+    parts_file = base_setup(tmp_path)
+    listener = Listener()
+    get_change_bus(parts_file).subscribe(listener.changed, ["items"])
+
+    item = Item(parts_file, item_value_set[1][0])
+    old_quantity = item.get_quantity()
+    item.set_quantity(old_quantity + 2)
+    item.set_remarks("changed")
+    assert item.update()
+    event = listener.events[-1]
+    assert event.table == "items"
+    assert event.record_id == item.get_record_id()
+    assert event.action == UPDATED
+    assert "quantity" in event.columns
+    assert "remarks" in event.columns
+    assert "part_number" not in event.columns
+    assert event.values["quantity"] == old_quantity + 2
+    assert event.old_values["quantity"] == old_quantity
+
+    # an update changing nothing is not published
+    listener.events.clear()
+    item = Item(parts_file, item_value_set[1][0])
+    item.update()
+    assert listener.events == []
+
+    item = Item(parts_file, {"part_number": "NEW1", "assembly": "ZZ"})
+    record_id = item.add()
+    event = listener.events[-1]
+    assert event.action == ADDED
+    assert event.record_id == record_id
+    assert event.values["assembly"] == "ZZ"
+
+    item = Item(parts_file, record_id)
+    assert item.delete()
+    event = listener.events[-1]
+    assert event.action == DELETED
+    assert event.record_id == record_id
+    assert event.values["part_number"] == "NEW1"
+    datafile_close(parts_file)
+
+
+def test_018_05_cache_first(tmp_path):
+    """
+    The lookup cache is invalidated before the other subscribers run.
+    """
+    parts_file = base_setup(tmp_path)
+    cache = get_lookup_cache(parts_file)
+    cache.load()
+    names = []
+    get_change_bus(parts_file).subscribe(
+        lambda event: names.append(cache.get_condition(event.record_id)),
+        ["conditions"],
+    )
+    record_id = condition_value_set[0][0]
+    condition = Condition(parts_file, record_id)
+    condition.set_condition("Renamed")
+    condition.update()
+    assert names == ["Renamed"]
+    datafile_close(parts_file)
+
+
+def test_018_06_repeated_update(tmp_path):
+    """
+    The old values of an update are those of the previous write, not
+    those first read.
+    """
+    parts_file = base_setup(tmp_path)
+    listener = Listener()
+    get_change_bus(parts_file).subscribe(listener.changed, ["items"])
+
+    item = Item(parts_file, item_value_set[1][0])
+    old_quantity = item.get_quantity()
+    item.set_quantity(old_quantity + 2)
+    assert item.update()
+    item.set_quantity(old_quantity + 5)
+    assert item.update()
+    event = listener.events[-1]
+    assert event.columns == ("quantity",)
+    assert event.old_values == {"quantity": old_quantity + 2}
+    assert event.values["quantity"] == old_quantity + 5
+
+    listener.events.clear()
+    item.update()
+    assert listener.events == []
+
+    assert item.delete()
+    event = listener.events[-1]
+    assert event.action == DELETED
+    assert event.values["quantity"] == old_quantity + 5
+    datafile_close(parts_file)
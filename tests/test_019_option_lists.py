@@ -0,0 +1,127 @@
+"""
+Test the OptionListCache class.
+
+File:       test_019_option_lists.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.0.0
+"""
+
+import os
+import sys
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from lbk_library.testing_support import (
+    datafile_close,
+    datafile_create,
+    filesystem,
+    load_datafile_table,
+)
+from test_data import (
+    condition_columns,
+    condition_value_set,
+    item_columns,
+    item_value_set,
+)
+
+from elements import (
+    Condition,
+    ConditionSet,
+    Item,
+    ItemSet,
+    OptionListCache,
+    get_option_lists,
+)
+from pages import table_definition
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Initial release",
+}
+
+parts_filename = "parts_test.parts"
+
+
+def base_setup(tmp_path):
+    base_directory = filesystem(tmp_path)
+    filename = base_directory + "/" + parts_filename
+    parts_file = datafile_create(filename, table_definition)
+    load_datafile_table(parts_file, "items", item_columns, item_value_set)
+    load_datafile_table(
+        parts_file, "conditions", condition_columns, condition_value_set
+    )
+    return parts_file
+
+
+def test_019_01_get_option_lists(tmp_path):
+    """
+    Each parts file has a single option list cache.
+    """
+    parts_file = base_setup(tmp_path)
+    cache = get_option_lists(parts_file)
+    assert isinstance(cache, OptionListCache)
+    assert get_option_lists(parts_file) is cache
+    datafile_close(parts_file)
+
+
+def test_019_02_option_lists(tmp_path):
+    """
+    The lists match those built by the ElementSets.
+    """
+    parts_file = base_setup(tmp_path)
+    cache = get_option_lists(parts_file)
+    assert cache.get_option_list("conditions", "condition") == ConditionSet(
+        parts_file
+    ).build_option_list("condition")
+    assert cache.get_option_list("items", "record_id", "record_id") == ItemSet(
+        parts_file, None, None, "record_id"
+    ).build_option_list("record_id")
+    datafile_close(parts_file)
+
+
+def test_019_03_no_query_when_cached(tmp_path, mocker):
+    """
+    A list is read from the parts file only once.
+    """
+    parts_file = base_setup(tmp_path)
+    cache = get_option_lists(parts_file)
+    conditions = cache.get_option_list("conditions", "condition")
+    spy = mocker.spy(parts_file, "sql_query")
+    assert cache.get_option_list("conditions", "condition") is conditions
+    assert spy.call_count == 0
+    datafile_close(parts_file)
+
+
+def test_019_04_invalidated_on_write(tmp_path):
+    """
+    A write to a table discards the lists it changes.
+    """
+    parts_file = base_setup(tmp_path)
+    cache = get_option_lists(parts_file)
+    record_ids = cache.get_option_list("items", "record_id", "record_id")
+    conditions = cache.get_option_list("conditions", "condition")
+
+    # updating other columns keeps the list
+    item = Item(parts_file, item_value_set[0][0])
+    item.set_remarks("revised")
+    item.update()
+    assert cache.get_option_list("items", "record_id", "record_id") is record_ids
+
+    item = Item(parts_file, {"part_number": "NEW1", "assembly": "ZZ"})
+    record_id = item.add()
+    record_ids = cache.get_option_list("items", "record_id", "record_id")
+    assert str(record_id) in record_ids
+
+    condition = Condition(parts_file, condition_value_set[0][0])
+    condition.set_condition("Renamed")
+    condition.update()
+    conditions = cache.get_option_list("conditions", "condition")
+    assert "Renamed" in conditions
+
+    cache.invalidate()
+    assert cache.get_option_list("conditions", "condition") is not conditions
+    datafile_close(parts_file)
@@ -5,7 +5,7 @@ File:       test_101_dialog_support.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version     1.1.0
+Version     1.2.0
 """
 
 import os
@@ -15,7 +15,6 @@ src_path = os.path.join(os.path.realpath("."), "src")
 if src_path not in sys.path:
     sys.path.append(src_path)
 
-
 from lbk_library import DataFile as PartsFile
 from lbk_library.testing_support import (
     datafile_close,
@@ -23,7 +22,6 @@ from lbk_library.testing_support import (
     filesystem,
     load_datafile_table,
 )
-from PySide6.QtWidgets import QTableWidget  # QPushButton,
 from test_data import (
     order_columns,
     order_line_columns,
@@ -40,11 +38,13 @@ from dialogs import (  # ; buttons_enable,; ;
     set_table_header,
 )
 from pages import table_definition
+from qt_compat.QtWidgets import QTableWidget  # QPushButton,
 
-file_version = "1.1.0"
+file_version = "1.2.0"
 changes = {
     "1.0.0": "Initial release",
     "1.1.0": "Revised to match the refactored dialog_support.py file",
+    "1.2.0": "Import Qt through 'qt_compat'",
 }
 
 
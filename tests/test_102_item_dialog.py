@@ -5,7 +5,7 @@ File:       test_102_item_dialog.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file License
-Version:    1.0.0
+Version:    1.5.0
 """
 
 import os
@@ -23,7 +23,6 @@ from lbk_library.testing_support import (
     long_string,
     test_string,
 )
-from PySide6.QtWidgets import QMainWindow, QMessageBox
 from test_setup import (
     condition_value_set,
     datafile_name,
@@ -46,10 +45,16 @@ from elements import (
 )
 from forms import Ui_ItemDialog
 from pages import table_definition
+from qt_compat.QtWidgets import QMainWindow, QMessageBox
 
-file_version = "1.0.0"
+file_version = "1.5.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Import Qt through 'qt_compat'",
+    "1.2.0": "Added the record navigation tests",
+    "1.3.0": "Added the part number completer test",
+    "1.4.0": "Added the rebind test",
+    "1.5.0": "The rebind test checks the delete button and order table",
 }
 
 
@@ -555,3 +560,105 @@ def test_102_19_set_tooltips(qtbot, tmp_path):
     assert dialog.save_done_button.toolTip() == dialog.TOOLTIPS["save_done"]
 
     datafile_close(parts_file)
+
+
+def test_102_20_record_navigation(qtbot, tmp_path, mocker):
+    parts_file, main, dialog = setup_item_dialog(qtbot, tmp_path)
+    mocker.patch.object(Dialog, "message_box_exec")
+    record_ids = sorted(item[0] for item in item_value_set)
+
+    # the record_ids are listed only as read, any may be typed in
+    dialog = ItemDialog(main, parts_file, record_ids[0], Dialog.EDIT_ELEMENT)
+    assert dialog.record_ids.rowCount() <= dialog.record_ids.PAGE_SIZE
+    dialog.record_id_combo.setEditText(str(record_ids[-1]))
+    dialog.action_record_id_changed()
+    assert dialog.get_element().get_record_id() == record_ids[-1]
+
+    # a record_id that is not a number is ignored
+    dialog.record_id_combo.setEditText("abc")
+    dialog.action_record_id_changed()
+    assert dialog.record_id_combo.currentText() == str(record_ids[-1])
+
+    # step through the items in record_id order
+    assert dialog.action_next_record() is None
+    assert dialog.action_previous_record() == record_ids[-2]
+    assert dialog.record_id_combo.currentText() == str(record_ids[-2])
+    dialog = ItemDialog(main, parts_file, record_ids[0], Dialog.EDIT_ELEMENT)
+    assert dialog.action_previous_record() is None
+    assert dialog.action_next_record() == record_ids[1]
+    item = Item(parts_file, record_ids[1])
+    assert dialog.assembly_edit.text() == item.get_assembly()
+
+    # stepping away from unsaved changes asks first
+    dialog.message_box_exec.return_value = QMessageBox.StandardButton.Cancel
+    dialog.assembly_edit.setText("ZZZ")
+    dialog.action_assembly_edit()
+    dialog.action_next_record()
+    assert dialog.record_id_combo.currentText() == str(record_ids[1])
+
+    # no stepping while adding an item
+    dialog = ItemDialog(main, parts_file, None, Dialog.ADD_ELEMENT)
+    assert not dialog.next_button.isEnabled()
+    assert not dialog.previous_button.isEnabled()
+    datafile_close(parts_file)
+
+
+def test_102_21_part_number_completer(qtbot, tmp_path):
+    parts_file, main, dialog = setup_item_dialog(qtbot, tmp_path)
+
+    # the part numbers are not listed, the matches are offered as typed
+    assert dialog.part_number_combo.isEditable()
+    assert dialog.part_number_combo.count() == 0
+    assert dialog.part_number_combo.completer() is dialog.part_number_completer
+    dialog.part_number_completer.setCompletionPrefix(part_value_set[2][1])
+    model = dialog.part_number_completer.part_numbers
+    assert model.data(model.index(0, 0)) == part_value_set[2][1]
+    assert model.data(model.index(0, 1)) == part_value_set[2][3]
+
+    part = Part(parts_file, part_value_set[2][1], "part_number")
+    dialog.part_number_combo.setEditText(part_value_set[2][1])
+    dialog.part_number_completer.activated.emit(part_value_set[2][1])
+    assert dialog.get_element().get_part_number() == part.get_part_number()
+    assert dialog.description_text.text() == part.get_description()
+    assert not dialog.part_number_combo.error
+
+    # a part number typed in must be in the parts file
+    dialog.part_number_combo.setEditText("NOT A PART")
+    result = dialog.action_part_number_combo()
+    assert not result["valid"]
+    assert dialog.part_number_combo.error
+    assert dialog.description_text.text() == ""
+    datafile_close(parts_file)
+
+
+def test_102_22_rebind(qtbot, tmp_path):
+    parts_file, main, dialog = setup_item_dialog(qtbot, tmp_path)
+    record_ids = sorted(item[0] for item in item_value_set)
+
+    dialog = ItemDialog(main, parts_file, None, Dialog.ADD_ELEMENT)
+    dialog.assembly_edit.setText("")
+    dialog.action_assembly_edit()
+    assert dialog.assembly_edit.error
+
+    # the same dialog shows another item, as if newly built
+    dialog.rebind(record_ids[1], Dialog.EDIT_ELEMENT)
+    item = Item(parts_file, record_ids[1])
+    assert dialog.get_operation() == Dialog.EDIT_ELEMENT
+    assert dialog.get_element().get_record_id() == record_ids[1]
+    assert dialog.record_id_combo.currentText() == str(record_ids[1])
+    assert dialog.record_id_combo.isEnabled()
+    assert dialog.assembly_edit.text() == item.get_assembly()
+    assert not dialog.assembly_edit.error
+    assert dialog.assembly_edit.toolTip() == dialog.TOOLTIPS["assembly"]
+    assert dialog.delete_button.isEnabled()
+
+    # an item with orders fills the order table, emptied for the next
+    dialog.rebind(1322, Dialog.EDIT_ELEMENT)
+    assert dialog.order_table.rowCount() > 0
+
+    dialog.rebind(None, Dialog.ADD_ELEMENT)
+    assert dialog.get_element().get_record_id() == 0
+    assert not dialog.record_id_combo.isEnabled()
+    assert not dialog.delete_button.isEnabled()
+    assert dialog.order_table.rowCount() == 0
+    datafile_close(parts_file)
@@ -5,7 +5,7 @@ File:       test_103_edit_conditions_dialog.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2024 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.1.0
+Version:    1.2.0
 """
 
 import os
@@ -21,7 +21,6 @@ from lbk_library.testing_support import (
     datafile_create,
     filesystem,
 )
-from PySide6.QtCore import QModelIndex, Qt
 from test_setup import (
     datafile_name,
     load_all_datafile_tables,
@@ -31,11 +30,13 @@ from dialogs import EditConditionsDialog
 from elements import Condition, ConditionSet
 from forms import Ui_TableDialog
 from pages import table_definition
+from qt_compat.QtCore import QModelIndex, Qt
 
-file_version = "1.1.0"
+file_version = "1.2.0"
 changes = {
     "1.0.0": "Initial release",
     "1.1.0": "Changed library 'PyQt5' to 'PySide6' and code cleanup",
+    "1.2.0": "Import Qt through 'qt_compat'",
 }
 
 
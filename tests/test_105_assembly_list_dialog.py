@@ -5,7 +5,7 @@ File:       test_104_assembly_list_dialog.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file License
-Version     1.1.0
+Version     1.2.0
 """
 
 import csv
@@ -19,18 +19,19 @@ if src_path not in sys.path:
 # from lbk_library import DataFile as PartsFile
 from lbk_library.gui import Dialog
 from lbk_library.testing_support import datafile_close, datafile_create, filesystem
-from PySide6.QtCore import QSettings
-from PySide6.QtWidgets import QFileDialog, QMainWindow, QMessageBox
 from test_setup import datafile_name, item_value_set, load_all_datafile_tables
 
 from dialogs import AssemblyListDialog
 from elements import Item, Part
 from pages import table_definition
+from qt_compat.QtCore import QSettings
+from qt_compat.QtWidgets import QFileDialog, QMainWindow, QMessageBox
 
-file_version = "1.1.0"
+file_version = "1.2.0"
 changes = {
     "1.0.0": "Initial release",
     "1.1.0": "Changed library 'PyQt5' to 'PySide6' and code cleanup",
+    "1.2.0": "Import Qt through 'qt_compat'",
 }
 
 
@@ -264,3 +265,15 @@ def test_105_10_action_write_file(qtbot, tmp_path, mocker):
         num_lines = len(fp.readlines())
     assert num_lines == len(item_set) + 1  # Length of item set plus header line
     assert dialog.isHidden()  # widget is hidden on a close event.
+
+
+def test_105_11_stream_items(qtbot, tmp_path):
+    parts_file, main, dialog = setup_assembly_dialog(qtbot, tmp_path)
+
+    items = dialog.stream_items("C", "CZZZ")
+    assert not isinstance(items, list)
+    assert [item.get_record_id() for item in items] == [
+        item.get_record_id() for item in dialog.get_itemset("C", "CZZZ")
+    ]
+
+    datafile_close(parts_file)
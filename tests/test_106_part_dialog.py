@@ -5,7 +5,7 @@ File:       test_103_part_dialog.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version :   1.1.0
+Version :   1.2.0
 """
 
 import os
@@ -24,7 +24,6 @@ from lbk_library.testing_support import (
     long_string,
     test_string,
 )
-from PySide6.QtWidgets import QMainWindow, QMessageBox
 from test_setup import (
     datafile_name,
     load_all_datafile_tables,
@@ -42,12 +41,14 @@ from elements import (
     SourceSet,
 )
 from pages import table_definition
+from qt_compat.QtWidgets import QMainWindow, QMessageBox
 
 #
 # file_version = "1.0.0"
 # changes = {
 #    "1.0.0": "Initial release",
 #    "1.1.0": "Changed library 'PyQt5' to 'PySide6' and code cleanup",
+#    "1.2.0": "The part number combo box no longer lists every part",
 # }
 
 
@@ -150,7 +151,7 @@ def test_106_05_fill_dialog_fields(qtbot, tmp_path):
     # no item selected, add item dialog, all selections should be blank.
     dialog = PartDialog(main, parts_file, None, Dialog.ADD_ELEMENT)
     dialog.fill_dialog_fields()
-    assert dialog.part_number_combo.count() == len(part_value_set)
+    assert dialog.part_number_combo.count() == 0
     assert dialog.part_number_edit.text() == ""
     assert dialog.part_number_combo.currentText() == ""
     assert dialog.record_id_edit.text() == "0"
@@ -280,7 +281,7 @@ def test_106_09_clear_dialog(qtbot, tmp_path):
     dialog = PartDialog(main, parts_file, part_value_set[0][0], Dialog.EDIT_ELEMENT)
     assert dialog.record_id_edit.text() == str(part_value_set[0][0])
     dialog.clear_dialog()
-    assert dialog.part_number_combo.count() == len(part_value_set)
+    assert dialog.part_number_combo.count() == 0
     assert dialog.part_number_edit.text() == ""
     assert dialog.part_number_combo.currentText() == ""
     assert dialog.record_id_edit.text() == "0"
@@ -543,3 +544,25 @@ def test_106_17_set_tooltips(qtbot, tmp_path):
     dialog.cancel_button.toolTip == dialog.TOOLTIPS["cancel_button"]
     dialog.save_new_button.toolTip == dialog.TOOLTIPS["save_new_button"]
     dialog.save_done_button.toolTip == dialog.TOOLTIPS["save_done_button"]
+
+
+def test_106_18_part_number_completer(qtbot, tmp_path):
+    parts_file, main, dialog = setup_part_dialog(qtbot, tmp_path)
+    part1 = Part(parts_file, part_value_set[1][1], "part_number")
+    dialog = PartDialog(main, parts_file, part1.get_record_id())
+
+    # the part numbers are offered as typed, not listed
+    assert dialog.part_number_combo.isEditable()
+    assert dialog.part_number_combo.completer() is dialog.part_number_completer
+    assert dialog.part_number_edit.completer() is dialog.new_part_number_completer
+    dialog.part_number_completer.setCompletionPrefix("170")
+    assert dialog.part_number_completer.part_numbers.rowCount() == len(
+        [part for part in part_value_set if part[1].startswith("170")]
+    )
+
+    # an unknown part number is dropped
+    dialog.part_number_combo.setEditText("NOT A PART")
+    dialog.action_part_number_combo_changed()
+    assert dialog.part_number_combo.currentText() == part1.get_part_number()
+    assert dialog.get_element().get_part_number() == part1.get_part_number()
+    datafile_close(parts_file)
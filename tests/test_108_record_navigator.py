@@ -0,0 +1,130 @@
+"""
+Test the record navigation support of the dialogs.
+
+File:       test_108_record_navigator.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.2.0
+"""
+
+import os
+import sys
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from lbk_library.testing_support import datafile_close, datafile_create, filesystem
+from test_setup import datafile_name, item_value_set, load_all_datafile_tables
+
+from dialogs import record_navigator
+from dialogs.record_navigator import (
+    RecordIdModel,
+    RecordPrefetcher,
+    get_adjacent_record_id,
+    get_parts_file_path,
+)
+from elements import Item, get_identity_map
+from pages import table_definition
+
+file_version = "1.2.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Added the failed prefetch test",
+    "1.2.0": "Slice the prefetched record_ids without flake8 E203",
+}
+
+record_ids = sorted(item[0] for item in item_value_set)
+
+
+def base_setup(tmp_path):
+    base_directory = filesystem(tmp_path)
+    filename = base_directory + "/" + datafile_name
+    parts_file = datafile_create(filename, table_definition)
+    load_all_datafile_tables(parts_file)
+    return parts_file, filename
+
+
+def test_108_01_adjacent_record_id(tmp_path):
+    parts_file, filename = base_setup(tmp_path)
+    assert get_adjacent_record_id(parts_file, "items", record_ids[0]) == record_ids[1]
+    assert get_adjacent_record_id(parts_file, "items", record_ids[-1]) is None
+    assert (
+        get_adjacent_record_id(parts_file, "items", record_ids[1], False)
+        == record_ids[0]
+    )
+    assert get_adjacent_record_id(parts_file, "items", record_ids[0], False) is None
+    # the record_id stepped from need not exist
+    assert get_adjacent_record_id(parts_file, "items", 0) == record_ids[0]
+    assert os.path.samefile(get_parts_file_path(parts_file), filename)
+    datafile_close(parts_file)
+
+
+def test_108_02_record_id_model_pages(qtbot, tmp_path, monkeypatch):
+    parts_file, filename = base_setup(tmp_path)
+    monkeypatch.setattr(RecordIdModel, "PAGE_SIZE", 10)
+    model = RecordIdModel(parts_file, "items")
+    assert model.rowCount() == 0
+    assert model.canFetchMore()
+    model.fetchMore()
+    assert model.rowCount() == 10
+    assert model.data(model.index(0, 0)) == str(record_ids[0])
+    while model.canFetchMore():
+        model.fetchMore()
+    assert model.record_ids == record_ids
+    datafile_close(parts_file)
+
+
+def test_108_03_record_id_model_patched(qtbot, tmp_path):
+    parts_file, filename = base_setup(tmp_path)
+    model = RecordIdModel(parts_file, "items")
+    model.fetchMore()
+    assert model.complete
+
+    item = Item(parts_file, {"part_number": "NEW1", "assembly": "ZZ"})
+    record_id = item.add()
+    assert model.record_ids[-1] == record_id
+    Item(parts_file, record_ids[0]).delete()
+    assert record_ids[0] not in model.record_ids
+    assert model.rowCount() == len(record_ids)
+    datafile_close(parts_file)
+
+
+def test_108_04_prefetch(qtbot, tmp_path):
+    parts_file, filename = base_setup(tmp_path)
+    identity_map = get_identity_map(parts_file)
+    identity_map.clear()
+    prefetcher = RecordPrefetcher(parts_file)
+    with qtbot.waitSignal(prefetcher.rows_read, timeout=5000):
+        prefetcher.prefetch(record_ids[5])
+    first = 5 - RecordPrefetcher.COUNT
+    for record_id in record_ids[first:5]:
+        assert identity_map.get("items", "record_id", record_id) is not None
+    item = identity_map.get("items", "record_id", record_ids[6])
+    assert item is Item.get_element(parts_file, record_ids[6])
+
+    # rows read before a write are dropped
+    identity_map.clear()
+    generation = prefetcher.generation
+    Item(parts_file, record_ids[0]).delete()
+    prefetcher.store_rows(generation, [{"record_id": record_ids[6]}], [])
+    assert identity_map.get("items", "record_id", record_ids[6]) is None
+    datafile_close(parts_file)
+
+
+def test_108_05_prefetch_failed(qtbot, tmp_path, monkeypatch):
+    """A prefetch that fails still ends, so the next one can run."""
+
+    def fail(filepath):
+        raise ValueError("no parts file")
+
+    parts_file, filename = base_setup(tmp_path)
+    get_identity_map(parts_file).clear()
+    monkeypatch.setattr(record_navigator, "ReadOnlyPartsFile", fail)
+    prefetcher = RecordPrefetcher(parts_file)
+    with qtbot.waitSignal(prefetcher.rows_read, timeout=5000) as blocker:
+        prefetcher.prefetch(record_ids[5])
+    assert blocker.args[1:] == [[], []]
+    assert not prefetcher.running
+    datafile_close(parts_file)
@@ -0,0 +1,119 @@
+"""
+Test the part number completion of the dialogs.
+
+File:       test_109_part_number_completer.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.0.0
+"""
+
+import os
+import sys
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from lbk_library.testing_support import datafile_close, datafile_create, filesystem
+from test_setup import datafile_name, load_all_datafile_tables, part_value_set
+
+from dialogs.part_number_completer import (
+    PartNumberCompleter,
+    PartNumberModel,
+    find_part_numbers,
+    get_prefix_bound,
+)
+from elements import Part
+from pages import table_definition
+from qt_compat.QtWidgets import QComboBox, QLineEdit
+
+file_version = "1.0.0"
+changes = {
+    "1.0.0": "Initial release",
+}
+
+part_numbers = sorted(part[1] for part in part_value_set)
+
+
+def base_setup(tmp_path):
+    base_directory = filesystem(tmp_path)
+    filename = base_directory + "/" + datafile_name
+    parts_file = datafile_create(filename, table_definition)
+    load_all_datafile_tables(parts_file)
+    return parts_file
+
+
+def test_109_01_prefix_bound():
+    assert get_prefix_bound("120") == "121"
+    assert get_prefix_bound("Z") == "["
+    assert get_prefix_bound("A" + chr(0x10FFFF)) == "B"
+    assert get_prefix_bound(chr(0x10FFFF)) is None
+
+
+def test_109_02_find_part_numbers(tmp_path):
+    parts_file = base_setup(tmp_path)
+    found = find_part_numbers(parts_file, "120", 10)
+    assert [part["part_number"] for part in found] == [
+        part_number for part_number in part_numbers if part_number.startswith("120")
+    ]
+    part = Part(parts_file, found[0]["part_number"], "part_number")
+    assert found[0]["description"] == part.get_description()
+
+    # the first part numbers, in order, up to the limit
+    found = find_part_numbers(parts_file, "", 5)
+    assert [part["part_number"] for part in found] == part_numbers[:5]
+
+    # lower case is looked up in upper case too
+    found = find_part_numbers(parts_file, "btb", 5)
+    assert [part["part_number"] for part in found] == ["BTB1108"]
+    assert find_part_numbers(parts_file, "NONE", 5) == []
+    datafile_close(parts_file)
+
+
+def test_109_03_model(qtbot, tmp_path):
+    parts_file = base_setup(tmp_path)
+    model = PartNumberModel(parts_file)
+    assert model.rowCount() == 0
+    assert model.columnCount() == 2
+    model.set_prefix("Z")
+    assert model.rowCount() == 3
+    assert model.data(model.index(0, 0)) == "Z001"
+
+    # read once for a prefix, again after the parts are written
+    part = Part(
+        parts_file, {"part_number": "Z002", "source": 1, "description": "new part"}
+    )
+    part.add()
+    assert model.prefix is None
+    model.set_prefix("Z")
+    assert [model.data(model.index(row, 0)) for row in range(4)] == [
+        "Z001",
+        "Z002",
+        "Z005",
+        "Z006",
+    ]
+    assert model.data(model.index(1, 1)) == "new part"
+    datafile_close(parts_file)
+
+
+def test_109_04_completer(qtbot, tmp_path):
+    parts_file = base_setup(tmp_path)
+    combo_box = QComboBox()
+    qtbot.addWidget(combo_box)
+    combo_box.addItems(part_numbers)
+    completer = PartNumberCompleter(parts_file, combo_box)
+    assert combo_box.isEditable()
+    assert combo_box.count() == 0
+    assert combo_box.completer() is completer
+    completer.setCompletionPrefix("170")
+    assert completer.part_numbers.prefix == "170"
+    assert completer.completionCount() == len(
+        [part_number for part_number in part_numbers if part_number.startswith("170")]
+    )
+
+    line_edit = QLineEdit()
+    qtbot.addWidget(line_edit)
+    completer = PartNumberCompleter(parts_file, line_edit)
+    assert line_edit.completer() is completer
+    datafile_close(parts_file)
@@ -5,7 +5,7 @@ File:       test_201_assembly_tree_page.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023, 2024 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.0.0
+Version:    1.7.0
 """
 
 import os
@@ -16,16 +16,24 @@ if src_path not in sys.path:
     sys.path.append(src_path)
 
 from lbk_library.testing_support import datafile_close, datafile_create, filesystem
-from PyQt6.QtWidgets import QTreeWidget, QTreeWidgetItem
 from test_setup import item_value_set, load_all_datafile_tables
 
 from dialogs import ItemDialog
-from elements import Condition, Item, ItemSet, Part
-from pages import AssemblyTreePage, table_definition
+from elements import Condition, Item, ItemView, Part
+from pages import AssemblyTreeModel, AssemblyTreePage, table_definition
+from qt_compat.QtCore import QModelIndex, QPersistentModelIndex
+from qt_compat.QtWidgets import QTreeView
 
-file_version = "1.0.0"
+file_version = "1.7.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Changed to the lazily loaded tree model and view",
+    "1.2.0": "The nodes are patched from the change bus",
+    "1.3.0": "The tree structure is patched in place",
+    "1.4.0": "Import Qt through 'qt_compat'",
+    "1.5.0": "Removed the 'set_condition_description' test",
+    "1.6.0": "Removed the 'set_part_description' test",
+    "1.7.0": "Added the row signals test",
 }
 
 parts_filename = "parts_test.parts"
@@ -36,47 +44,52 @@ def setup_page(qtbot, filesystem):
     filename = filesystem + "/" + parts_filename
     parts_file = datafile_create(filename, table_definition)
     load_all_datafile_tables(parts_file)
-    tree = QTreeWidget()
+    tree = QTreeView()
     page = AssemblyTreePage(tree, parts_file)
+    page.refresh_if_stale()
     qtbot.addWidget(tree)
     return (parts_file, tree, page)
 
 
+def read_tree(model, parent=QModelIndex(), tree_rows=None):
+    """Read every level of the tree model, keyed by assembly."""
+    if tree_rows is None:
+        tree_rows = {}
+    if model.canFetchMore(parent):
+        model.fetchMore(parent)
+    for row in range(model.rowCount(parent)):
+        index = model.index(row, 0, parent)
+        tree_rows[model.data(index)] = index
+        read_tree(model, index, tree_rows)
+    return tree_rows
+
+
 def test_201_01_class_type(qtbot, filesystem):
     parts_file, tree, page = setup_page(qtbot, filesystem)
     assert isinstance(page, AssemblyTreePage)
     assert page.get_parts_file() == parts_file
-    assert type(page.tree) == QTreeWidget
+    assert type(page.tree) == QTreeView
     assert page.tree == tree
+    assert isinstance(page.model, AssemblyTreeModel)
+    assert page.tree.model() is page.model
     datafile_close(parts_file)
 
 
 def test_201_02_resize_columns(qtbot, filesystem):
     parts_file, tree, page = setup_page(qtbot, filesystem)
-    # delete existing tree headings and entries
-    page.tree.clear()
-    blank_header = [None, None, None, None, None, None, None]
-    page.tree.setColumnCount(len(AssemblyTreePage.COL_NAMES))
-    page.tree.setHeaderLabels(blank_header)
-    page.resize_columns()
-    for i in range(0, len(blank_header) - 1):
-        assert page.tree.columnWidth(i) == page.tree.header().minimumSectionSize()
-    page.tree.setHeaderLabels(AssemblyTreePage.COL_NAMES)
-    page.resize_columns()
-    for i in range(0, len(AssemblyTreePage.COL_NAMES) - 1):
+    page.clear_tree()
+    for i in range(0, len(AssemblyTreePage.COL_NAMES) - 2):
+        page.tree.setColumnWidth(i, page.tree.header().minimumSectionSize())
+    page.update_tree()
+    for i in range(0, len(AssemblyTreePage.COL_NAMES) - 2):
         assert page.tree.columnWidth(i) > page.tree.header().minimumSectionSize()
     datafile_close(parts_file)
 
 
 def test_201_03_set_tree_headers(qtbot, filesystem):
     parts_file, tree, page = setup_page(qtbot, filesystem)
-    page.tree.clear()
-    blank_header = [None, None, None, None, None, None, None]
-    page.tree.setColumnCount(len(AssemblyTreePage.COL_NAMES))
-    page.tree.setHeaderLabels(blank_header)
-    page.resize_columns()
     page.set_tree_headers()
-    assert page.tree.columnCount() == len(page.COL_NAMES)
+    assert page.model.columnCount() == len(page.COL_NAMES)
     header = page.tree.header()
     for i in range(0, len(page.COL_NAMES) - 1):
         assert header.model().headerData(i, header.orientation()) == page.COL_NAMES[i]
@@ -84,26 +97,6 @@ def test_201_03_set_tree_headers(qtbot, filesystem):
     datafile_close(parts_file)
 
 
-def test_201_04_set_condition_description(qtbot, filesystem):
-    parts_file, tree, page = setup_page(qtbot, filesystem)
-    item_number = item_value_set[0][0]
-    condition_id = item_value_set[0][4]
-    item = Item(parts_file, item_number)
-    condition = Condition(parts_file, item.get_condition())
-    item_properties = page.set_condition_description(item.get_properties())
-    assert item_properties["condition"] == condition.get_condition()
-
-
-def test_201_05_set_part_description(qtbot, filesystem):
-    parts_file, tree, page = setup_page(qtbot, filesystem)
-    item_number = item_value_set[0][0]
-    part_number = item_value_set[0][1]
-    item = Item(parts_file, item_number)
-    part = Part(parts_file, item.get_part_number(), "part_number")
-    item_properties = page.set_part_description(item.get_properties())
-    assert item_properties["description"] == part.get_description()
-
-
 def test_201_06_set_installed_entry(qtbot, filesystem):
     parts_file, tree, page = setup_page(qtbot, filesystem)
     item_number = item_value_set[0][0]
@@ -118,103 +111,229 @@ def test_201_06_set_installed_entry(qtbot, filesystem):
 
 def test_201_07_set_item_values(qtbot, filesystem):
     parts_file, tree, page = setup_page(qtbot, filesystem)
-    item_number = item_value_set[0][0]
-    item = Item(parts_file, item_number)
-    item_properties = page.set_condition_description(item.get_properties())
-    item_properties = page.set_part_description(item.get_properties())
-    item_properties = page.set_installed_entry(item_properties)
+    row = ItemView(parts_file, "record_id", item_value_set[0][0]).get_property_set()[0]
+    item_properties = page.set_installed_entry(dict(row))
     item_values = page.set_item_values(item_properties)
     for value in item_values:
         assert type(value) is str
     datafile_close(parts_file)
 
 
-def test_201_08_find_parent_assy(qtbot, filesystem):
+def test_201_08_format_row(qtbot, filesystem):
     parts_file, tree, page = setup_page(qtbot, filesystem)
-    tree_items = {}
-    assembly = "A"
-    parent = page.find_parent_assy(assembly, tree_items)
-    assert parent is None
-    tree_items[assembly] = parent
-    assembly = "AAA"
-    parent = page.find_parent_assy(assembly, tree_items)
-    assert parent == "A"
-    tree_items[assembly] = parent
-    assembly = "HHH"
-    parent = page.find_parent_assy(assembly, tree_items)
-    assert parent is None
-    tree_items[assembly] = parent
+    row = ItemView(parts_file, "record_id", item_value_set[0][0]).get_property_set()[0]
+    values = page.format_row(row)
+    assert values == page.set_item_values(page.set_installed_entry(dict(row)))
+    assert row["installed"] == item_value_set[0][5]  # row is not changed
     datafile_close(parts_file)
 
 
-def test_201_09_add_item_to_tree(qtbot, filesystem):
+def test_201_09_lazy_children(qtbot, filesystem):
     parts_file, tree, page = setup_page(qtbot, filesystem)
-    tree_items = {}
-    item_set = ItemSet(parts_file, None, None, "assembly")
-    item = item_set.get(0)
-    item_properties = page.set_condition_description(item.get_properties())
-    item_properties = page.set_part_description(item.get_properties())
-    assembly1 = item_properties["assembly"]
-    item_properties = page.set_installed_entry(item_properties)
-    item_values = page.set_item_values(item_properties)
-    parent = page.find_parent_assy(assembly1, tree_items)
-    tree_items = page.add_item_to_tree(assembly1, item_values, parent, tree_items)
-    assert tree_items[assembly1].parent() is None
-    item = item_set.get(1)
-    item_properties = page.set_condition_description(item.get_properties())
-    item_properties = page.set_part_description(item.get_properties())
-    assembly2 = item_properties["assembly"]
-    item_properties = page.set_installed_entry(item_properties)
-    item_values = page.set_item_values(item_properties)
-    parent = page.find_parent_assy(assembly2, tree_items)
-    tree_items = page.add_item_to_tree(assembly2, item_values, parent, tree_items)
-    assert tree_items[assembly2].parent() == tree_items[assembly1]
+    model = page.model
+    # only the top level is read when the tree is loaded
+    for row in range(model.rowCount()):
+        index = model.index(row, 0)
+        if model.hasChildren(index):
+            assert model.canFetchMore(index)
+            assert model.rowCount(index) == 0
+    index = model.index(0, 0)
+    model.fetchMore(index)
+    assert not model.canFetchMore(index)
+    assert model.rowCount(index) > 0
+    child = model.index(0, 0, index)
+    assert model.parent(child) == index
+    assert model.data(child).startswith(model.data(index))
     datafile_close(parts_file)
 
 
-def test_201_10_fill_tree_widget(qtbot, filesystem):
+def test_201_10_tree_structure(qtbot, filesystem):
     parts_file, tree, page = setup_page(qtbot, filesystem)
-    item_set = ItemSet(parts_file, None, None, "assembly")
-    tree_items = page.fill_tree_widget(item_set)
-    assert type(tree_items["A"]) is QTreeWidgetItem
-    assert tree_items["AA"].parent() == tree_items["A"]
-    assert len(tree_items) == len(item_value_set)
+    tree_rows = read_tree(page.model)
+    assert len(tree_rows) == len(item_value_set)
+    assert tree_rows["AA"].parent() == tree_rows["A"]
+    for assembly, index in tree_rows.items():
+        parent = index.parent()
+        if parent.isValid():
+            # the parent is the longest assembly prefixing this one
+            parent_assembly = page.model.data(parent)
+            assert assembly.startswith(parent_assembly)
+            for length in range(len(parent_assembly) + 1, len(assembly)):
+                assert assembly[:length] not in tree_rows
+        else:
+            for length in range(1, len(assembly)):
+                assert assembly[:length] not in tree_rows
     datafile_close(parts_file)
 
 
 def test_201_11_update_tree(qtbot, filesystem):
     parts_file, tree, page = setup_page(qtbot, filesystem)
-    item_set = ItemSet(parts_file, None, None, "assembly")
-    tree_items = page.fill_tree_widget(item_set)
-    init_num_items = len(tree_items)
+    tree_rows = read_tree(page.model)
+    init_num_items = len(tree_rows)
     Item(parts_file, 1370).delete()
     Item(parts_file, 1328).delete()
-    tree_items = page.update_tree()
-    assert len(tree_items) < init_num_items
-    assert (init_num_items - len(tree_items)) == 2
-    assert not "ABFCB" in tree_items.keys()
-    assert not "AAACB" in tree_items.keys()
+    model = page.update_tree()
+    assert model is page.model
+    tree_rows = read_tree(model)
+    assert (init_num_items - len(tree_rows)) == 2
+    assert not "ABFCB" in tree_rows.keys()
+    assert not "AAACB" in tree_rows.keys()
     datafile_close(parts_file)
 
 
 def test_201_12_clear_tree(qtbot, filesystem):
     parts_file, tree, page = setup_page(qtbot, filesystem)
-    item_set = ItemSet(parts_file, None, None, "assembly")
-    tree_items = page.fill_tree_widget(item_set)
-    top_item_count = page.tree.topLevelItemCount()
-    assert top_item_count > 0
+    assert page.model.rowCount() > 0
     page.clear_tree()
-    top_item_count = page.tree.topLevelItemCount()
-    assert top_item_count == 0
+    assert page.model.rowCount() == 0
+    assert not page.model.hasChildren()
     datafile_close(parts_file)
 
 
 def test_201_13_action_item_clicked(qtbot, filesystem):
     parts_file, tree, page = setup_page(qtbot, filesystem)
 
-    item_set = ItemSet(parts_file, None, None, "assembly")
-    page.fill_tree_widget(item_set)
-    item = page.tree.itemAt(0, 0)
-    dialog = page.action_item_clicked(item, 0)
+    index = page.model.index(0, 3)
+    dialog = page.action_item_clicked(index)
     assert type(dialog) == ItemDialog
+    assert dialog.get_element().get_record_id() == page.model.get_record_id(index)
+    datafile_close(parts_file)
+
+
+def test_201_14_tree_descriptions(qtbot, filesystem):
+    parts_file, tree, page = setup_page(qtbot, filesystem)
+    model = page.model
+    tree_rows = read_tree(model)
+    for index in tree_rows.values():
+        item = Item(parts_file, model.get_record_id(index))
+        part = Part(parts_file, item.get_part_number(), "part_number")
+        condition = Condition(parts_file, item.get_condition())
+        assert model.data(index.siblingAtColumn(3)) == part.get_description()
+        assert model.data(index.siblingAtColumn(5)) == condition.get_condition()
+    datafile_close(parts_file)
+
+
+def test_201_15_patched_nodes(qtbot, filesystem):
+    """Item, Part and Condition edits change the nodes read in place."""
+    parts_file, tree, page = setup_page(qtbot, filesystem)
+    model = page.model
+    tree_rows = read_tree(model)
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+
+    item = Item(parts_file, item_value_set[1][0])
+    index = tree_rows[item.get_assembly()]
+    item.set_quantity(item.get_quantity() + 5)
+    item.set_installed(not item.get_installed())
+    item.update()
+    assert model.data(index.siblingAtColumn(4)) == str(item.get_quantity())
+    assert model.data(index.siblingAtColumn(6)) == (
+        "Yes" if item.get_installed() else ""
+    )
+
+    part = Part(parts_file, item.get_part_number(), "part_number")
+    part.set_description("Patched description")
+    part.update()
+    assert model.data(index.siblingAtColumn(3)) == "Patched description"
+
+    condition = Condition(parts_file, item.get_condition())
+    condition.set_condition("Patched condition")
+    condition.update()
+    assert model.data(index.siblingAtColumn(5)) == "Patched condition"
+    assert resets == []
+
+    datafile_close(parts_file)
+
+
+def tree_shape(model, parent=QModelIndex(), shape=None):
+    """Get the parent assembly of each assembly, reading every level."""
+    if shape is None:
+        shape = {}
+    if model.canFetchMore(parent):
+        model.fetchMore(parent)
+    for row in range(model.rowCount(parent)):
+        index = model.index(row, 0, parent)
+        shape[model.data(index)] = model.data(parent) if parent.isValid() else None
+        tree_shape(model, index, shape)
+    return shape
+
+
+def test_201_16_patched_structure(qtbot, filesystem):
+    """
+    Added, moved and deleted items change only their levels, keeping
+    the tree as expanded as it was.
+    """
+    parts_file, tree, page = setup_page(qtbot, filesystem)
+    model = page.model
+    tree_rows = read_tree(model)
+    for assembly in ("A", "AA", "AAA", "AAAB"):
+        tree.expand(tree_rows[assembly])
+    expanded = QPersistentModelIndex(tree_rows["AAAB"])
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+
+    Item(parts_file, {"part_number": "17000", "assembly": "AAABG"}).add()
+    item = Item(parts_file, 1328)
+    item.set_assembly("BE")
+    item.update()
+    Item(parts_file, 1318).delete()
+
+    assert resets == []
+    assert expanded.isValid()
+    assert tree.isExpanded(model.index(expanded.row(), 0, expanded.parent()))
+    assert model.find_node(1318) is None
+    shape = tree_shape(model)
+    assert shape["AAABG"] == "AAAB"
+    assert shape["BE"] == "B"
+    assert "AAACB" not in shape
+    assert "AAABA" not in shape
+
+    fresh = AssemblyTreeModel(parts_file, page.COL_NAMES, page.format_row)
+    fresh.load()
+    assert shape == tree_shape(fresh)
+
+    # an assembly added between levels takes the assemblies below it
+    Item(parts_file, {"part_number": "17000", "assembly": "CAA"}).add()
+    shape = tree_shape(model)
+    assert shape["CAABA"] == "CAA"
+    fresh.load()
+    assert shape == tree_shape(fresh)
+    datafile_close(parts_file)
+
+
+def test_201_17_row_signals(qtbot, filesystem):
+    """
+    A level read again inserts and removes only the rows changed,
+    without a layout change.
+    """
+    parts_file, tree, page = setup_page(qtbot, filesystem)
+    model = page.model
+    tree_rows = read_tree(model)
+    for assembly in ("A", "AA", "AAA", "AAAB"):
+        tree.expand(tree_rows[assembly])
+    signals = []
+    model.layoutChanged.connect(lambda: signals.append("layout"))
+    model.rowsInserted.connect(
+        lambda parent, first, last: signals.append(
+            ("inserted", model.data(parent), first, last)
+        )
+    )
+    model.rowsRemoved.connect(
+        lambda parent, first, last: signals.append(
+            ("removed", model.data(parent), first, last)
+        )
+    )
+
+    rows = model.rowCount(tree_rows["AAAB"])
+    Item(parts_file, {"part_number": "17000", "assembly": "AAABZ"}).add()
+    assert signals == [("inserted", "AAAB", rows, rows)]
+    assert model.rowCount(tree_rows["AAAB"]) == rows + 1
+    node = model.find_node(model.get_record_id(model.index(rows, 0, tree_rows["AAAB"])))
+    assert node.assembly == "AAABZ"
+    assert node.row == rows
+
+    signals.clear()
+    Item(parts_file, node.record_id).delete()
+    assert signals == [("removed", "AAAB", rows, rows)]
+    assert model.find_node(node.record_id) is None
     datafile_close(parts_file)
@@ -5,7 +5,7 @@ File:       test_202_parts_list_page.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023, 2024 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.0.0
+Version:    1.5.0
 """
 
 import os
@@ -15,19 +15,24 @@ src_path = os.path.join(os.path.realpath("."), "src")
 if src_path not in sys.path:
     sys.path.append(src_path)
 
-file_version = "1.0.0"
+file_version = "1.5.0"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Changed to the parts list table model and view",
+    "1.2.0": "The listing is read when first shown",
+    "1.3.0": "The rows are patched from the change bus",
+    "1.4.0": "Import Qt through 'qt_compat'",
+    "1.5.0": "Added the missing remarks ordering test",
 }
 
 from lbk_library.testing_support import datafile_close, datafile_create, filesystem
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QTableWidget
 from test_setup import load_all_datafile_tables, part_value_set
 
 from dialogs import PartDialog
-from elements import Part, PartSet
-from pages import PartsListPage, table_definition
+from elements import Item, Part, PartSet
+from pages import PartsListModel, PartsListPage, table_definition
+from qt_compat.QtCore import Qt
+from qt_compat.QtWidgets import QTableView
 
 parts_filename = "parts_test.parts"
 
@@ -37,8 +42,9 @@ def setup_page(qtbot, filesystem):
     filename = filesystem + "/" + parts_filename
     parts_file = datafile_create(filename, table_definition)
     load_all_datafile_tables(parts_file)
-    table = QTableWidget()
+    table = QTableView()
     page = PartsListPage(table, parts_file)
+    page.refresh_if_stale()
     qtbot.addWidget(table)
     return (parts_file, table, page)
 
@@ -48,20 +54,23 @@ def test_202_01_class_type(qtbot, filesystem):
 
     assert isinstance(page, PartsListPage)
     assert page.get_parts_file() == parts_file
-    assert type(page.table) == QTableWidget
+    assert type(page.table) == QTableView
     assert page.table == table
+    assert isinstance(page.model, PartsListModel)
+    assert page.table.model() is page.model
+    assert page.model.rowCount() == len(part_value_set)
     datafile_close(parts_file)
 
 
 def test_202_02_set_table_headers(qtbot, filesystem):
     parts_file, table, page = setup_page(qtbot, filesystem)
 
-    page.table.clear()
-    page.table.setColumnCount(0)
-    assert page.table.columnCount() == 0
+    for i in range(0, len(page.COLUMN_NAMES)):
+        page.table.setColumnWidth(i, 0)
 
     page.set_table_headers()
-    assert page.table.columnCount() == len(page.COLUMN_NAMES)
+    assert page.model.columnCount() == len(page.COLUMN_NAMES)
+    assert page.table.isColumnHidden(0)
     header = page.table.horizontalHeader()
     for i in range(1, len(page.COLUMN_NAMES) - 1):
         assert (
@@ -74,15 +83,15 @@ def test_202_02_set_table_headers(qtbot, filesystem):
 def test_202_03_update_table(qtbot, filesystem):
     parts_file, table, page = setup_page(qtbot, filesystem)
 
-    part_set = PartSet(parts_file, None, None, "part_number")
-    initial_num_parts = page.table.rowCount()
+    initial_num_parts = page.model.rowCount()
+    assert page.model.get_row(part_value_set[0][1]) >= 0
     Part(parts_file, part_value_set[0][1], "part_number").delete()
     Part(parts_file, part_value_set[1][1], "part_number").delete()
     page.update_table()
-    assert page.table.rowCount() < initial_num_parts
-    assert (initial_num_parts - page.table.rowCount()) == 2
-    assert not page.table.findItems(part_value_set[0][1], Qt.MatchExactly)
-    assert not page.table.findItems(part_value_set[1][1], Qt.MatchExactly)
+    assert page.model.rowCount() < initial_num_parts
+    assert (initial_num_parts - page.model.rowCount()) == 2
+    assert page.model.get_row(part_value_set[0][1]) == -1
+    assert page.model.get_row(part_value_set[1][1]) == -1
     datafile_close(parts_file)
 
 
@@ -90,7 +99,7 @@ def test_202_04_clear_table(qtbot, filesystem):
     parts_file, table, page = setup_page(qtbot, filesystem)
 
     page.clear_table()
-    assert page.table.rowCount() == 0
+    assert page.model.rowCount() == 0
     datafile_close(parts_file)
     datafile_close(parts_file)
 
@@ -98,7 +107,141 @@ def test_202_04_clear_table(qtbot, filesystem):
 def test_202_05_action_part_clicked(qtbot, filesystem):
     parts_file, table, page = setup_page(qtbot, filesystem)
 
-    part_item = page.table.itemAt(0, 0)
-    dialog = page.action_part_clicked(part_item)
+    index = page.model.index(0, 1)
+    dialog = page.action_part_clicked(index)
     assert type(dialog) == PartDialog
+    assert dialog.get_element().get_record_id() == page.model.get_record_id(0)
+    datafile_close(parts_file)
+
+
+def test_202_06_update_table_quantities(qtbot, filesystem):
+    parts_file, table, page = setup_page(qtbot, filesystem)
+
+    model = page.model
+    for row in range(model.rowCount()):
+        part = Part(parts_file, model.data(model.index(row, 1)), "part_number")
+        assert model.data(model.index(row, 4)) == str(part.get_total_quantity())
+    datafile_close(parts_file)
+
+
+def test_202_07_sort(qtbot, filesystem):
+    parts_file, table, page = setup_page(qtbot, filesystem)
+    model = page.model
+    part_numbers = [model.data(model.index(row, 1)) for row in range(model.rowCount())]
+    assert part_numbers == sorted(part_numbers)
+
+    page.table.sortByColumn(4, Qt.SortOrder.DescendingOrder)
+    quantities = [
+        int(model.data(model.index(row, 4))) for row in range(model.rowCount())
+    ]
+    assert quantities == sorted(quantities, reverse=True)
+    listing = PartSet.get_parts_listing(parts_file, "quantity", True)
+    assert [model.get_record_id(row) for row in range(model.rowCount())] == [
+        part["record_id"] for part in listing
+    ]
+
+    # a refresh keeps the current order
+    page.update_table()
+    assert [model.get_record_id(row) for row in range(model.rowCount())] == [
+        part["record_id"] for part in listing
+    ]
+    datafile_close(parts_file)
+
+
+def test_202_08_stale(qtbot, filesystem):
+    """The listing is read only when asked for while stale."""
+    filename = filesystem + "/" + parts_filename
+    parts_file = datafile_create(filename, table_definition)
+    load_all_datafile_tables(parts_file)
+    table = QTableView()
+    qtbot.addWidget(table)
+    page = PartsListPage(table, parts_file)
+    assert page.stale
+    assert page.model.rowCount() == 0
+
+    # sorting an unread listing does not read it
+    page.model.sort(2, Qt.SortOrder.DescendingOrder)
+    assert page.model.rowCount() == 0
+
+    page.refresh_if_stale()
+    assert not page.stale
+    assert page.model.rowCount() == len(part_value_set)
+
+    # a write not made through a Part is not seen until read again
+    parts_file.sql_query(
+        "DELETE FROM parts WHERE part_number = ?", [part_value_set[0][1]]
+    )
+    page.refresh_if_stale()
+    assert page.model.rowCount() == len(part_value_set)
+    page.mark_stale()
+    page.refresh_if_stale()
+    assert page.model.rowCount() == len(part_value_set) - 1
+
+    page.clear_table()
+    assert page.stale
+    datafile_close(parts_file)
+
+
+def test_202_09_patched_rows(qtbot, filesystem):
+    """Part and Item writes patch only the rows of the parts written."""
+    parts_file, table, page = setup_page(qtbot, filesystem)
+    model = page.model
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+
+    part = Part(parts_file, part_value_set[0][1], "part_number")
+    part.set_description("Patched description")
+    part.update()
+    row = model.get_row(part.get_part_number())
+    assert model.index(row, 2).data() == "Patched description"
+
+    item = Item(parts_file, {"part_number": part.get_part_number(), "quantity": 7})
+    item.add()
+    assert model.index(row, 4).data() == str(part.get_total_quantity())
+
+    new_part = Part(parts_file, {"part_number": "0000-NEW", "description": "New"})
+    new_part.add()
+    assert model.rowCount() == len(part_value_set) + 1
+    assert model.get_row("0000-NEW") == 0
+
+    # a new part number moves the row to its sorted place
+    new_part = Part(parts_file, "0000-NEW", "part_number")
+    new_part.set_part_number("ZZZZ-NEW")
+    new_part.update()
+    assert model.get_row("ZZZZ-NEW") == model.rowCount() - 1
+    part_numbers = [model.index(row, 1).data() for row in range(model.rowCount())]
+    assert part_numbers == sorted(part_numbers)
+
+    new_part.delete()
+    assert model.get_row("ZZZZ-NEW") == -1
+    assert model.rowCount() == len(part_value_set)
+    assert resets == []
+    datafile_close(parts_file)
+
+
+def test_202_10_patched_rows_missing_text(qtbot, filesystem):
+    """
+    Missing remarks are ordered as the empty string they are listed as,
+    by the parts file and by the patched rows alike.
+    """
+    parts_file, table, page = setup_page(qtbot, filesystem)
+    model = page.model
+    for part_number, remarks in (("0000-NULL", None), ("0000-EMPTY", "")):
+        parts_file.sql_query(
+            "INSERT INTO parts (part_number, source, description, remarks) "
+            "VALUES (?, ?, ?, ?)",
+            [part_number, 1, "Missing remarks", remarks],
+        )
+    page.table.sortByColumn(5, Qt.SortOrder.AscendingOrder)
+
+    part = Part(parts_file, part_value_set[2][1], "part_number")
+    part.set_remarks("")
+    part.update()
+    listing = PartSet.get_parts_listing(parts_file, "remarks")
+    assert [model.get_record_id(row) for row in range(model.rowCount())] == [
+        part["record_id"] for part in listing
+    ]
+    for row in range(model.rowCount()):
+        assert model.find_record(model.get_record_id(row)) == row
+        assert model.get_row(model.index(row, 1).data()) == row
     datafile_close(parts_file)
@@ -5,7 +5,7 @@ File:       test_203_orders_list_page.py
 Author:     Lorn B Kerr
 Copyright:  (c) 2023 Lorn B Kerr
 License:    MIT, see file LICENSE
-Version:    1.0.0
+Version:    1.3.1
 """
 
 import os
@@ -16,17 +16,21 @@ if src_path not in sys.path:
     sys.path.append(src_path)
 
 from lbk_library.testing_support import datafile_close, datafile_create, filesystem
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QTableWidget
 from test_setup import load_all_datafile_tables, order_value_set
 
 from dialogs import OrderDialog
-from elements import Order, OrderSet
-from pages import OrdersListPage, table_definition
+from elements import Order
+from pages import OrdersListModel, OrdersListPage, table_definition
+from qt_compat.QtCore import Qt
+from qt_compat.QtWidgets import QTableView
 
-file_version = "1.0.0"
+file_version = "1.3.1"
 changes = {
     "1.0.0": "Initial release",
+    "1.1.0": "Changed to the paged table model",
+    "1.2.0": "The rows are patched from the change bus",
+    "1.3.0": "Import Qt through 'qt_compat'",
+    "1.3.1": "Removed an unused import",
 }
 
 parts_filename = "parts_test.parts"
@@ -37,8 +41,9 @@ def setup_page(qtbot, filesystem):
     filename = filesystem + "/" + parts_filename
     parts_file = datafile_create(filename, table_definition)
     load_all_datafile_tables(parts_file)
-    table = QTableWidget()
+    table = QTableView()
     page = OrdersListPage(table, parts_file)
+    page.refresh_if_stale()
     qtbot.addWidget(table)
     return (parts_file, table, page)
 
@@ -47,8 +52,10 @@ def test_203_01_class_type(qtbot, filesystem):
     parts_file, table, page = setup_page(qtbot, filesystem)
     assert isinstance(page, OrdersListPage)
     assert page.get_parts_file() == parts_file
-    assert type(page.table) == QTableWidget
+    assert type(page.table) == QTableView
     assert page.table == table
+    assert isinstance(page.model, OrdersListModel)
+    assert page.table.model() == page.model
     datafile_close(parts_file)
 
 
@@ -65,12 +72,8 @@ def test_203_02_get_number_lines(qtbot, filesystem):
 
 def test_203_03_set_table_headers(qtbot, filesystem):
     parts_file, table, page = setup_page(qtbot, filesystem)
-    page.table.clear()
-    page.table.setColumnCount(0)
-    assert page.table.columnCount() == 0
-
     page.set_table_headers()
-    assert page.table.columnCount() == len(page.COLUMN_NAMES)
+    assert page.model.columnCount() == len(page.COLUMN_NAMES)
     header = page.table.horizontalHeader()
     for i in range(1, len(page.COLUMN_NAMES) - 1):
         assert (
@@ -80,31 +83,120 @@ def test_203_03_set_table_headers(qtbot, filesystem):
     datafile_close(parts_file)
 
 
+def order_numbers_listed(model):
+    """Get the order numbers in the model, in row order."""
+    return [model.index(row, 1).data() for row in range(model.rowCount())]
+
+
 def test_203_04_update_table(qtbot, filesystem):
     parts_file, table, page = setup_page(qtbot, filesystem)
 
-    order_set = OrderSet(parts_file, None, None, "order_number")
-    initial_num_parts = page.table.rowCount()
+    initial_num_orders = page.model.rowCount()
+    assert initial_num_orders == len(order_value_set)
     Order(parts_file, order_value_set[0][1], "order_number").delete()
     Order(parts_file, order_value_set[1][1], "order_number").delete()
     page.update_table()
-    assert page.table.rowCount() < initial_num_parts
-    assert (initial_num_parts - page.table.rowCount()) == 2
-    assert not page.table.findItems(order_value_set[0][1], Qt.MatchExactly)
-    assert not page.table.findItems(order_value_set[1][1], Qt.MatchExactly)
+    assert page.model.rowCount() < initial_num_orders
+    assert (initial_num_orders - page.model.rowCount()) == 2
+    assert order_value_set[0][1] not in order_numbers_listed(page.model)
+    assert order_value_set[1][1] not in order_numbers_listed(page.model)
     datafile_close(parts_file)
 
 
 def test_203_05_clear_table(qtbot, filesystem):
     parts_file, table, page = setup_page(qtbot, filesystem)
     page.clear_table()
-    assert page.table.rowCount() == 0
+    assert page.model.rowCount() == 0
+    assert not page.model.canFetchMore(page.model.index(-1, -1))
     datafile_close(parts_file)
 
 
 def test_203_06_action_order_clicked(qtbot, filesystem):
     parts_file, table, page = setup_page(qtbot, filesystem)
-    order_item = page.table.itemAt(0, 0)
-    dialog = page.action_order_clicked(order_item)
+    dialog = page.action_order_clicked(page.model.index(0, 0))
     assert type(dialog) == OrderDialog
     datafile_close(parts_file)
+
+
+def test_203_07_fetch_pages(qtbot, filesystem):
+    """The orders are read a page at a time, in order number order."""
+    parts_file, table, page = setup_page(qtbot, filesystem)
+    page.model.PAGE_SIZE = 3
+    page.update_table()
+    parent = page.model.index(-1, -1)
+    assert page.model.rowCount() == 3
+    while page.model.canFetchMore(parent):
+        page.model.fetchMore(parent)
+    assert page.model.rowCount() == len(order_value_set)
+    order_numbers = sorted(order[1] for order in order_value_set)
+    assert order_numbers_listed(page.model) == order_numbers
+    assert page.model.index(0, 4).data() == str(page.get_number_lines(order_numbers[0]))
+
+    page.model.sort(1, Qt.SortOrder.DescendingOrder)
+    while page.model.canFetchMore(parent):
+        page.model.fetchMore(parent)
+    assert order_numbers_listed(page.model) == list(reversed(order_numbers))
+    datafile_close(parts_file)
+
+
+def test_203_08_refresh_order(qtbot, filesystem):
+    """Only the row of an edited or deleted order is read again."""
+    parts_file, table, page = setup_page(qtbot, filesystem)
+    record_id = page.model.get_record_id(1)
+    order_number = page.model.get_order_number(1)
+    changed_rows = []
+    resets = []
+    page.model.dataChanged.connect(
+        lambda first, last: changed_rows.append((first.row(), last.row()))
+    )
+    page.model.modelReset.connect(lambda: resets.append(True))
+
+    # the write is published on the change bus, patching the row
+    order = Order(parts_file, record_id, "record_id")
+    order.set_remarks("refreshed remark")
+    order.update()
+    assert changed_rows == [(1, 1)]
+    assert page.model.index(1, 5).data() == "refreshed remark"
+    assert page.model.get_order_number(1) == order_number
+
+    page.model.refresh_order(record_id)
+    assert changed_rows == [(1, 1), (1, 1)]
+
+    order.delete()
+    assert page.model.rowCount() == len(order_value_set) - 1
+    assert page.model.get_row(record_id) == -1
+    assert order_number not in order_numbers_listed(page.model)
+    assert resets == []
+    datafile_close(parts_file)
+
+
+def test_203_09_refresh_added_orders(qtbot, filesystem):
+    """Added and moved orders keep the paged listing in order."""
+    parts_file, table, page = setup_page(qtbot, filesystem)
+    page.model.PAGE_SIZE = 3
+    page.update_table()
+    parent = page.model.index(-1, -1)
+
+    # ahead of the rows read, shown at once
+    Order(parts_file, {"order_number": "00-001", "date": "2001-01-01"}).add()
+    assert page.model.rowCount() == 4
+    assert page.model.get_order_number(0) == "00-001"
+    assert page.model.total_rows == len(order_value_set) + 1
+
+    # after the rows read, read with its page
+    Order(parts_file, {"order_number": "99-999", "date": "2001-01-01"}).add()
+    assert page.model.rowCount() == 4
+    assert page.model.total_rows == len(order_value_set) + 2
+
+    # moved from the first row to its new place
+    order = Order(parts_file, "00-001", "order_number")
+    order.set_order_number("98-001")
+    order.update()
+    assert page.model.rowCount() == 3
+    assert "98-001" not in order_numbers_listed(page.model)
+
+    while page.model.canFetchMore(parent):
+        page.model.fetchMore(parent)
+    order_numbers = [order[1] for order in order_value_set] + ["98-001", "99-999"]
+    assert order_numbers_listed(page.model) == sorted(order_numbers)
+    datafile_close(parts_file)
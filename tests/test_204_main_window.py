@@ -9,6 +9,7 @@ Version:    1.0.0
 """
 
 import os
+import subprocess
 import sys
 from pathlib import Path
 
@@ -19,14 +20,6 @@ if src_path not in sys.path:
 from lbk_library import DataFile
 from lbk_library.gui import Dialog
 from lbk_library.testing_support import datafile_close, datafile_create, filesystem
-from PyQt6.QtCore import QSettings
-from PyQt6.QtWidgets import (
-    QFileDialog,
-    QMainWindow,
-    QTableWidget,
-    QTabWidget,
-    QTreeWidget,
-)
 from test_setup import (
     directories,
     item_value_set,
@@ -53,12 +46,30 @@ from pages import (
     PartsListPage,
     table_definition,
 )
+from qt_compat.QtCore import QModelIndex, QSettings
+from qt_compat.QtWidgets import (
+    QFileDialog,
+    QMainWindow,
+    QTableView,
+    QTabWidget,
+    QTreeView,
+)
 
 # Need to save and restore the existing config file so we don't
 # overwrite it during testing.
 saved_config_file = QSettings("Unnamed Branch", "PartsTrackerSaved")
 
 
+def count_tree_items(tree_model, parent=QModelIndex()):
+    # Count the items in the tree model, reading every level.
+    if tree_model.canFetchMore(parent):
+        tree_model.fetchMore(parent)
+    count = tree_model.rowCount(parent)
+    for row in range(tree_model.rowCount(parent)):
+        count += count_tree_items(tree_model, tree_model.index(row, 0, parent))
+    return count
+
+
 def save_config_file(original_config_file):
     # Save the actual config file contents to be restored at end of test.
     for group in original_config_file.childGroups():
@@ -275,9 +286,9 @@ def test_204_09_set_tab_widgets(filesystem, qtbot):
     main.set_tab_widgets()
     tabwidget = main.form.centralWidget()
     assert isinstance(tabwidget, QTabWidget)
-    assert isinstance(tabwidget.widget(0), QTreeWidget)
-    assert isinstance(tabwidget.widget(1), QTableWidget)
-    assert isinstance(tabwidget.widget(2), QTableWidget)
+    assert isinstance(tabwidget.widget(0), QTreeView)
+    assert isinstance(tabwidget.widget(1), QTableView)
+    assert isinstance(tabwidget.widget(2), QTableView)
 
 
 def test_204_10_configure_window(filesystem, qtbot):
@@ -712,7 +723,9 @@ def test_204_27_update_assembly_tree_action(qtbot, filesystem, mocker):
     test_file = datafile_create(test_file_name, table_definition)
     load_all_datafile_tables(test_file)
     main.load_file(test_file_name)
-    orig_tree_items = main.update_assembly_tree_action()
+    qtbot.waitUntil(lambda: not main.is_file_loading())
+    tree_model = main.update_assembly_tree_action()
+    orig_number_items = count_tree_items(tree_model)
     query = {
         "type": "DELETE",
         "table": "items",
@@ -720,8 +733,8 @@ def test_204_27_update_assembly_tree_action(qtbot, filesystem, mocker):
     }
     sql = main.parts_file.sql_query_from_array(query)
     result = main.parts_file.sql_query(sql)
-    new_tree_items = main.update_assembly_tree_action()
-    assert len(orig_tree_items) - len(new_tree_items) == 1
+    tree_model = main.update_assembly_tree_action()
+    assert orig_number_items - count_tree_items(tree_model) == 1
 
     restore_config_file(main.config)
     datafile_close(main.parts_file)
@@ -778,9 +791,10 @@ def test_204_31_update_parts_list_table_action(qtbot, filesystem):
     test_file = datafile_create(test_file_name, table_definition)
     load_all_datafile_tables(test_file)
     main.load_file(test_file_name)
+    qtbot.waitUntil(lambda: not main.is_file_loading())
 
     main.form.action_update_part_list_table.trigger()
-    orig_number_rows = main.parts_list_widget.rowCount()
+    orig_number_rows = main.parts_list_widget.model().rowCount()
     query = {
         "type": "DELETE",
         "table": "parts",
@@ -789,7 +803,7 @@ def test_204_31_update_parts_list_table_action(qtbot, filesystem):
     sql = main.parts_file.sql_query_from_array(query)
     main.parts_file.sql_query(sql)
     main.form.action_update_part_list_table.trigger()
-    new_number_rows = main.parts_list_widget.rowCount()
+    new_number_rows = main.parts_list_widget.model().rowCount()
     assert orig_number_rows - new_number_rows == 1
 
     restore_config_file(main.config)
@@ -826,9 +840,10 @@ def test_204_33_update_orders_list_table_action(qtbot, filesystem):
     test_file = datafile_create(test_file_name, table_definition)
     load_all_datafile_tables(test_file)
     main.load_file(test_file_name)
+    qtbot.waitUntil(lambda: not main.is_file_loading())
 
     main.form.action_update_order_table.trigger()
-    orig_number_rows = main.orders_list_widget.rowCount()
+    orig_number_rows = main.orders_list_widget.model().rowCount()
     query = {
         "type": "DELETE",
         "table": "orders",
@@ -837,13 +852,124 @@ def test_204_33_update_orders_list_table_action(qtbot, filesystem):
     sql = main.parts_file.sql_query_from_array(query)
     main.parts_file.sql_query(sql)
     main.form.action_update_order_table.trigger()
-    new_number_rows = main.orders_list_widget.rowCount()
+    new_number_rows = main.orders_list_widget.model().rowCount()
     assert orig_number_rows - new_number_rows == 1
 
     restore_config_file(main.config)
     datafile_close(main.parts_file)
 
 
+def test_204_34_load_file_in_background(qtbot, filesystem):
+    main, source, parts_file_path = set_environment(filesystem, qtbot)
+
+    test_file_name = parts_file_path + "/test_204_34_file.parts"
+    test_file = datafile_create(test_file_name, table_definition)
+    load_all_datafile_tables(test_file)
+
+    # the assembly page is filled when the background read finishes
+    main.load_file(test_file_name)
+    assert main.is_file_loading()
+    qtbot.waitUntil(lambda: not main.is_file_loading())
+    assert main.assembly_tree_widget.model().rowCount() > 0
+    assert main.parts_list_widget.model().rowCount() == 0
+    assert main.orders_list_widget.model().rowCount() == 0
+
+    # the other pages are read when their tabs are shown
+    main.tab_widget.setCurrentIndex(1)
+    assert main.parts_list_widget.model().rowCount() == len(part_value_set)
+    assert main.orders_list_widget.model().rowCount() == 0
+    main.tab_widget.setCurrentIndex(2)
+    assert main.orders_list_widget.model().rowCount() == len(order_value_set)
+
+    # a change marks pages stale, reading only the page shown once
+    # control returns to the event loop
+    main.refresh_pages(main.part_list, main.order_list)
+    main.refresh_pages(main.order_list)
+    assert main.part_list.stale
+    assert main.order_list.stale
+    assert main.refresh_scheduler.has_pending()
+    qtbot.waitUntil(lambda: not main.refresh_scheduler.has_pending())
+    assert main.part_list.stale
+    assert not main.order_list.stale
+    main.tab_widget.setCurrentIndex(0)
+
+    # cancelling leaves no file open and the pages empty
+    main.load_file(test_file_name)
+    main.file_load_cancel_action()
+    assert not main.is_file_loading()
+    assert not main.parts_file.sql_is_connected()
+    assert main.parts_list_widget.model().rowCount() == 0
+    assert main.orders_list_widget.model().rowCount() == 0
+
+    restore_config_file(main.config)
+    datafile_close(main.parts_file)
+
+
+def test_204_35_dialogs_imported_when_used(qtbot, filesystem):
+    # starting the program imports no dialog module
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; sys.path.append(" + repr(src_path) + "); import pages; "
+            "print(sorted(m for m in sys.modules if m.startswith('dialogs.')))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_204_36_single_qt_binding(qtbot, filesystem):
+    # the program loads the binding of qt_compat only
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; sys.path.append(" + repr(src_path) + "); import pages; "
+            "from dialogs import ItemDialog, PartDialog; "
+            "print(sorted(m for m in ('PyQt6', 'PySide6') if m in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "['PySide6']"
+
+
+def test_204_37_dialog_pool(qtbot, filesystem):
+    main, source, parts_file_path = set_environment(filesystem, qtbot)
+
+    # a closed dialog is rebound rather than built again
+    first = main.item_dialog_action(None, Dialog.EDIT_ELEMENT)
+    assert first.record_id_combo.isEnabled()
+    first.close()
+    second = main.item_dialog_action("", Dialog.ADD_ELEMENT)
+    assert second is first
+    assert not second.record_id_combo.isEnabled()
+    assert second.get_operation() == Dialog.ADD_ELEMENT
+
+    # a dialog still open is left alone
+    third = main.item_dialog_action(None, Dialog.EDIT_ELEMENT)
+    assert third is not second
+    assert third.record_id_combo.isEnabled()
+    third.close()
+    second.close()
+
+    # the pages open their dialogs through the same pool
+    for page in main.pages:
+        assert page.dialog_pool is main.dialog_pool
+    part_dialog = main.part_dialog_action(None, Dialog.EDIT_ELEMENT)
+    part_dialog.close()
+    assert main.dialog_pool.dialogs["PartDialog"] is part_dialog
+
+    # the dialogs are not kept across parts files
+    main.file_close_action()
+    assert main.dialog_pool.dialogs == {}
+    datafile_close(main.parts_file)
+
+
 def test_204_99_restore_config_file(qtbot, filesystem):
     # restore the saved config file.
     main, source, parts_file_path = set_environment(filesystem, qtbot)
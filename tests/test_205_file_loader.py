@@ -0,0 +1,159 @@
+"""
+Test the background file loader.
+
+File:       test_205_file_loader.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file LICENSE
+Version:    1.3.0
+"""
+
+import os
+import sqlite3
+import sys
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+import pytest
+from lbk_library.testing_support import datafile_close, datafile_create, filesystem
+from test_setup import load_all_datafile_tables, order_value_set, part_value_set
+
+from elements import PartSet, ReadOnlyPartsFile
+from pages import (
+    AssemblyTreePage,
+    FileLoader,
+    OrdersListPage,
+    PartsListPage,
+    table_definition,
+)
+from qt_compat.QtWidgets import QTableView, QTreeView
+
+file_version = "1.3.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Import Qt through 'qt_compat'",
+    "1.2.0": "Added the failed read test",
+    "1.3.0": "Import 'ReadOnlyPartsFile' from 'elements'",
+}
+
+parts_filename = "parts_test.parts"
+
+
+def setup_loader(qtbot, filesystem):
+    """Build the pages and a loader for their parts file."""
+    filename = filesystem + "/" + parts_filename
+    parts_file = datafile_create(filename, table_definition)
+    load_all_datafile_tables(parts_file)
+    tree_view = QTreeView()
+    parts_view = QTableView()
+    orders_view = QTableView()
+    for view in (tree_view, parts_view, orders_view):
+        qtbot.addWidget(view)
+    tree = AssemblyTreePage(tree_view, parts_file)
+    parts = PartsListPage(parts_view, parts_file)
+    orders = OrdersListPage(orders_view, parts_file)
+    loader = FileLoader(filename, tree.model, parts.model, orders.model)
+    return (parts_file, filename, loader, tree, parts, orders)
+
+
+def test_205_01_read_only_parts_file(qtbot, filesystem):
+    parts_file, filename, loader, tree, parts, orders = setup_loader(qtbot, filesystem)
+    read_file = ReadOnlyPartsFile(filename)
+    assert read_file.sql_is_connected()
+    assert PartSet.get_parts_listing(read_file) == PartSet.get_parts_listing(parts_file)
+    assert PartSet.count(read_file) == len(part_value_set)
+    with pytest.raises(sqlite3.OperationalError):
+        read_file.sql_query("DELETE FROM parts")
+    read_file.sql_close()
+    assert not read_file.sql_is_connected()
+    datafile_close(parts_file)
+
+
+def test_205_02_run(qtbot, filesystem):
+    """The reads match the pages' own loads and arrive in order."""
+    parts_file, filename, loader, tree, parts, orders = setup_loader(qtbot, filesystem)
+    received = []
+    loader.tree_loaded.connect(lambda root: received.append(("tree", root)))
+    loader.parts_loaded.connect(lambda rows: received.append(("parts", rows)))
+    loader.orders_loaded.connect(
+        lambda total, page: received.append(("orders", (total, page)))
+    )
+    loader.progress.connect(lambda step: received.append(("progress", step)))
+    loader.finished.connect(lambda: received.append(("finished", None)))
+    loader.run()
+    assert not loader.is_running()
+    assert [name for name, value in received] == [
+        "tree",
+        "progress",
+        "parts",
+        "progress",
+        "orders",
+        "progress",
+        "finished",
+    ]
+    assert received[2][1] == parts.model.read_rows()
+    assert received[4][1] == orders.model.read_first_page()
+    assert received[4][1][0] == len(order_value_set)
+    root = received[0][1]
+    assert [node.values for node in root.children] == [
+        node.values for node in tree.model.read_root().children
+    ]
+    datafile_close(parts_file)
+
+
+def test_205_03_cancel(qtbot, filesystem):
+    parts_file, filename, loader, tree, parts, orders = setup_loader(qtbot, filesystem)
+    received = []
+    loader.parts_loaded.connect(lambda rows: received.append("parts"))
+    loader.finished.connect(lambda: received.append("finished"))
+    loader.canceled.connect(lambda: received.append("canceled"))
+    loader.cancel()
+    assert loader.is_canceled()
+    loader.run()
+    assert received == ["canceled"]
+    datafile_close(parts_file)
+
+
+def test_205_04_start(qtbot, filesystem):
+    parts_file, filename, loader, tree, parts, orders = setup_loader(qtbot, filesystem)
+    parts.clear_table()
+    loader.parts_loaded.connect(parts.set_rows)
+    with qtbot.waitSignal(loader.finished, timeout=5000):
+        loader.start()
+    qtbot.waitUntil(lambda: parts.model.rowCount() == len(part_value_set))
+    datafile_close(parts_file)
+
+
+def test_205_05_read_one_page(qtbot, filesystem):
+    """Only the pages given a model are read."""
+    parts_file, filename, loader, tree, parts, orders = setup_loader(qtbot, filesystem)
+    loader = FileLoader(filename, parts_model=parts.model)
+    assert loader.number_steps() == 1
+    received = []
+    loader.tree_loaded.connect(lambda root: received.append("tree"))
+    loader.parts_loaded.connect(lambda rows: received.append("parts"))
+    loader.orders_loaded.connect(lambda total, page: received.append("orders"))
+    loader.run()
+    assert received == ["parts"]
+    datafile_close(parts_file)
+
+
+def test_205_06_failed(qtbot, filesystem):
+    """An error in a read is reported through 'failed'."""
+    parts_file, filename, loader, tree, parts, orders = setup_loader(qtbot, filesystem)
+
+    def read_fails(read_file):
+        raise KeyError("source")
+
+    loader.steps[1] = (read_fails, loader.parts_loaded.emit)
+    received = []
+    loader.parts_loaded.connect(lambda rows: received.append("parts"))
+    loader.failed.connect(lambda message: received.append(("failed", message)))
+    loader.finished.connect(lambda: received.append("finished"))
+    loader.run()
+    assert received == [("failed", "'source'")]
+    assert not loader.is_running()
+    assert not loader.parts_file.sql_is_connected()
+    datafile_close(parts_file)
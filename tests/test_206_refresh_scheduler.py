@@ -0,0 +1,121 @@
+"""
+Test the page refresh scheduler.
+
+File:       test_206_refresh_scheduler.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file LICENSE
+Version:    1.1.0
+"""
+
+import os
+import sys
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from lbk_library.testing_support import datafile_close, datafile_create, filesystem
+from test_setup import load_all_datafile_tables, part_value_set
+
+from elements import Part
+from pages import PartsListPage, RefreshScheduler, table_definition
+from qt_compat.QtWidgets import QTableView
+
+file_version = "1.1.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "Import Qt through 'qt_compat'",
+}
+
+parts_filename = "parts_test.parts"
+
+
+class CountingPage:
+    """A page counting its refreshes."""
+
+    def __init__(self):
+        self.stale = False
+        self.refreshes = 0
+        self.refresh_scheduler = None
+
+    def mark_stale(self):
+        self.stale = True
+
+    def refresh_if_stale(self):
+        if self.stale:
+            self.refreshes += 1
+            self.stale = False
+
+
+def test_206_01_register(qtbot):
+    scheduler = RefreshScheduler(lambda page: True)
+    page = CountingPage()
+    scheduler.register(page)
+    scheduler.register(page)
+    assert scheduler.pages == [page]
+    assert page.refresh_scheduler is scheduler
+
+
+def test_206_02_merge_requests(qtbot):
+    """A page is refreshed once however often it is reported."""
+    shown = CountingPage()
+    hidden = CountingPage()
+    scheduler = RefreshScheduler(lambda page: page is shown)
+    scheduler.register(shown)
+    scheduler.register(hidden)
+
+    scheduler.invalidate(shown, hidden)
+    scheduler.invalidate(shown)
+    scheduler.invalidate(shown)
+    assert shown.stale and hidden.stale
+    assert shown.refreshes == 0
+    assert scheduler.has_pending()
+    qtbot.waitUntil(lambda: not scheduler.has_pending())
+    assert shown.refreshes == 1
+    assert not shown.stale
+
+    # a page not shown stays stale until it is
+    assert hidden.refreshes == 0
+    assert hidden.stale
+
+
+def test_206_03_unregistered_and_discard(qtbot):
+    page = CountingPage()
+    scheduler = RefreshScheduler(lambda page: True)
+    scheduler.invalidate(page)
+    assert not scheduler.has_pending()
+    assert not page.stale
+
+    scheduler.register(page)
+    scheduler.invalidate(page)
+    scheduler.discard()
+    assert not scheduler.has_pending()
+    scheduler.flush()
+    assert page.refreshes == 0
+
+
+def test_206_04_page_request_refresh(qtbot, filesystem):
+    """A registered page sends its refresh requests to the scheduler."""
+    filename = filesystem + "/" + parts_filename
+    parts_file = datafile_create(filename, table_definition)
+    load_all_datafile_tables(parts_file)
+    table = QTableView()
+    qtbot.addWidget(table)
+    page = PartsListPage(table, parts_file)
+    page.refresh_if_stale()
+
+    # without a scheduler the page is read at once
+    Part(parts_file, part_value_set[0][1], "part_number").delete()
+    page.request_refresh()
+    assert page.model.rowCount() == len(part_value_set) - 1
+
+    scheduler = RefreshScheduler(lambda page: True)
+    scheduler.register(page)
+    Part(parts_file, part_value_set[1][1], "part_number").delete()
+    page.request_refresh()
+    page.request_refresh()
+    assert page.model.rowCount() == len(part_value_set) - 1
+    qtbot.waitUntil(lambda: not scheduler.has_pending())
+    assert page.model.rowCount() == len(part_value_set) - 2
+    datafile_close(parts_file)
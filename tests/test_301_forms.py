@@ -0,0 +1,74 @@
+"""
+Test the compiled form cache.
+
+File:       test_301_forms.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2024 Lorn B Kerr
+License:    MIT, see file License
+Version:    1.1.0
+"""
+
+import os
+import sys
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+import pytest
+
+import forms
+from forms import form_compiler
+
+file_version = "1.1.0"
+changes = {
+    "1.0.0": "Initial release",
+    "1.1.0": "The forms are compiled for a single binding",
+}
+
+
+def test_301_01_cache_dir(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setenv(form_compiler.CACHE_ENVIRONMENT, cache_dir)
+    assert form_compiler.get_cache_dir() == cache_dir
+    assert os.path.isdir(cache_dir)
+
+
+def test_301_02_compile_once(tmp_path, mocker):
+    """A form is compiled only when its cached module is missing."""
+    cache_dir = str(tmp_path)
+    py_path = form_compiler.compile_form("main_window.ui", cache_dir)
+    assert os.path.exists(py_path)
+    assert py_path == form_compiler.get_module_path("main_window.ui", cache_dir)
+
+    compiler = mocker.patch.object(form_compiler, "run_compiler")
+    assert form_compiler.compile_form("main_window.ui", cache_dir) == py_path
+    compiler.assert_not_called()
+
+
+def test_301_03_changed_key(tmp_path, monkeypatch):
+    """A changed key compiles the form again, replacing the old module."""
+    cache_dir = str(tmp_path)
+    old_path = form_compiler.compile_form("main_window.ui", cache_dir)
+    monkeypatch.setattr(form_compiler, "COMPILER_VERSION", "test")
+    new_path = form_compiler.compile_form("main_window.ui", cache_dir)
+    assert new_path != old_path
+    assert os.path.exists(new_path)
+    assert not os.path.exists(old_path)
+
+
+def test_301_04_load_form_any_directory(tmp_path, monkeypatch):
+    """The forms are found whatever the working directory."""
+    monkeypatch.chdir(tmp_path)
+    form_class = form_compiler.load_form("Ui_MainWindow", str(tmp_path))
+    assert form_class.__name__ == "Ui_MainWindow"
+    assert hasattr(form_class, "setupUi")
+    with pytest.raises(AttributeError):
+        form_compiler.load_form("Ui_NoSuchForm", str(tmp_path))
+
+
+def test_301_05_package_attributes(tmp_path, monkeypatch):
+    monkeypatch.setenv(form_compiler.CACHE_ENVIRONMENT, str(tmp_path))
+    assert forms.Ui_MainWindow.__name__ == "Ui_MainWindow"
+    with pytest.raises(AttributeError):
+        forms.Ui_NoSuchForm